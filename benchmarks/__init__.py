@@ -0,0 +1,7 @@
+"""
+Standalone benchmarks for the backend. They are not part of the application and
+need the development requirements (requirements-dev.txt). Run one from the
+repository root, e.g.:
+
+    python -m benchmarks.sqlite_profile
+"""
@@ -0,0 +1,59 @@
+"""
+Benchmark the subquadratic decimal converters against the built-in int <-> str:
+
+    python -m benchmarks.decimal_conversion
+"""
+import random
+import sys
+import time
+
+from server.core.decimal_conversion import decimal_to_int, int_to_decimal
+
+
+def benchmark_conversion(sizes=(10**5, 10**6, 10**7), builtin_limit: int = 10**6) -> dict:
+    """
+    Time int -> str and str -> int against the built-ins.
+
+    The built-ins are quadratic, so they are only timed up to builtin_limit digits
+    and reported as None beyond that.
+
+    Args:
+        sizes: Numbers of decimal digits to time
+        builtin_limit (int): Largest size to time with the built-ins
+
+    Returns:
+        dict: digits -> seconds for "str", "int_to_decimal", "int" and "decimal_to_int"
+    """
+    sys.set_int_max_str_digits(0)
+
+    def timed(function, argument):
+        started = time.perf_counter()
+        result = function(argument)
+        return time.perf_counter() - started, result
+
+    rng = random.Random(0)
+    results = {}
+    for size in sizes:
+        text = str(rng.randint(1, 9)) + "".join(rng.choice("0123456789") for _ in range(size - 1))
+        parse_seconds, value = timed(decimal_to_int, text)
+        render_seconds, rendered = timed(int_to_decimal, value)
+        if rendered != text:
+            raise AssertionError("Round trip mismatch")
+
+        use_builtin = size <= builtin_limit
+        results[size] = {
+            "str": timed(str, value)[0] if use_builtin else None,
+            "int_to_decimal": render_seconds,
+            "int": timed(int, text)[0] if use_builtin else None,
+            "decimal_to_int": parse_seconds,
+        }
+    return results
+
+
+if __name__ == "__main__":
+    for digit_count, timings in benchmark_conversion().items():
+        cells = ", ".join(
+            f"{name} {'skipped' if seconds is None else f'{seconds:.3f}s'}"
+            for name, seconds in timings.items()
+        )
+        print(f"{digit_count:>9} digits: {cells}")
@@ -0,0 +1,86 @@
+"""
+Compare email delivery rates against a local aiosmtpd server, with a connection
+per message versus through the email outbox:
+
+    python -m benchmarks.email_delivery
+"""
+import logging
+import os
+import smtplib
+import socket
+import tempfile
+import time
+
+from aiosmtpd.controller import Controller
+from aiosmtpd.handlers import Sink
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel, create_engine
+
+from server.apps.authentication.email.outbox import EmailOutbox
+from server.apps.authentication.email.send_email import build_message
+from server.apps.authentication.models import OutboxEmail, OutboxStatus
+
+
+def benchmark_delivery(messages: int = 500, workers: int = 2) -> dict:
+    """
+    Measure messages per second delivered to a local aiosmtpd server, opening a
+    connection per message versus through an EmailOutbox.
+
+    Args:
+        messages (int): Number of messages to deliver
+        workers (int): Delivery threads of the outbox
+
+    Returns:
+        dict: Messages per second for the "per_message" and "outbox" modes
+    """
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    logging.getLogger("mail.log").setLevel(logging.WARNING)
+    controller = Controller(Sink(), hostname="127.0.0.1", port=port)
+    controller.start()
+
+    def connect():
+        return smtplib.SMTP("127.0.0.1", port, timeout=30)
+
+    results = {}
+    try:
+        started = time.perf_counter()
+        for number in range(messages):
+            with connect() as server:
+                server.send_message(build_message(f"user{number}@example.com",
+                                                  "Benchmark", "Hello"))
+        results["per_message"] = messages / (time.perf_counter() - started)
+
+        with tempfile.TemporaryDirectory() as directory:
+            bench_engine = create_engine(
+                f"sqlite:///{os.path.join(directory, 'bench.db')}",
+                connect_args={"check_same_thread": False, "timeout": 30},
+            )
+            SQLModel.metadata.create_all(bench_engine, tables=[OutboxEmail.__table__])
+            session_factory = sessionmaker(bind=bench_engine, autoflush=False)
+            with session_factory() as db:
+                db.add_all(OutboxEmail(recipient=f"user{number}@example.com",
+                                       subject="Benchmark", body="Hello")
+                           for number in range(messages))
+                db.commit()
+
+            outbox = EmailOutbox(session_factory, connect=connect, workers=workers,
+                                 poll_interval=0.01)
+            started = time.perf_counter()
+            outbox.start()
+            with session_factory() as db:
+                while db.query(OutboxEmail).filter(
+                        OutboxEmail.status == OutboxStatus.PENDING.value).count():
+                    time.sleep(0.01)
+            results["outbox"] = messages / (time.perf_counter() - started)
+            outbox.stop()
+            bench_engine.dispose()
+    finally:
+        controller.stop()
+    return results
+
+
+if __name__ == "__main__":
+    for benchmark_mode, rate in benchmark_delivery().items():
+        print(f"{benchmark_mode:>11}: {rate:,.0f} messages/sec")
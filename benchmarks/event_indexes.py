@@ -0,0 +1,169 @@
+"""
+Time the hot events queries on a scratch SQLite database with and without the
+indexes declared for them on the models:
+
+    python -m benchmarks.event_indexes
+
+tests/test_event_indexes.py checks that the queries use those indexes.
+"""
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from sqlalchemy import event, func, insert, select, text
+from sqlmodel import SQLModel
+
+from server.apps.authentication.models import User
+from server.apps.events.models import Event, EventComment, EventRegistration, EventStatus
+from server.core.database import create_database_engine
+
+
+def _query_plan(connection, statement) -> list:
+    """EXPLAIN QUERY PLAN steps of a SELECT, run once first to capture its parameters."""
+    executed = []
+
+    def capture(_conn, _cursor, sql, parameters, _context, _executemany):
+        executed.append((sql, parameters))
+
+    event.listen(connection, "before_cursor_execute", capture)
+    try:
+        connection.execute(statement).all()
+    finally:
+        event.remove(connection, "before_cursor_execute", capture)
+    sql, parameters = executed[-1]
+    return [row[-1] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}",
+                                                          parameters)]
+
+
+def benchmark_event_indexes(events: int = 5000, comments_per_event: int = 10,
+                            repeat: int = 50) -> dict:
+    """
+    Time the hot event queries with and without the indexes declared for them.
+
+    Args:
+        events (int): Number of events to create
+        comments_per_event (int): Comments per event, a third of them replies
+        repeat (int): Runs of each query per measurement
+
+    Returns:
+        dict: For each query: its plan with the indexes and the median milliseconds
+        per run "with_indexes" and "without_indexes"
+    """
+    rng = random.Random(0)
+    now = datetime.now(timezone.utc)
+    user_ids = [uuid4() for _ in range(max(1, events // 10))]
+    event_rows = [{
+        "id": uuid4(), "title": f"Event {number}", "description": "Benchmark",
+        "date_created": now - timedelta(minutes=number),
+        "date_scheduled": now + timedelta(hours=rng.randrange(-24 * 60, 24 * 60)),
+        "author_id": rng.choice(user_ids), "status": rng.choice(list(EventStatus)).value,
+        "votes": rng.randrange(100),
+    } for number in range(events)]
+    comment_rows = []
+    for event_row in event_rows:
+        top_level = []
+        for number in range(comments_per_event):
+            parent = top_level[-1] if top_level and number % 3 == 2 else None
+            comment_rows.append({
+                "id": uuid4(), "event_id": event_row["id"], "user_id": rng.choice(user_ids),
+                "content": "Benchmark", "is_deleted": number % 7 == 6,
+                "date_created": event_row["date_created"] + timedelta(minutes=number),
+                "parent_comment_id": parent,
+            })
+            if parent is None:
+                top_level.append(comment_rows[-1]["id"])
+    registration_rows = [{
+        "id": uuid4(), "event_id": event_row["id"], "user_id": user_id,
+        "attendance_status": rng.choice(("registered", "attended", "cancelled")),
+    } for event_row in event_rows for user_id in rng.sample(user_ids, min(3, len(user_ids)))]
+
+    sample_event = event_rows[len(event_rows) // 2]
+    sample_user = sample_event["author_id"]
+    sample_parent = next(row["parent_comment_id"] for row in comment_rows
+                         if row["parent_comment_id"])
+    top_level = EventComment.parent_comment_id.is_(None)  # pylint: disable=no-member
+    queries = {
+        "newest events": (
+            select(Event).order_by(Event.date_created.desc(), Event.id.desc()).limit(21),
+            "ix_event_date_created_id"),
+        "most voted events": (
+            select(Event).order_by(Event.votes.desc(), Event.id.desc()).limit(21),
+            "ix_event_votes_id"),
+        "next open event": (
+            select(func.min(Event.date_scheduled)).where(  # pylint: disable=not-callable
+                Event.status == EventStatus.OPEN.value, Event.date_scheduled >= now),
+            "ix_event_status_date_scheduled"),
+        "events tomorrow": (
+            select(Event.id).where(Event.date_scheduled.between(
+                now + timedelta(days=1), now + timedelta(days=2))),
+            "ix_event_date_scheduled"),
+        "author's events": (
+            select(Event).where(Event.author_id == sample_user)
+            .order_by(Event.date_created.desc()),
+            "ix_event_author_id_date_created"),
+        "event comments": (
+            select(EventComment).where(EventComment.event_id == sample_event["id"],
+                                       EventComment.is_deleted == False)  # pylint: disable=singleton-comparison
+            .order_by(EventComment.date_created),
+            "ix_eventcomment_event_id_is_deleted_date_created"),
+        "top-level comments": (
+            select(EventComment.id).where(EventComment.event_id == sample_event["id"], top_level)
+            .order_by(EventComment.date_created, EventComment.id),
+            "ix_eventcomment_event_id_date_created_top_level"),
+        "comment replies": (
+            select(EventComment.id).where(EventComment.parent_comment_id == sample_parent)
+            .order_by(EventComment.date_created, EventComment.id),
+            "ix_eventcomment_parent_comment_id_date_created"),
+        "user's comments": (
+            select(EventComment.id).where(EventComment.user_id == sample_user),
+            "ix_eventcomment_user_id"),
+        "user's registrations": (
+            select(EventRegistration).where(
+                EventRegistration.user_id == sample_user,
+                EventRegistration.attendance_status == "registered"),
+            "ix_eventregistration_user_id_attendance_status"),
+    }
+
+    results = {name: {} for name in queries}
+    for with_indexes in (True, False):
+        with tempfile.TemporaryDirectory() as directory:
+            bench_engine = create_database_engine(
+                f"sqlite:///{os.path.join(directory, 'bench.db')}")
+            tables = [User.__table__, Event.__table__, EventComment.__table__,
+                      EventRegistration.__table__]
+            SQLModel.metadata.create_all(bench_engine, tables=tables)
+            with bench_engine.begin() as connection:
+                connection.execute(insert(User), [{
+                    "id": user_id, "first_name": "Bench", "last_name": "User",
+                    "email": f"{user_id}@example.com", "hashed_password": "x",
+                } for user_id in user_ids])
+                connection.execute(insert(Event), event_rows)
+                connection.execute(insert(EventComment), comment_rows)
+                connection.execute(insert(EventRegistration), registration_rows)
+                if not with_indexes:
+                    for _, index_name in queries.values():
+                        connection.execute(text(f"DROP INDEX {index_name}"))
+
+            key = "with_indexes" if with_indexes else "without_indexes"
+            with bench_engine.connect() as connection:
+                for name, (statement, _) in queries.items():
+                    if with_indexes:
+                        results[name]["plan"] = _query_plan(connection, statement)
+                    timings = []
+                    for _ in range(repeat):
+                        started = time.perf_counter()
+                        connection.execute(statement).all()
+                        timings.append(time.perf_counter() - started)
+                    results[name][key] = statistics.median(timings) * 1000
+            bench_engine.dispose()
+    return results
+
+
+if __name__ == "__main__":
+    for query_name, stats in benchmark_event_indexes().items():
+        print(f"{query_name:>22}: {stats['without_indexes']:7.2f} ms -> "
+              f"{stats['with_indexes']:6.2f} ms  {' / '.join(stats['plan'])}")
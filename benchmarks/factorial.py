@@ -0,0 +1,59 @@
+"""
+Benchmark the factorial engine against the incremental running product:
+
+    python -m benchmarks.factorial
+"""
+import os
+import time
+
+from server.core.config import settings
+from server.core.factorial_engine import (PARALLEL_THRESHOLD, compute_factorial,
+                                          shutdown_engine)
+
+
+def benchmark_factorial(sizes=(10**4, 10**5, 10**6), incremental_limit: int = 10**5) -> dict:
+    """
+    Time the incremental running product against the engine.
+
+    The incremental approach is quadratic, so it is only timed up to
+    incremental_limit and reported as None beyond that.
+
+    Args:
+        sizes: Values of n to time
+        incremental_limit (int): Largest n to time with the incremental approach
+
+    Returns:
+        dict: n -> seconds for "incremental", "product_tree" (one process) and
+        "parallel" (FACTORIAL_WORKERS processes)
+    """
+    def timed(function, *args):
+        started = time.perf_counter()
+        function(*args)
+        return time.perf_counter() - started
+
+    def incremental(n):
+        value = 1
+        for factor in range(2, n + 1):
+            value *= factor
+        return value
+
+    compute_factorial(2 * PARALLEL_THRESHOLD)  # Start the workers outside the timings
+    results = {}
+    for n in sizes:
+        results[n] = {
+            "incremental": timed(incremental, n) if n <= incremental_limit else None,
+            "product_tree": timed(compute_factorial, n, 1),
+            "parallel": timed(compute_factorial, n),
+        }
+    shutdown_engine()
+    return results
+
+
+if __name__ == "__main__":
+    print(f"workers={settings.FACTORIAL_WORKERS}, cpus={os.cpu_count()}")
+    for size, timings in benchmark_factorial().items():
+        cells = ", ".join(
+            f"{name} {'skipped' if seconds is None else f'{seconds:.3f}s'}"
+            for name, seconds in timings.items()
+        )
+        print(f"n={size:>8}: {cells}")
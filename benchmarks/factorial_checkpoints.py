@@ -0,0 +1,79 @@
+"""
+Measure the trade-off between disk usage and lookup latency of a sparse factorial
+checkpoint store against a dense one:
+
+    python -m benchmarks.factorial_checkpoints
+"""
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from server.core.decimal_conversion import int_to_decimal
+from server.core.factorial_checkpoints import (FactorialCache, compact_store,
+                                               materialize_factorial)
+from server.core.factorial_store import FactorialStore
+
+
+def benchmark_checkpoints(max_n: int = 3000, interval: int = 100, lookups: int = 200) -> dict:
+    """
+    Compare a dense store with a sparse one on disk usage and lookup latency.
+
+    Args:
+        max_n (int): Largest factorial in the stores
+        interval (int): Checkpoint interval of the sparse store
+        lookups (int): Number of random lookups to time per store
+
+    Returns:
+        dict: For "dense" and "sparse": size in bytes and lookup p50/p99 in
+        milliseconds; "sparse_cached" has the latency when the value is cached
+    """
+    def percentiles(samples):
+        cut_points = statistics.quantiles(samples, n=100, method="inclusive")
+        return cut_points[49] * 1000, cut_points[98] * 1000
+
+    def store_size(store):
+        return os.path.getsize(store.data_path) + os.path.getsize(store.index_path)
+
+    rng = random.Random(0)
+    targets = [rng.randint(0, max_n) for _ in range(lookups)]
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        dense = FactorialStore(os.path.join(directory, "dense.bin"),
+                               os.path.join(directory, "dense.idx"))
+        with dense.writer() as writer:
+            value = 1
+            for n in range(max_n + 1):
+                value *= n or 1
+                writer.append(int_to_decimal(value).encode("ascii"))
+        sparse = FactorialStore(os.path.join(directory, "sparse.bin"),
+                                os.path.join(directory, "sparse.idx"), interval=interval)
+        compact_store(dense, sparse)
+
+        samples = []
+        for n in targets:
+            started = time.perf_counter()
+            dense.get(n)
+            samples.append(time.perf_counter() - started)
+        results["dense"] = (store_size(dense), *percentiles(samples))
+
+        cache = FactorialCache(len(targets))
+        for mode in ("sparse", "sparse_cached"):
+            samples = []
+            for n in targets:
+                started = time.perf_counter()
+                materialize_factorial(n, sparse, cache)
+                samples.append(time.perf_counter() - started)
+            results[mode] = (store_size(sparse), *percentiles(samples))
+
+    return {
+        mode: {"bytes": size, "p50_ms": p50, "p99_ms": p99}
+        for mode, (size, p50, p99) in results.items()
+    }
+
+
+if __name__ == "__main__":
+    for store_mode, stats in benchmark_checkpoints().items():
+        print(f"{store_mode:>13}: {stats['bytes'] / 1e6:8.2f} MB, "
+              f"lookup p50 {stats['p50_ms']:.2f} ms, p99 {stats['p99_ms']:.2f} ms")
@@ -0,0 +1,84 @@
+"""
+Measure password check latency and event loop lag for a burst of concurrent
+logins, verifying inline versus on the password hashing pool:
+
+    python -m benchmarks.login_latency
+"""
+import asyncio
+import statistics
+import time
+
+from passlib.context import CryptContext
+
+from server.core.config import settings
+from server.core.security import password_executor
+
+
+def benchmark_login_latency(logins: int = 48, rounds: int = settings.BCRYPT_ROUNDS) -> dict:
+    """
+    Measure password check latency for a burst of concurrent logins.
+
+    Compares verifying inline on the event loop with verify_password_async. Besides
+    login p50/p99, it reports the p99 event loop lag seen by a concurrent 10 ms
+    ticker, which is the delay every other request would experience.
+
+    Args:
+        logins (int): Number of simultaneous logins in the burst
+        rounds (int): bcrypt cost factor of the benchmark hash
+
+    Returns:
+        dict: For "inline" and "pool", login p50/p99 and loop lag p99 in milliseconds
+    """
+    context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds)
+    hashed = context.hash("benchmark-password")
+
+    def percentile(values, fraction):
+        cut_points = statistics.quantiles(values, n=100, method="inclusive")
+        return cut_points[int(fraction * 100) - 1] * 1000
+
+    async def burst(use_pool: bool) -> dict:
+        loop = asyncio.get_running_loop()
+        latencies, lags = [], []
+        done = asyncio.Event()
+
+        async def login():
+            started = time.perf_counter()
+            if use_pool:
+                await loop.run_in_executor(
+                    password_executor, context.verify, "benchmark-password", hashed
+                )
+            else:
+                context.verify("benchmark-password", hashed)
+                await asyncio.sleep(0)
+            latencies.append(time.perf_counter() - started)
+
+        async def ticker():
+            while not done.is_set():
+                started = time.perf_counter()
+                await asyncio.sleep(0.01)
+                lags.append(time.perf_counter() - started - 0.01)
+
+        ticker_task = asyncio.create_task(ticker())
+        await asyncio.sleep(0.05)
+        await asyncio.gather(*(login() for _ in range(logins)))
+        done.set()
+        await ticker_task
+        return {
+            "login_p50_ms": percentile(latencies, 0.50),
+            "login_p99_ms": percentile(latencies, 0.99),
+            "loop_lag_p99_ms": percentile(lags, 0.99) if len(lags) > 1 else 0.0,
+        }
+
+    return {
+        "inline": asyncio.run(burst(use_pool=False)),
+        "pool": asyncio.run(burst(use_pool=True)),
+    }
+
+
+if __name__ == "__main__":
+    print(f"bcrypt rounds={settings.BCRYPT_ROUNDS}, "
+          f"pool size={settings.PASSWORD_HASH_CONCURRENCY}")
+    for mode, result in benchmark_login_latency().items():
+        print(f"{mode:>6}: login p50 {result['login_p50_ms']:.0f} ms, "
+              f"p99 {result['login_p99_ms']:.0f} ms, "
+              f"event loop lag p99 {result['loop_lag_p99_ms']:.0f} ms")
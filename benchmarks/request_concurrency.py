@@ -0,0 +1,153 @@
+"""
+Measure concurrent request throughput of one worker with synchronous and
+asynchronous database sessions:
+
+    python -m benchmarks.request_concurrency
+"""
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+
+import httpx
+from fastapi import Depends as depends, FastAPI
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+
+from server.core.database import create_async_database_engine, create_database_engine
+
+
+def benchmark_request_concurrency(requests: int = 2000, clients: int = 32,
+                                  write_ratio: float = 0.2, lock_hold: float = 0.02,
+                                  lock_gap: float = 0.03) -> dict:
+    """
+    Measure concurrent request throughput of one worker (one event loop) on a scratch
+    SQLite database, with async handlers using a synchronous Session, as the routes
+    did before, versus an AsyncSession.
+
+    Each configuration runs once on an idle database and once while another
+    connection keeps taking the write lock for lock_hold seconds every
+    lock_gap seconds, like the vote buffer, email outbox and other workers do.
+
+    Args:
+        requests (int): Number of requests per run
+        clients (int): Number of concurrent clients
+        write_ratio (float): Share of requests that update a row and commit
+        lock_hold (float): Seconds the competing connection holds the write lock
+        lock_gap (float): Seconds between two write locks of the competing connection
+
+    Returns:
+        dict: For each of "sync_idle", "async_idle", "sync_contended" and
+        "async_contended": requests per second and read latency p50/p99 in milliseconds
+    """
+    rows = 1000
+    rng = random.Random(0)
+    plan = [(rng.random() < write_ratio, rng.randrange(rows)) for _ in range(requests)]
+    read_sql = text("SELECT id, value, payload FROM item WHERE id >= :id LIMIT 20")
+    write_sql = text("UPDATE item SET value = value + 1 WHERE id = :id")
+
+    def build_app(mode: str, url: str):
+        app = FastAPI()
+        if mode == "sync":
+            factory = sessionmaker(bind=create_database_engine(url))
+
+            def get_session():
+                with factory() as db:
+                    yield db
+
+            @app.get("/items/{item_id}")
+            async def read_sync(item_id: int, db: Session = depends(get_session)):
+                return [row.id for row in db.execute(read_sql, {"id": item_id})]
+
+            @app.post("/items/{item_id}")
+            async def write_sync(item_id: int, db: Session = depends(get_session)):
+                db.execute(write_sql, {"id": item_id})
+                db.commit()
+                return {"id": item_id}
+        else:
+            async_factory = async_sessionmaker(create_async_database_engine(url))
+
+            async def get_async_session():
+                async with async_factory() as db:
+                    yield db
+
+            @app.get("/items/{item_id}")
+            async def read_async(item_id: int, db: AsyncSession = depends(get_async_session)):
+                return [row.id for row in await db.execute(read_sql, {"id": item_id})]
+
+            @app.post("/items/{item_id}")
+            async def write_async(item_id: int, db: AsyncSession = depends(get_async_session)):
+                await db.execute(write_sql, {"id": item_id})
+                await db.commit()
+                return {"id": item_id}
+        return app
+
+    async def load(app) -> dict:
+        steps = iter(plan)
+        read_latencies = []
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            async def worker():
+                for is_write, item_id in steps:
+                    started = time.perf_counter()
+                    if is_write:
+                        response = await client.post(f"/items/{item_id}")
+                    else:
+                        response = await client.get(f"/items/{item_id}")
+                        read_latencies.append(time.perf_counter() - started)
+                    response.raise_for_status()
+
+            started = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(clients)))
+            elapsed = time.perf_counter() - started
+        cut_points = statistics.quantiles(read_latencies, n=100, method="inclusive")
+        return {"requests_per_sec": requests / elapsed,
+                "read_p50_ms": cut_points[49] * 1000,
+                "read_p99_ms": cut_points[98] * 1000}
+
+    results = {}
+    for contended in (False, True):
+        for mode in ("sync", "async"):
+            with tempfile.TemporaryDirectory() as directory:
+                url = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+                setup_engine = create_database_engine(url)
+                with setup_engine.begin() as connection:
+                    connection.execute(text("CREATE TABLE item (id INTEGER PRIMARY KEY, "
+                                            "value INTEGER, payload TEXT)"))
+                    connection.execute(text("INSERT INTO item VALUES (:id, 0, :payload)"),
+                                       [{"id": i, "payload": "x" * 200} for i in range(rows)])
+
+                stop = threading.Event()
+
+                def hold_write_lock(lock_engine=setup_engine, stop_event=stop):
+                    with lock_engine.connect() as connection:
+                        connection.exec_driver_sql("UPDATE item SET value = 0 WHERE id = 0")
+                        connection.rollback()
+                        while not stop_event.is_set():
+                            connection.exec_driver_sql("UPDATE item SET value = 0 WHERE id = 0")
+                            time.sleep(lock_hold)
+                            connection.commit()
+                            time.sleep(lock_gap)
+
+                locker = threading.Thread(target=hold_write_lock, daemon=True)
+                if contended:
+                    locker.start()
+                try:
+                    key = f"{mode}_{'contended' if contended else 'idle'}"
+                    results[key] = asyncio.run(load(build_app(mode, url)))
+                finally:
+                    stop.set()
+                    if contended:
+                        locker.join()
+                    setup_engine.dispose()
+    return results
+
+
+if __name__ == "__main__":
+    for session_mode, stats in benchmark_request_concurrency().items():
+        print(f"{session_mode:>15}: {stats['requests_per_sec']:,.0f} requests/sec, "
+              f"read p50 {stats['read_p50_ms']:.1f} ms, p99 {stats['read_p99_ms']:.1f} ms")
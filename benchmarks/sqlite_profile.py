@@ -0,0 +1,82 @@
+"""
+Measure mixed read/write throughput on a scratch SQLite database, with the driver
+defaults versus the performance profile applied by server.core.database; both
+engines use the application's connection pool settings:
+
+    python -m benchmarks.sqlite_profile
+"""
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import create_engine
+
+from server.core.database import _engine_options, create_database_engine
+
+
+def benchmark_sqlite_profile(operations: int = 4000, threads: int = 8,
+                             write_ratio: float = 0.2) -> dict:
+    """
+    Measure mixed read/write throughput with and without the SQLite profile.
+
+    Args:
+        operations (int): Number of operations to run
+        threads (int): Number of concurrent threads, each using its own session
+        write_ratio (float): Share of operations that write and commit
+
+    Returns:
+        dict: For "default" and "profile": operations per second and the number of
+        operations that failed with "database is locked"
+    """
+    rows = 1000
+    rng = random.Random(0)
+    plan = [(rng.random() < write_ratio, rng.randrange(rows)) for _ in range(operations)]
+    results = {}
+    for mode in ("default", "profile"):
+        with tempfile.TemporaryDirectory() as directory:
+            url = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+            if mode == "profile":
+                bench_engine = create_database_engine(url)
+            else:
+                bench_engine = create_engine(url, **_engine_options(url))
+            with bench_engine.begin() as connection:
+                connection.execute(text("CREATE TABLE item (id INTEGER PRIMARY KEY, "
+                                        "value INTEGER, payload TEXT)"))
+                connection.execute(text("INSERT INTO item VALUES (:id, 0, :payload)"),
+                                   [{"id": i, "payload": "x" * 200} for i in range(rows)])
+            session_factory = sessionmaker(bind=bench_engine)
+
+            def run(step, factory=session_factory):
+                is_write, item_id = step
+                try:
+                    with factory() as db:
+                        if is_write:
+                            db.execute(text("UPDATE item SET value = value + 1 WHERE id = :id"),
+                                       {"id": item_id})
+                            db.commit()
+                        else:
+                            db.execute(text("SELECT value, payload FROM item WHERE id >= :id "
+                                            "LIMIT 20"), {"id": item_id}).all()
+                    return True
+                except OperationalError:
+                    return False
+
+            started = time.perf_counter()
+            with ThreadPoolExecutor(threads) as executor:
+                outcomes = list(executor.map(run, plan))
+            elapsed = time.perf_counter() - started
+            results[mode] = {"ops_per_sec": operations / elapsed,
+                             "locked": outcomes.count(False)}
+            bench_engine.dispose()
+    return results
+
+
+if __name__ == "__main__":
+    for profile_mode, stats in benchmark_sqlite_profile().items():
+        print(f"{profile_mode:>8}: {stats['ops_per_sec']:,.0f} ops/sec, "
+              f"{stats['locked']} failed with 'database is locked'")
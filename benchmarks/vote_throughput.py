@@ -0,0 +1,115 @@
+"""
+Compare sustained vote throughput with and without the vote buffer:
+
+    python -m benchmarks.vote_throughput
+"""
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+from uuid import uuid4
+
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel, create_engine
+
+from server.apps.authentication.models import User
+from server.apps.events.models import Event, EventVote
+from server.apps.events.vote_buffer import VoteBuffer
+
+
+def benchmark_vote_throughput(votes: int = 5000, voters: int = 1000, events: int = 5,
+                              threads: int = 8) -> Dict[str, float]:
+    """
+    Measure sustained votes per second against a scratch SQLite database, writing
+    each vote in its own transaction versus through a VoteBuffer.
+
+    Args:
+        votes (int): Number of vote requests to issue
+        voters (int): Number of distinct users voting
+        events (int): Number of hot events receiving the votes
+        threads (int): Number of concurrent submitting threads
+
+    Returns:
+        dict: Votes per second for the "direct" and "buffered" modes
+    """
+    results = {}
+    for mode in ("direct", "buffered"):
+        with tempfile.TemporaryDirectory() as directory:
+            bench_engine = create_engine(
+                f"sqlite:///{os.path.join(directory, 'bench.db')}",
+                connect_args={"check_same_thread": False, "timeout": 30},
+            )
+            SQLModel.metadata.create_all(
+                bench_engine, tables=[User.__table__, Event.__table__, EventVote.__table__]
+            )
+            session_factory = sessionmaker(bind=bench_engine, autoflush=False)
+
+            with session_factory() as db:
+                event_ids = [uuid4() for _ in range(events)]
+                db.add_all(Event(id=event_id, title="Hot event", description="",
+                                 author_id=uuid4()) for event_id in event_ids)
+                db.commit()
+
+            rng = random.Random(0)
+            user_ids = [uuid4() for _ in range(voters)]
+            with session_factory() as db:
+                db.add_all(User(id=user_id, first_name="Voter", last_name="Bench",
+                                email=f"{user_id}@example.com", hashed_password="x")
+                           for user_id in user_ids)
+                db.commit()
+            requests = [(rng.choice(event_ids), rng.choice(user_ids), rng.random() < 0.8)
+                        for _ in range(votes)]
+            buffer = VoteBuffer(session_factory) if mode == "buffered" else None
+
+            def direct_vote(request, factory=session_factory):
+                event_id, user_id, has_voted = request
+                with factory() as db:
+                    if has_voted:
+                        try:
+                            db.add(EventVote(event_id=event_id, user_id=user_id))
+                            db.flush()
+                        except IntegrityError:
+                            db.rollback()
+                            return
+                        delta = 1
+                    else:
+                        if not db.query(EventVote).filter(
+                                EventVote.event_id == event_id,
+                                EventVote.user_id == user_id
+                        ).delete(synchronize_session=False):
+                            return
+                        delta = -1
+                    db.execute(update(Event).where(Event.id == event_id)
+                               .values(votes=Event.votes + delta))
+                    db.commit()
+
+            def buffered_vote(request, vote_buffer_=buffer, factory=session_factory):
+                event_id, user_id, has_voted = request
+                stored = vote_buffer_.pending_state(event_id, user_id)
+                if stored is None:
+                    with factory() as db:
+                        stored = db.query(EventVote.id).filter(
+                            EventVote.event_id == event_id,
+                            EventVote.user_id == user_id
+                        ).first() is not None
+                vote_buffer_.submit(event_id, user_id, has_voted, stored)
+
+            started = time.perf_counter()
+            if buffer is not None:
+                buffer.start()
+            with ThreadPoolExecutor(threads) as executor:
+                list(executor.map(buffered_vote if buffer else direct_vote, requests))
+            if buffer is not None:
+                buffer.stop()
+            results[mode] = votes / (time.perf_counter() - started)
+            bench_engine.dispose()
+    return results
+
+
+if __name__ == "__main__":
+    for benchmark_mode, rate in benchmark_vote_throughput().items():
+        print(f"{benchmark_mode:>8}: {rate:,.0f} votes/sec")
@@ -0,0 +1,267 @@
+"""
+Durable outbox for outgoing email.
+
+Request handlers only add an OutboxEmail row, in the same transaction as the
+change the email is about, so nothing is sent for a rolled-back request and
+nothing is lost if the process dies before sending. An EmailOutbox delivers the
+rows in the background:
+
+- a small pool of threads, each keeping one authenticated SMTP connection open
+  and sending many messages over it, reconnecting only when the server drops it
+- rows are claimed in batches under a lease, so several processes can share one
+  outbox and rows claimed by a crashed worker are picked up again
+- failed messages are retried with exponential backoff, up to
+  EMAIL_MAX_ATTEMPTS times
+"""
+import logging
+import smtplib
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Union
+from uuid import uuid4
+
+from sqlalchemy import event as sa_event, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from server.apps.authentication.models import OutboxEmail, OutboxStatus
+from server.core.config import settings
+from server.core.database import SessionLocal
+from .send_email import build_message, open_smtp_connection
+
+logger = logging.getLogger(__name__)
+
+# How long a claimed batch is reserved for the worker that claimed it
+CLAIM_LEASE = timedelta(minutes=5)
+# Longest delay between two attempts to deliver a message
+MAX_RETRY_DELAY = timedelta(hours=1)
+
+
+def _utcnow() -> datetime:
+    """Current UTC time as a naive datetime, as stored in the outbox."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class EmailOutbox:
+    """
+    Background delivery of outbox messages over a pool of persistent SMTP connections.
+
+    Args:
+        session_factory: Callable returning a new database session
+        connect: Callable returning a new, authenticated smtplib.SMTP connection
+        workers (int): Number of delivery threads, each with its own connection
+        batch_size (int): Messages claimed at once by a thread
+        poll_interval (float): Seconds between checks for due messages when idle
+        max_attempts (int): Attempts before a message is marked as failed
+        retry_base (float): Delay before the first retry, in seconds; doubled for
+            each further attempt
+    """
+
+    def __init__(self, session_factory, connect=open_smtp_connection, workers: int = 2,
+                 batch_size: int = 50, poll_interval: float = 5.0, max_attempts: int = 5,
+                 retry_base: float = 30.0):
+        self._session_factory = session_factory
+        self._connect = connect
+        self._workers = max(1, workers)
+        self._batch_size = batch_size
+        self._poll_interval = poll_interval
+        self._max_attempts = max_attempts
+        self._retry_base = retry_base
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self):
+        """Start the delivery threads."""
+        if self._threads:
+            return
+        self._stopped.clear()
+        for number in range(self._workers):
+            thread = threading.Thread(target=self._run, name=f"email-outbox-{number}",
+                                      daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        """Stop the delivery threads after their current batch."""
+        self._stopped.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def notify(self):
+        """Wake the delivery threads, e.g. after new messages were committed."""
+        self._wakeup.set()
+
+    def _claim(self) -> List[OutboxEmail]:
+        """Reserve a batch of due messages for this thread."""
+        now = _utcnow()
+        token = uuid4()
+        claimable = (
+            OutboxEmail.status == OutboxStatus.PENDING.value,
+            OutboxEmail.next_attempt_at <= now,
+            or_(OutboxEmail.claimed_until.is_(None),  # pylint: disable=no-member
+                OutboxEmail.claimed_until < now),
+        )
+        db: Session = self._session_factory()
+        try:
+            due = (select(OutboxEmail.id).where(*claimable)
+                   .order_by(OutboxEmail.next_attempt_at).limit(self._batch_size))
+            # The conditions are repeated so a row claimed concurrently is skipped
+            db.execute(
+                update(OutboxEmail)
+                .where(OutboxEmail.id.in_(due), *claimable)  # pylint: disable=no-member
+                .values(claim_token=token, claimed_until=now + CLAIM_LEASE)
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+            batch = db.query(OutboxEmail).filter(OutboxEmail.claim_token == token).all()
+            db.expunge_all()
+            return batch
+        finally:
+            db.close()
+
+    def _send_batch(self, batch: List[OutboxEmail],
+                    server: Optional[smtplib.SMTP]) -> Optional[smtplib.SMTP]:
+        """Send claimed messages over one connection and record the outcomes."""
+        sent_ids = []
+        failures = []
+        for index, message in enumerate(batch):
+            try:
+                server = self._send(server, message)
+                sent_ids.append(message.id)
+            except (smtplib.SMTPException, OSError) as error:
+                logger.warning("Failed to send email to %s: %s", message.recipient, error)
+                failures.append((message, str(error)))
+                if server is not None and not _is_connected(server):
+                    server = None
+                if server is None:
+                    # No connection could be made: back off for the rest of the batch too
+                    failures.extend((rest, str(error)) for rest in batch[index + 1:])
+                    break
+
+        now = _utcnow()
+        db: Session = self._session_factory()
+        try:
+            if sent_ids:
+                db.execute(
+                    update(OutboxEmail)
+                    .where(OutboxEmail.id.in_(sent_ids))  # pylint: disable=no-member
+                    .values(status=OutboxStatus.SENT.value, date_sent=now,
+                            attempts=OutboxEmail.attempts + 1, claimed_until=None)
+                    .execution_options(synchronize_session=False)
+                )
+            for message, error in failures:
+                attempts = message.attempts + 1
+                delay = min(timedelta(seconds=self._retry_base * 2 ** (attempts - 1)),
+                            MAX_RETRY_DELAY)
+                db.execute(
+                    update(OutboxEmail)
+                    .where(OutboxEmail.id == message.id)
+                    .values(attempts=attempts, last_error=error[:500], claimed_until=None,
+                            next_attempt_at=now + delay,
+                            status=(OutboxStatus.FAILED.value
+                                    if attempts >= self._max_attempts
+                                    else OutboxStatus.PENDING.value))
+                    .execution_options(synchronize_session=False)
+                )
+            db.commit()
+        finally:
+            db.close()
+        return server
+
+    def _send(self, server: Optional[smtplib.SMTP], message: OutboxEmail) -> smtplib.SMTP:
+        """Send one message, (re)connecting once if the connection was dropped."""
+        mime_message = build_message(message.recipient, message.subject, message.body,
+                                     message.is_html)
+        if server is not None:
+            try:
+                server.send_message(mime_message)
+                return server
+            except smtplib.SMTPServerDisconnected:
+                server.close()
+        server = self._connect()
+        server.send_message(mime_message)
+        return server
+
+    def _run(self):
+        """Deliver due messages until stopped, keeping the connection between batches."""
+        server = None
+        while not self._stopped.is_set():
+            try:
+                batch = self._claim()
+                if batch:
+                    server = self._send_batch(batch, server)
+                    continue
+            except Exception as error:  # pylint: disable=broad-except
+                logger.error("Email outbox delivery failed: %s", error)
+
+            # Idle: log out instead of holding a connection the server would time out
+            if server is not None:
+                _close_quietly(server)
+                server = None
+            self._wakeup.wait(self._poll_interval)
+            self._wakeup.clear()
+        if server is not None:
+            _close_quietly(server)
+
+
+def _is_connected(server: smtplib.SMTP) -> bool:
+    """Whether an SMTP connection is still usable."""
+    try:
+        return server.noop()[0] == 250
+    except (smtplib.SMTPException, OSError):
+        return False
+
+
+def _close_quietly(server: smtplib.SMTP):
+    """Log out of an SMTP connection, ignoring a connection that is already gone."""
+    try:
+        server.quit()
+    except (smtplib.SMTPException, OSError):
+        server.close()
+
+
+email_outbox = EmailOutbox(
+    SessionLocal,
+    workers=settings.EMAIL_OUTBOX_WORKERS,
+    batch_size=settings.EMAIL_OUTBOX_BATCH_SIZE,
+    poll_interval=settings.EMAIL_OUTBOX_POLL_SECONDS,
+    max_attempts=settings.EMAIL_MAX_ATTEMPTS,
+    retry_base=settings.EMAIL_RETRY_BASE_SECONDS,
+)
+
+
+def enqueue_email(db: Union[Session, AsyncSession], recipient_email: str, subject: str,
+                  body: str, is_html: bool = False) -> OutboxEmail:
+    """
+    Add an email to the outbox as part of the caller's transaction.
+
+    It is delivered after the transaction commits; the delivery threads are woken
+    up right away.
+
+    Args:
+        db (Union[Session, AsyncSession]): Database session of the request
+        recipient_email (str): The recipient's email address.
+        subject (str): The email subject.
+        body (str): The email body content.
+        is_html (bool): Whether the body content is HTML.
+
+    Returns:
+        OutboxEmail: The added outbox row
+    """
+    if isinstance(db, AsyncSession):
+        # Session events are dispatched by the synchronous session it wraps
+        db = db.sync_session
+    message = OutboxEmail(recipient=recipient_email, subject=subject, body=body,
+                          is_html=is_html)
+    db.add(message)
+    if not sa_event.contains(db, "after_commit", _notify_outbox):
+        sa_event.listen(db, "after_commit", _notify_outbox)
+    return message
+
+
+def _notify_outbox(_session):
+    """Session hook: wake the delivery threads once the new messages are committed."""
+    email_outbox.notify()
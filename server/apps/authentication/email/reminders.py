@@ -0,0 +1,133 @@
+"""
+Daily reminder emails for events starting the next day.
+
+One joined query streams (event, user) pairs for all registrations of tomorrow's
+events, in batches, and each reminder is rendered from a template compiled once
+at import. The reminders are added to the email outbox together with an
+EmailJobRun record for the day, in a single transaction: a second run for the same
+day, from another worker or after a restart, fails on the record's unique
+constraint and queues nothing, while a run that dies half way leaves nothing
+behind and can simply be repeated. Delivery, over reused SMTP connections and
+with retries, is left to the outbox.
+"""
+import datetime
+import logging
+import os
+from typing import Optional
+
+from jinja2 import Environment
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+from server.apps.authentication.models import EmailJobRun, User
+from server.apps.events.models import Event, EventRegistration
+from server.core.database import SessionLocal
+from .outbox import enqueue_email
+
+logger = logging.getLogger(__name__)
+
+REMINDER_JOB = "event_reminders"
+
+# Rows fetched from the database at a time
+REMINDER_BATCH_SIZE = 500
+
+SITE_URL = os.environ.get("SITE_URL", "https://yourdomain.com")
+
+# Autoescaping keeps event titles and names from injecting markup into the email
+_REMINDER_TEMPLATE = Environment(autoescape=True).from_string(
+"""<html>
+<body>
+    <h2>Event Reminder</h2>
+    <p>Hello {{ first_name }} {{ last_name }},</p>
+    <p>This is a friendly reminder that you're registered for the following event
+    happening tomorrow:</p>
+    <div style="padding: 10px; border-left: 4px solid #3498db; margin: 15px 0;">
+        <h3>{{ title }}</h3>
+        <p><strong>Date:</strong> {{ date }}</p>
+        <p><strong>Time:</strong> {{ time }}</p>
+        <p><strong>Location:</strong> {{ location }}</p>
+    </div>
+    <p>We're looking forward to seeing you there!</p>
+    <p>View event details: <a href="{{ url }}">Click here</a></p>
+    <p>Best regards,<br>The Community Events Team<br>Tribuna</p>
+</body>
+</html>
+"""
+)
+
+
+def send_event_reminder_emails(session_factory=SessionLocal,
+                               day: Optional[datetime.date] = None) -> int:
+    """
+    Queue reminder emails to users registered for events that start on the given day.
+
+    This function is run daily by the scheduler; running it again for the same day
+    does nothing.
+
+    Args:
+        session_factory: Callable returning a new database session
+        day (Optional[datetime.date]): Day whose events to remind of; defaults to tomorrow
+
+    Returns:
+        int: Number of reminders queued, 0 if the day was already handled
+    """
+    day = day or datetime.date.today() + datetime.timedelta(days=1)
+    day_start = datetime.datetime.combine(day, datetime.time.min)
+    day_end = datetime.datetime.combine(day, datetime.time.max)
+
+    logger.info("Checking for events starting between %s and %s", day_start, day_end)
+
+    # All (event, registered user) pairs in one query, streamed in batches
+    statement = (
+        select(Event.id, Event.title, Event.date_scheduled, Event.location,
+               User.first_name, User.last_name, User.email)
+        .join(EventRegistration, EventRegistration.event_id == Event.id)
+        .join(User, User.id == EventRegistration.user_id)
+        .where(Event.date_scheduled.between(day_start, day_end),
+               User.email.is_not(None), User.email != "")  # pylint: disable=no-member
+        .execution_options(yield_per=REMINDER_BATCH_SIZE)
+    )
+
+    db = session_factory()
+    try:
+        # Claim the run first, so a concurrent run stops before doing any work
+        run = EmailJobRun(job=REMINDER_JOB, run_key=day.isoformat())
+        db.add(run)
+        try:
+            db.flush()
+        except IntegrityError:
+            db.rollback()
+            logger.info("Reminders for %s were already queued", day)
+            return 0
+
+        queued = 0
+        for rows in db.execute(statement).partitions():
+            for row in rows:
+                enqueue_email(
+                    db,
+                    row.email,
+                    f"Reminder: '{row.title}' starts tomorrow!",
+                    _REMINDER_TEMPLATE.render(
+                        first_name=row.first_name,
+                        last_name=row.last_name,
+                        title=row.title,
+                        date=row.date_scheduled.strftime('%A, %B %d, %Y'),
+                        time=row.date_scheduled.strftime('%I:%M %p'),
+                        location=row.location,
+                        url=f"{SITE_URL}/events/view_event/{row.id}",
+                    ),
+                    is_html=True,
+                )
+                queued += 1
+            db.flush()
+
+        run.messages = queued
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    logger.info("Queued %d event reminders for %s", queued, day)
+    return queued
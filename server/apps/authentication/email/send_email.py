@@ -1,21 +1,16 @@
 """
-Module for sending emails and event reminder notifications.
+Module for building and sending emails over SMTP.
 """
 
 import os
 import smtplib
-import datetime
 
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import logging
 
-from sqlalchemy import between
 from dotenv import load_dotenv
 
-from server.apps.events.models import Event, EventRegistration
-from server.apps.authentication.models import User
-
 # Load environment variables from a .env file (for development)
 load_dotenv()
 
@@ -29,11 +24,13 @@ SMTP_PORT = int(os.environ.get("SMTP_PORT", 587))
 SMTP_USERNAME = os.environ.get("SMTP_USERNAME", "yourgmail@gmail.com")
 SMTP_PASSWORD = os.environ.get("SMTP_PASSWORD", "your_app_password")
 FROM_EMAIL = os.environ.get("FROM_EMAIL", SMTP_USERNAME)
+# Set to "false" for a local relay or test server without STARTTLS and login
+SMTP_USE_TLS = os.environ.get("SMTP_USE_TLS", "true").lower() != "false"
 
 
-def send_email(recipient_email, subject, body, is_html=False):
+def build_message(recipient_email, subject, body, is_html=False):
     """
-    Send an email to the specified recipient.
+    Build an email message from the configured sender.
 
     Args:
         recipient_email (str): The recipient's email address.
@@ -42,113 +39,64 @@ def send_email(recipient_email, subject, body, is_html=False):
         is_html (bool): Whether the body content is HTML.
 
     Returns:
-        bool: True if the email was sent successfully, False otherwise.
+        MIMEMultipart: The message, ready to send.
     """
-    try:
-        # Create message
-        msg = MIMEMultipart()
-        msg['From'] = FROM_EMAIL
-        msg['To'] = recipient_email
-        msg['Subject'] = subject
+    msg = MIMEMultipart()
+    msg['From'] = FROM_EMAIL
+    msg['To'] = recipient_email
+    msg['Subject'] = subject
 
-        # Attach body with appropriate content type
-        content_type = "html" if is_html else "plain"
-        msg.attach(MIMEText(body, content_type))
+    # Attach body with appropriate content type
+    content_type = "html" if is_html else "plain"
+    msg.attach(MIMEText(body, content_type))
+    return msg
 
-        logger.debug("Connecting to SMTP server: %s:%d", SMTP_SERVER, SMTP_PORT)
 
-        # Connect to SMTP server and send message
-        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
+def open_smtp_connection():
+    """
+    Connect to the configured SMTP server, securing the connection and logging in.
+
+    Returns:
+        smtplib.SMTP: An authenticated connection; the caller closes it.
+    """
+    logger.debug("Connecting to SMTP server: %s:%d", SMTP_SERVER, SMTP_PORT)
+    server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT, timeout=30)
+    try:
+        if SMTP_USE_TLS:
             server.starttls()  # Secure the connection
             server.login(SMTP_USERNAME, SMTP_PASSWORD)
-            server.send_message(msg)
-
-        logger.info("Email sent successfully to %s", recipient_email)
-        logger.debug("SMTP_USERNAME: %s", SMTP_USERNAME)
-        logger.debug("SMTP_SERVER: %s, PORT: %d", SMTP_SERVER, SMTP_PORT)
-        return True
-
-    except smtplib.SMTPException as error:
-        logger.error("Failed to send email to %s: %s", recipient_email, str(error))
-        return False
+    except (smtplib.SMTPException, OSError):
+        server.close()
+        raise
+    return server
 
 
-def send_event_reminder_emails():
+def send_email(recipient_email, subject, body, is_html=False):
     """
-    Send reminder emails to users registered for events that start tomorrow.
+    Send an email to the specified recipient.
 
-    This function should be run daily by a scheduler (e.g., cron job or Celery).
+    Args:
+        recipient_email (str): The recipient's email address.
+        subject (str): The email subject.
+        body (str): The email body content.
+        is_html (bool): Whether the body content is HTML.
 
     Returns:
-        None
+        bool: True if the email was sent successfully, False otherwise.
     """
-
-    # Get tomorrow's date
-    tomorrow = datetime.date.today() + datetime.timedelta(days=1)
-    tomorrow_start = datetime.datetime.combine(tomorrow, datetime.time.min)
-    tomorrow_end = datetime.datetime.combine(tomorrow, datetime.time.max)
-
-    logger.info("Checking for events starting between %s and %s", tomorrow_start, tomorrow_end)
-
     try:
-        # Find all events starting tomorrow
-        tomorrow_events = Event.query.filter(
-            between(Event.date_scheduled, tomorrow_start, tomorrow_end)
-        ).all()
-
-        logger.info("Found %d events starting tomorrow", len(tomorrow_events))
-
-        # For each event, get registered users and send reminders
-        for event in tomorrow_events:
-            # Get all registrations for this event
-            registrations = EventRegistration.query.filter_by(event_id=event.id).all()
-            logger.info("Event '%s' (ID: %d) has %d registrations", event.title, \
-                         event.id, len(registrations))
-
-            # Get user emails and send reminders
-            for registration in registrations:
-                user = User.query.get(registration.user_id)
-                if not user or not user.email:
-                    logger.warning("User %d has no valid email", registration.user_id)
-                    continue
-
-                # Format the reminder email
-                subject = f"Reminder: '{event.title}' starts tomorrow!"
-
-                # Create HTML email body
-                html_body = (
-f"""
-<html>
-<body>
-    <h2>Event Reminder</h2>
-    <p>Hello {user.first_name} {user.last_name},</p>
-    <p>This is a friendly reminder that you're registered for the following event 
-    happening tomorrow:</p>
-    <div style="padding: 10px; border-left: 4px solid #3498db; margin: 15px 0;">
-        <h3>{event.title}</h3>
-        <p><strong>Date:</strong> {event.date_scheduled.strftime('%A, %B %d, %Y')}</p>
-        <p><strong>Time:</strong> {event.date_scheduled.strftime('%I:%M %p')}</p>
-        <p><strong>Location:</strong> {event.location}</p>
-    </div>
-    <p>We're looking forward to seeing you there!</p>
-    <p>View event details: 
-<a href="{os.environ.get('SITE_URL', 'https://yourdomain.com')}/events/{event.id}">
-Click here</a></p>
-    <p>Best regards,<br>The Community Events Team<br>Tribuna</p>
-</body>
-</html>
-"""
-)
+        # Create message
+        msg = build_message(recipient_email, subject, body, is_html)
 
-                # Send the email
-                success = send_email(user.email, subject, html_body, is_html=True)
+        # Connect to SMTP server and send message
+        with open_smtp_connection() as server:
+            server.send_message(msg)
 
-                if success:
-                    logger.info("Sent reminder email to %s for event %d", user.email, event.id)
-                else:
-                    logger.error("Failed to send reminder email to %s for event %d",\
-                                  user.email, event.id)
+        logger.info("Email sent successfully to %s", recipient_email)
+        logger.debug("SMTP_USERNAME: %s", SMTP_USERNAME)
+        logger.debug("SMTP_SERVER: %s, PORT: %d", SMTP_SERVER, SMTP_PORT)
+        return True
 
-    except (smtplib.SMTPException, AttributeError, KeyError) as error:
-        logger.error("Error sending event reminders: %s", str(error))
-        # Consider sending an admin notification for critical failures
+    except (smtplib.SMTPException, OSError) as error:
+        logger.error("Failed to send email to %s: %s", recipient_email, str(error))
+        return False
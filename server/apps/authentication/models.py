@@ -1,12 +1,19 @@
 """
-This module defines the models for the authentication app, including the User model and Role enum.
+This module defines the models for the authentication app, including the User model and Role enum,
+and the outbox of emails waiting to be sent.
 """
 
+from datetime import datetime, timezone  # Standard library imports
 from uuid import uuid4, UUID  # Standard library imports
 from typing import Optional  # Standard library imports
 from enum import Enum  # Standard library imports
 
-from sqlmodel import SQLModel, Field  # Third-party imports
+from sqlmodel import SQLModel, Field, Index, UniqueConstraint  # Third-party imports
+
+
+def _utcnow() -> datetime:
+    """Current UTC time as a naive datetime, as stored by the email models."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
 
 
 class Role(str, Enum):
@@ -37,3 +44,67 @@ class User(SQLModel, table=True):
     hashed_password: str
     bio: Optional[str] = Field(default="", max_length=500)
     role: Role = Field(default=Role.USER)
+
+
+class OutboxStatus(str, Enum):
+    """Delivery state of an outbox message."""
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+
+
+class OutboxEmail(SQLModel, table=True):
+    """
+    An email waiting to be delivered, or the record of one that was.
+
+    Attributes:
+        recipient (str): The recipient's email address.
+        subject (str): The email subject.
+        body (str): The email body content.
+        is_html (bool): Whether the body content is HTML.
+        status (str): One of OutboxStatus.
+        attempts (int): Number of delivery attempts so far.
+        next_attempt_at (datetime): Earliest time of the next attempt (UTC).
+        claim_token (Optional[UUID]): Batch the message was last claimed in.
+        claimed_until (Optional[datetime]): End of the claiming worker's lease (UTC).
+        last_error (Optional[str]): Error of the last failed attempt.
+    """
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    recipient: str
+    subject: str
+    body: str
+    is_html: bool = Field(default=False)
+    status: str = Field(default=OutboxStatus.PENDING.value)
+    attempts: int = Field(default=0)
+    next_attempt_at: datetime = Field(default_factory=_utcnow)
+    claim_token: Optional[UUID] = Field(default=None)
+    claimed_until: Optional[datetime] = Field(default=None)
+    last_error: Optional[str] = Field(default=None)
+    date_created: datetime = Field(default_factory=_utcnow)
+    date_sent: Optional[datetime] = Field(default=None)
+
+    # Workers look for due pending messages
+    __table_args__ = (
+        Index("ix_outboxemail_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+
+class EmailJobRun(SQLModel, table=True):
+    """
+    Record of a scheduled email job run, so a run is carried out only once even when
+    several workers or a restart fire the same job.
+
+    Attributes:
+        job (str): Name of the job.
+        run_key (str): Identifies the run within the job, e.g. the day it covers.
+        messages (int): Number of emails the run queued.
+    """
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    job: str
+    run_key: str
+    messages: int = Field(default=0)
+    date_created: datetime = Field(default_factory=_utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("job", "run_key", name="unique_email_job_run"),
+    )
@@ -1,29 +1,34 @@
 """Authentication routes module for handling user registration, login, and profile management."""
 
 # Standard library imports
+import asyncio
 import uuid
 from datetime import timedelta
-from pathlib import Path
 
 # Third-party imports
 from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import HTMLResponse
 from fastapi.security import OAuth2PasswordBearer
 from fastapi.templating import Jinja2Templates
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import case, delete, desc, func, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 # Local application imports
-from server.core.database import get_db
+from server.core.database import get_async_db
+from server.core.auth_cache import token_cache
+from server.core.page_cache import page_cache
 from server.core.security import (
     create_access_token,
     get_current_user,
-    hash_password,
-    verify_password,
+    hash_password_async,
+    verify_password_async,
 )
 from server.apps.authentication.models import User
-from server.apps.events.models import Event
+from server.apps.events.models import Event, EventComment, EventRegistration, EventVote
 from server.apps.events.schemas import EventResponse
+from server.apps.events.vote_buffer import vote_buffer
+from server.apps.forum.models import (Answer, Comment, Like, Post, Question, QuestionTagLink,
+                                      Suggestion)
 from .schemas import UserCreate, UserLogin, UserResponse, UserUpdate
 
 
@@ -35,7 +40,7 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 
 @router.post("/register", response_model=UserResponse)
-def register_user(user: UserCreate, db: Session = Depends(get_db)):
+async def register_user(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Register a new user with the provided information.
     
@@ -49,11 +54,11 @@ def register_user(user: UserCreate, db: Session = Depends(get_db)):
     Raises:
         HTTPException: If email is already registered
     """
-    db_user = db.query(User).filter(User.email == user.email).first()
+    db_user = (await db.execute(select(User).where(User.email == user.email))).scalars().first()
     if db_user:
         raise HTTPException(status_code=400, detail="Email already registered")
 
-    hashed_password = hash_password(user.password)
+    hashed_password = await hash_password_async(user.password)
     new_user = User(
         first_name=user.first_name,
         last_name=user.last_name,
@@ -61,8 +66,8 @@ def register_user(user: UserCreate, db: Session = Depends(get_db)):
         hashed_password=hashed_password
     )
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
 
     # Convert the UUID to a string in the response
     return UserResponse(
@@ -75,26 +80,19 @@ def register_user(user: UserCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/register", response_class=HTMLResponse)
-def register_page():
+def register_page(request: Request):
     """
     Serve the user registration page.
     
     Returns:
         HTML response with registration form
     """
-    # Path to the registration HTML file
-    html_file_path = Path(__file__).parent.parent.parent.parent / "src/pages/registration-page.html"
-
-    # Read the HTML file content
-    if html_file_path.exists():
-        html_content = html_file_path.read_text(encoding="utf-8")
-        return HTMLResponse(content=html_content)
-    else:
-        return HTMLResponse(content="<h1>Registration page not found</h1>", status_code=404)
+    # Serve the registration page from the in-memory page cache
+    return page_cache.response(request, "registration-page.html", "<h1>Registration page not found</h1>")
 
 
 @router.post("/login", response_model=dict)
-def login_user(user: UserLogin, db: Session = Depends(get_db)):
+async def login_user(user: UserLogin, db: AsyncSession = Depends(get_async_db)):
     """
     Authenticate user and provide access token.
     
@@ -108,8 +106,8 @@ def login_user(user: UserLogin, db: Session = Depends(get_db)):
     Raises:
         HTTPException: If credentials are invalid
     """
-    db_user = db.query(User).filter(User.email == user.email).first()
-    if not db_user or not verify_password(user.password, db_user.hashed_password):
+    db_user = (await db.execute(select(User).where(User.email == user.email))).scalars().first()
+    if not db_user or not await verify_password_async(user.password, db_user.hashed_password):
         raise HTTPException(status_code=400, detail="Invalid email or password")
 
     # Generate JWT token
@@ -122,26 +120,20 @@ def login_user(user: UserLogin, db: Session = Depends(get_db)):
 
 
 @router.get("/login", response_class=HTMLResponse)
-def login_page():
+def login_page(request: Request):
     """
     Serve the login page.
     
     Returns:
         HTML response with login form
     """
-    # Path to the login HTML file
-    html_file_path = Path(__file__).parent.parent.parent.parent / "src/pages/login-page.html"
-
-    # Read the HTML file content
-    if html_file_path.exists():
-        html_content = html_file_path.read_text(encoding="utf-8")
-        return HTMLResponse(content=html_content)
-    else:
-        return HTMLResponse(content="<h1>Login page not found</h1>", status_code=404)
+    # Serve the login page from the in-memory page cache
+    return page_cache.response(request, "login-page.html", "<h1>Login page not found</h1>")
 
 
 @router.get("/get_user_id", response_model=dict)
-def get_user_id(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def get_user_id(token: str = Depends(oauth2_scheme),
+                      db: AsyncSession = Depends(get_async_db)):
     """
     Get the current user's ID from token.
     
@@ -156,7 +148,7 @@ def get_user_id(token: str = Depends(oauth2_scheme), db: Session = Depends(get_d
         HTTPException: If token is invalid
     """
     # Validate the token and get the current user
-    user = get_current_user(token, db)
+    user = await get_current_user(token, db)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
 
@@ -165,7 +157,8 @@ def get_user_id(token: str = Depends(oauth2_scheme), db: Session = Depends(get_d
 
 
 @router.get("/profile/{user_id}", response_class=HTMLResponse)
-def view_profile_page(user_id: str, request: Request, db: Session = Depends(get_db)):
+async def view_profile_page(user_id: str, request: Request,
+                            db: AsyncSession = Depends(get_async_db)):
     """
     Serve the profile page for a user.
     
@@ -187,7 +180,7 @@ def view_profile_page(user_id: str, request: Request, db: Session = Depends(get_
         raise HTTPException(status_code=400, detail='Invalid user ID format') from exc
 
     # Query the database for the user
-    user = db.query(User).filter(User.id == user_id_uuid).first()
+    user = await db.get(User, user_id_uuid)
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
 
@@ -201,12 +194,11 @@ def view_profile_page(user_id: str, request: Request, db: Session = Depends(get_
     )
 
     # Get user's events
-    users_events = (
-        db.query(Event)
-        .filter(Event.author_id == user_id_uuid)
+    users_events = (await db.execute(
+        select(Event)
+        .where(Event.author_id == user_id_uuid)
         .order_by(desc(Event.date_created))
-        .all()
-    )
+    )).scalars().all()
 
     # Convert the events to the EventResponse model
     events_data = [
@@ -235,7 +227,8 @@ def view_profile_page(user_id: str, request: Request, db: Session = Depends(get_
 
 
 @router.get("/get_user_data", response_model=UserResponse)
-def get_user_data(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def get_user_data(token: str = Depends(oauth2_scheme),
+                        db: AsyncSession = Depends(get_async_db)):
     """
     Get current user's profile data.
     
@@ -250,7 +243,7 @@ def get_user_data(token: str = Depends(oauth2_scheme), db: Session = Depends(get
         HTTPException: If token is invalid
     """
     # Validate the token and get the current user
-    user = get_current_user(token, db)
+    user = await get_current_user(token, db)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
 
@@ -265,29 +258,22 @@ def get_user_data(token: str = Depends(oauth2_scheme), db: Session = Depends(get
 
 
 @router.get("/settings", response_class=HTMLResponse)
-def settings_page(_: Request):
+def settings_page(request: Request):
     """
     Serve the settings page.
     
     Returns:
         HTML response with settings form
     """
-    # Path to the settings HTML file
-    html_file_path = Path(__file__).parent.parent.parent.parent / "src/pages/settings-page.html"
-
-    # Read the HTML file content
-    if html_file_path.exists():
-        html_content = html_file_path.read_text(encoding="utf-8")
-        return HTMLResponse(content=html_content)
-    else:
-        return HTMLResponse(content="<h1>Settings page not found</h1>", status_code=404)
+    # Serve the settings page from the in-memory page cache
+    return page_cache.response(request, "settings-page.html", "<h1>Settings page not found</h1>")
 
 
 @router.post("/settings", response_model=UserResponse)
-def update_user_settings(
+async def update_user_settings(
     user_update: UserUpdate,
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update user settings.
@@ -303,8 +289,9 @@ def update_user_settings(
     Raises:
         HTTPException: If validation fails or token is invalid
     """
-    # Validate the token and get the current user
-    current_user = get_current_user(token, db)
+    # Validate the token and load the current user for editing
+    user_snapshot = await get_current_user(token, db)
+    current_user = await db.get(User, user_snapshot.id)
     if not current_user:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
 
@@ -320,7 +307,9 @@ def update_user_settings(
 
     # Check if the email is already registered by another user (if email is being changed)
     if user_update.email != current_user.email:
-        db_user = db.query(User).filter(User.email == user_update.email).first()
+        db_user = (await db.execute(
+            select(User).where(User.email == user_update.email)
+        )).scalars().first()
         if db_user:
             raise HTTPException(
                 status_code=400,
@@ -346,15 +335,19 @@ def update_user_settings(
             )
 
         # Verify current password
-        if not verify_password(user_update.current_password, current_user.hashed_password):
+        if not await verify_password_async(user_update.current_password,
+                                           current_user.hashed_password):
             raise HTTPException(status_code=400, detail="Current password is incorrect")
 
         # Update password
-        current_user.hashed_password = hash_password(user_update.new_password)
+        current_user.hashed_password = await hash_password_async(user_update.new_password)
 
     # Save changes to database
-    db.commit()
-    db.refresh(current_user)
+    await db.commit()
+    await db.refresh(current_user)
+
+    # Cached tokens still hold the old user details
+    token_cache.invalidate_user(current_user.id)
 
     # Return updated user data with all fields
     return UserResponse(
@@ -366,8 +359,112 @@ def update_user_settings(
     )
 
 
+async def _delete_user_activity(db: AsyncSession, user_id: uuid.UUID):
+    """
+    Delete the rows that reference a user, so the user itself can be deleted with
+    foreign keys enforced.
+
+    The user's events are deleted with their votes, registrations and comments. On
+    other events the user's votes and comments are taken off the counters, and
+    replies to the user's comments are kept as top-level comments. Forum activity
+    is deleted by _delete_forum_activity.
+
+    Args:
+        db (AsyncSession): Database session
+        user_id (uuid.UUID): ID of the user being deleted
+    """
+    if vote_buffer is not None:
+        # Buffered votes must reach the database before the rows they refer to go away
+        await asyncio.get_running_loop().run_in_executor(None, vote_buffer.flush)
+
+    authored = select(Event.id).where(Event.author_id == user_id)
+    removed_comments = select(EventComment.id).where(
+        (EventComment.user_id == user_id) | EventComment.event_id.in_(authored)  # pylint: disable=no-member
+    )
+
+    # Counters of other events lose this user's votes and visible comments
+    vote_counts = (await db.execute(
+        select(EventVote.event_id, func.count())  # pylint: disable=not-callable
+        .where(EventVote.user_id == user_id, EventVote.event_id.not_in(authored))  # pylint: disable=no-member
+        .group_by(EventVote.event_id)
+    )).all()
+    comment_counts = (await db.execute(
+        select(EventComment.event_id, func.count())  # pylint: disable=not-callable
+        .where(EventComment.user_id == user_id,
+               EventComment.is_deleted == False,  # pylint: disable=singleton-comparison
+               EventComment.event_id.not_in(authored))  # pylint: disable=no-member
+        .group_by(EventComment.event_id)
+    )).all()
+    for event_id, count in vote_counts:
+        await db.execute(update(Event).where(Event.id == event_id).values(
+            votes=case((Event.votes < count, 0), else_=Event.votes - count)))
+    for event_id, count in comment_counts:
+        await db.execute(update(Event).where(Event.id == event_id).values(
+            comments_count=case((Event.comments_count < count, 0),
+                                else_=Event.comments_count - count)))
+
+    # Unlink every reply to a removed comment, so none of them is referenced any more
+    await db.execute(
+        update(EventComment)
+        .where(EventComment.parent_comment_id.in_(removed_comments))  # pylint: disable=no-member
+        .values(parent_comment_id=None)
+        .execution_options(synchronize_session=False)
+    )
+    for model in (EventComment, EventVote, EventRegistration):
+        await db.execute(delete(model).where(
+            (model.user_id == user_id) | model.event_id.in_(authored)  # pylint: disable=no-member
+        ).execution_options(synchronize_session=False))
+    await db.execute(delete(Event).where(Event.author_id == user_id)
+                     .execution_options(synchronize_session=False))
+    await _delete_forum_activity(db, user_id)
+
+
+async def _delete_forum_activity(db: AsyncSession, user_id: uuid.UUID):
+    """
+    Delete the user's forum posts, questions, answers, comments, likes and
+    suggestions, together with the rows that belong to the user's posts and questions.
+
+    Args:
+        db (AsyncSession): Database session
+        user_id (uuid.UUID): ID of the user being deleted
+    """
+    # pylint: disable=no-member
+    # The forum tables declare user_id as an integer; bind the id as user.id stores it
+    user_key = literal(user_id, User.id.type)
+    posts = select(Post.id).where(Post.user_id == user_key)
+    questions = select(Question.id).where(Question.user_id == user_key)
+    answers = select(Answer.id).where(
+        (Answer.user_id == user_key) | Answer.question_id.in_(questions))
+
+    # Answers that stay lose this user's likes
+    like_counts = (await db.execute(
+        select(Like.answer_id, func.count())  # pylint: disable=not-callable
+        .where(Like.user_id == user_key, Like.answer_id.is_not(None),
+               Like.answer_id.not_in(answers))
+        .group_by(Like.answer_id)
+    )).all()
+    for answer_id, count in like_counts:
+        await db.execute(update(Answer).where(Answer.id == answer_id).values(
+            likes=case((Answer.likes < count, 0), else_=Answer.likes - count)))
+
+    statements = (
+        delete(Like).where((Like.user_id == user_key) | Like.post_id.in_(posts)
+                           | Like.question_id.in_(questions) | Like.answer_id.in_(answers)),
+        delete(Comment).where((Comment.user_id == user_key) | Comment.post_id.in_(posts)),
+        delete(Suggestion).where((Suggestion.user_id == user_key)
+                                 | Suggestion.question_id.in_(questions)),
+        delete(QuestionTagLink).where(QuestionTagLink.question_id.in_(questions)),
+        delete(Answer).where(Answer.id.in_(answers)),
+        delete(Question).where(Question.user_id == user_key),
+        delete(Post).where(Post.user_id == user_key),
+    )
+    for statement in statements:
+        await db.execute(statement.execution_options(synchronize_session=False))
+
+
 @router.delete("/delete_account", response_model=dict)
-def delete_account(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def delete_account(token: str = Depends(oauth2_scheme),
+                         db: AsyncSession = Depends(get_async_db)):
     """
     Delete the current user's account.
     
@@ -381,21 +478,24 @@ def delete_account(token: str = Depends(oauth2_scheme), db: Session = Depends(ge
     Raises:
         HTTPException: If token is invalid or deletion fails
     """
-    # Validate the token and get the current user
-    current_user = get_current_user(token, db)
+    # Validate the token and load the current user for deletion
+    user_snapshot = await get_current_user(token, db)
+    current_user = await db.get(User, user_snapshot.id)
     if not current_user:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
 
     try:
         # Delete the user
         user_id = current_user.id  # Save ID for logging
-        db.delete(current_user)
-        db.commit()
+        await _delete_user_activity(db, user_id)
+        await db.delete(current_user)
+        await db.commit()
+        token_cache.invalidate_user(user_id)
         print(f"User account deleted: {user_id}")
 
         return {"message": "Account successfully deleted"}
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         print(f"Error deleting account: {e}")
         # Proper exception chaining using "from"
         raise HTTPException(
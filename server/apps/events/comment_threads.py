@@ -0,0 +1,222 @@
+"""
+Threaded comment loading for events.
+
+A page of top-level comments (or of replies to one comment) is loaded together
+with its reply subtrees and author names through a single recursive CTE,
+instead of one query per comment for the author and parent lookups.
+
+Each recursive step reads at most replies_limit replies per comment, through a
+correlated LIMIT subquery on the (parent_comment_id, date_created) index, so a
+comment with thousands of replies costs no more than one with a few. SQLite does
+not allow window functions in the recursive part of a CTE, which rules out
+ROW_NUMBER() there. Whether more replies exist is answered with an EXISTS probe
+past the limit.
+
+A deleted comment that still has replies is returned as a placeholder, with its
+content removed and is_deleted set, so its replies stay reachable as they are on
+the flat comments endpoint; deleted comments without replies are left out.
+"""
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import and_, case, exists, func, literal, or_, select
+from sqlalchemy.orm import aliased
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from server.apps.authentication.models import User
+from .models import EventComment
+from .pagination import decode_cursor, encode_cursor
+from .schemas import EventCommentThreadResponse, format_username
+
+DEFAULT_THREAD_PAGE_SIZE = 20
+MAX_THREAD_PAGE_SIZE = 100
+DEFAULT_THREAD_DEPTH = 3
+MAX_THREAD_DEPTH = 10
+DEFAULT_REPLIES_PER_COMMENT = 10
+MAX_REPLIES_PER_COMMENT = 100
+
+# Comments are ordered oldest first, like the flat comments endpoint
+CURSOR_SORT = "date_created"
+
+_COMMENT_COLUMNS = (
+    "id", "event_id", "user_id", "content", "date_created", "date_updated",
+    "parent_comment_id", "is_deleted",
+)
+
+
+def _is_shown(comment):
+    """Condition for comments in threads: live ones, and deleted ones with replies."""
+    child = aliased(EventComment)
+    return or_(
+        comment.is_deleted == False,  # pylint: disable=singleton-comparison
+        exists().where(child.parent_comment_id == comment.id),
+    )
+
+
+def _author_name(first_name: Optional[str], last_name: Optional[str]) -> str:
+    """Display name for a comment author, falling back for deleted accounts."""
+    if not first_name:
+        return "Unknown User"
+    return format_username(first_name, last_name)
+
+
+async def load_comment_threads(
+    db: AsyncSession,
+    event_id: UUID,
+    parent_comment_id: Optional[UUID] = None,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_THREAD_PAGE_SIZE,
+    depth: int = DEFAULT_THREAD_DEPTH,
+    replies_limit: int = DEFAULT_REPLIES_PER_COMMENT,
+) -> Tuple[List[EventCommentThreadResponse], Optional[str]]:
+    """
+    Load a page of comment threads for an event.
+
+    Deleted comments with replies are returned as placeholders without content.
+
+    Args:
+        db: Database session
+        event_id: UUID of the event
+        parent_comment_id: Load replies to this comment instead of top-level comments
+        cursor: Cursor returned with the previous page of this level
+        limit: Number of comments on this level per page
+        depth: Levels of nested replies to include below each comment
+        replies_limit: Maximum replies returned under any single comment
+
+    Returns:
+        tuple: (comment threads, cursor for the next page or None)
+
+    Raises:
+        InvalidCursorError: If the cursor is invalid
+    """
+    limit = max(1, min(limit, MAX_THREAD_PAGE_SIZE))
+    depth = max(0, min(depth, MAX_THREAD_DEPTH))
+    replies_limit = max(1, min(replies_limit, MAX_REPLIES_PER_COMMENT))
+
+    # Anchor: one page of comments on the requested level, plus one to tell whether
+    # another page exists; position numbers them so the extra one is not expanded
+    page = select(
+        *(getattr(EventComment, name) for name in _COMMENT_COLUMNS),
+        func.row_number().over(  # pylint: disable=not-callable
+            order_by=(EventComment.date_created, EventComment.id)
+        ).label("position"),
+    ).where(
+        EventComment.event_id == event_id,
+        _is_shown(EventComment),
+        EventComment.parent_comment_id == parent_comment_id if parent_comment_id
+        else EventComment.parent_comment_id.is_(None),  # pylint: disable=no-member
+    )
+    if cursor:
+        last_created, last_id = decode_cursor(cursor, CURSOR_SORT)
+        page = page.where(or_(
+            EventComment.date_created > last_created,
+            and_(EventComment.date_created == last_created, EventComment.id > last_id)
+        ))
+    page = page.order_by(EventComment.date_created, EventComment.id).limit(limit + 1)
+    page = page.subquery("page")
+
+    tree = select(
+        *(page.c[name] for name in _COMMENT_COLUMNS),
+        page.c.position,
+        literal(0).label("depth"),
+    ).cte("comment_tree", recursive=True)
+
+    # Recursive step: the first replies_limit replies of each comment in the tree,
+    # down to the requested depth
+    reply = aliased(EventComment)
+    first_replies = select(reply.id).where(
+        reply.parent_comment_id == tree.c.id,
+        _is_shown(reply),
+    ).order_by(reply.date_created, reply.id).limit(replies_limit)
+    replies = select(
+        *(getattr(EventComment, name) for name in _COMMENT_COLUMNS),
+        literal(0).label("position"),
+        (tree.c.depth + 1).label("depth"),
+    ).select_from(tree).join(
+        EventComment, EventComment.id.in_(first_replies)  # pylint: disable=no-member
+    ).where(
+        tree.c.depth < depth,
+        tree.c.position <= limit,
+    )
+    tree = tree.union_all(replies)
+
+    # Whether a comment has replies beyond those in the tree: past the depth any
+    # reply counts, above it only one past the first replies_limit
+    def replies_after(offset: int):
+        return select(reply.id).where(
+            reply.parent_comment_id == tree.c.id,
+            _is_shown(reply),
+        ).order_by(reply.date_created, reply.id).offset(offset).limit(1).exists()
+
+    more_replies = case(
+        (tree.c.depth >= depth, replies_after(0)),
+        else_=replies_after(replies_limit),
+    ).label("more_replies")
+
+    statement = select(tree, User.first_name, User.last_name, more_replies).outerjoin(
+        User, User.id == tree.c.user_id
+    ).order_by(tree.c.depth, tree.c.date_created, tree.c.id)
+    rows = (await db.execute(statement)).all()
+
+    parent_author = None
+    if parent_comment_id:
+        parent_row = (await db.execute(select(User.first_name, User.last_name).join(
+            EventComment, EventComment.user_id == User.id
+        ).where(EventComment.id == parent_comment_id))).first()
+        parent_author = _author_name(*parent_row) if parent_row else None
+
+    return _build_threads(rows, limit, parent_author)
+
+
+def _build_threads(rows, limit: int, parent_author: Optional[str]):
+    """Assemble CTE rows (ordered by depth, then date) into nested responses."""
+    nodes: Dict[UUID, EventCommentThreadResponse] = {}
+    roots: List[EventCommentThreadResponse] = []
+    children: Dict[UUID, List[EventCommentThreadResponse]] = {}
+    more_replies: Dict[UUID, bool] = {}
+
+    for row in rows:
+        if row.depth == 0:
+            author = parent_author
+        elif row.parent_comment_id in nodes:
+            author = nodes[row.parent_comment_id].author_username
+        else:
+            continue
+
+        node = EventCommentThreadResponse(
+            id=row.id,
+            event_id=row.event_id,
+            user_id=row.user_id,
+            author_username=_author_name(row.first_name, row.last_name),
+            content="" if row.is_deleted else row.content,
+            date_created=row.date_created.isoformat(),
+            date_updated=row.date_updated.isoformat() if row.date_updated else None,
+            parent_comment_id=row.parent_comment_id,
+            parent_comment_author=author,
+            depth=row.depth,
+            is_deleted=row.is_deleted,
+        )
+        nodes[row.id] = node
+        more_replies[row.id] = bool(row.more_replies)
+        if row.depth == 0:
+            roots.append(node)
+        else:
+            children.setdefault(row.parent_comment_id, []).append(node)
+
+    next_cursor = None
+    if len(roots) > limit:
+        roots = roots[:limit]
+        last = roots[-1]
+        next_cursor = encode_cursor(CURSOR_SORT, last.date_created, last.id)
+
+    for comment_id, node in nodes.items():
+        node.replies = children.get(comment_id, [])
+        if not more_replies[comment_id]:
+            continue
+        node.has_more_replies = True
+        if node.replies:
+            # More replies past the per-comment limit; continue after the last one shown
+            last = node.replies[-1]
+            node.replies_cursor = encode_cursor(CURSOR_SORT, last.date_created, last.id)
+
+    return roots, next_cursor
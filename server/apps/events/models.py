@@ -1,13 +1,18 @@
 """
 Models for the events application including Event, EventVote, EventRegistration,
 and EventComment entities, along with related enums and schemas.
+
+Each table declares indexes for the filters and sort orders the application runs
+on it. create_missing_schema() adds indexes missing from an existing database at
+startup; tests/test_event_indexes.py checks that the hot queries use them.
 """
 from datetime import datetime, timezone
 from enum import Enum
 from uuid import uuid4, UUID
 from typing import Optional
 from pydantic import BaseModel
-from sqlmodel import SQLModel, Field, Column, DateTime, UniqueConstraint
+from sqlalchemy import text
+from sqlmodel import SQLModel, Field, Column, DateTime, Index, UniqueConstraint
 
 class EventStatus(str, Enum):
     """Enum representing the possible states of an event."""
@@ -44,6 +49,17 @@ class Event(SQLModel, table=True):
     votes: int = Field(default=0)
     comments_count: int = Field(default=0)  # Add comments counter
 
+    # Listings sort by date_created or votes with id as tie-breaker, the status job
+    # and the reminders look for open or upcoming events by date, and profiles list
+    # an author's events newest first
+    __table_args__ = (
+        Index("ix_event_date_created_id", "date_created", "id"),
+        Index("ix_event_votes_id", "votes", "id"),
+        Index("ix_event_status_date_scheduled", "status", "date_scheduled"),
+        Index("ix_event_date_scheduled", "date_scheduled"),
+        Index("ix_event_author_id_date_created", "author_id", "date_created"),
+    )
+
 class EventVote(SQLModel, table=True):
     """
     Model for tracking user votes on events.
@@ -54,9 +70,11 @@ class EventVote(SQLModel, table=True):
     user_id: UUID = Field(foreign_key="user.id", nullable=False)
     date_voted: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
-    # Add a unique constraint on event_id and user_id to prevent duplicate votes
+    # Add a unique constraint on event_id and user_id to prevent duplicate votes,
+    # and an index to look up one user's votes across many events
     __table_args__ = (
         UniqueConstraint("event_id", "user_id", name="unique_event_user_vote"),
+        Index("ix_eventvote_user_id_event_id", "user_id", "event_id"),
     )
 
 class EventRegistration(SQLModel, table=True):
@@ -71,9 +89,13 @@ class EventRegistration(SQLModel, table=True):
     attendance_status: str = Field(default="registered")  # registered, attended, cancelled
     notes: Optional[str] = Field(default=None, max_length=500)
 
-    # Add a unique constraint to prevent duplicate registrations
+    # Add a unique constraint to prevent duplicate registrations, and indexes to
+    # look up one user's registrations across many events or by attendance status
     __table_args__ = (
         UniqueConstraint("event_id", "user_id", name="unique_event_user_registration"),
+        Index("ix_eventregistration_user_id_event_id", "user_id", "event_id"),
+        Index("ix_eventregistration_user_id_attendance_status", "user_id",
+              "attendance_status"),
     )
 
 class EventComment(SQLModel, table=True):
@@ -95,6 +117,23 @@ class EventComment(SQLModel, table=True):
         nullable=True
     )
 
+    # An event's visible comments are read oldest first, comment threads read an
+    # event's top-level comments and a comment's replies oldest first, and the
+    # foreign key checks of a deleted comment or user look up rows by
+    # parent_comment_id and user_id
+    __table_args__ = (
+        Index("ix_eventcomment_event_id_is_deleted_date_created", "event_id", "is_deleted",
+              "date_created"),
+        Index("ix_eventcomment_event_id_date_created_top_level", "event_id", "date_created",
+              "id", sqlite_where=text("parent_comment_id IS NULL"),
+              postgresql_where=text("parent_comment_id IS NULL")),
+        Index("ix_eventcomment_parent_comment_id_date_created", "parent_comment_id",
+              "date_created", "id",
+              sqlite_where=text("parent_comment_id IS NOT NULL"),
+              postgresql_where=text("parent_comment_id IS NOT NULL")),
+        Index("ix_eventcomment_user_id", "user_id"),
+    )
+
 class CommentUpdate(BaseModel):
     """Schema for updating the content of a comment."""
     content: str
@@ -0,0 +1,175 @@
+"""
+Keyset (cursor) pagination helpers for event listings.
+
+Pages are addressed by an opaque cursor holding the sort key and id of the last
+event on the previous page, so the database only ever reads a single page of rows
+no matter how deep into the listing the client is.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import Select, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import Event
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# Sortable columns, each paired with Event.id as a unique tie-breaker
+SORT_COLUMNS = {
+    "date_created": Event.date_created,
+    "votes": Event.votes,
+}
+
+# Search results can additionally be ordered by their full-text rank
+RELEVANCE_SORT = "relevance"
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor is malformed or belongs to another sort mode."""
+
+
+def normalize_sort(sort: Optional[str], ranked: bool = False) -> str:
+    """
+    Map a requested sort field to a supported one.
+
+    Args:
+        sort: Requested sort field
+        ranked: Whether the query carries a full-text rank column
+
+    Returns:
+        str: A key of SORT_COLUMNS, or RELEVANCE_SORT for ranked queries that ask
+        for relevance or do not specify a sort
+    """
+    if sort in SORT_COLUMNS:
+        return sort
+    if ranked and sort in (None, RELEVANCE_SORT):
+        return RELEVANCE_SORT
+    return "date_created"
+
+
+def encode_cursor(sort: str, value, event_id: UUID) -> str:
+    """
+    Build the cursor pointing just after the given event.
+
+    Args:
+        sort: Sort field the page was ordered by
+        value: Sort key of the last event of the current page
+        event_id: Id of the last event of the current page
+
+    Returns:
+        str: URL-safe opaque cursor
+    """
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps({"sort": sort, "value": value, "id": str(event_id)})
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> Tuple[object, UUID]:
+    """
+    Parse a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor received from the client
+        sort: Sort field of the current request
+
+    Returns:
+        tuple: (sort key value, event id) of the last event already returned
+
+    Raises:
+        InvalidCursorError: If the cursor cannot be decoded or was issued for another sort
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        cursor_sort = payload["sort"]
+        value = payload["value"]
+        last_id = UUID(payload["id"])
+        if sort == "date_created":
+            value = datetime.fromisoformat(value)
+        elif sort == RELEVANCE_SORT:
+            value = float(value)
+        else:
+            value = int(value)
+    except (binascii.Error, UnicodeError, ValueError, KeyError, TypeError) as exc:
+        raise InvalidCursorError("Invalid pagination cursor") from exc
+
+    if cursor_sort != sort:
+        raise InvalidCursorError("Cursor does not match the requested sort")
+    return value, last_id
+
+
+async def paginate_events(
+    db: AsyncSession,
+    query: Select,
+    sort: Optional[str],
+    order: Optional[str],
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    rank_column=None,
+) -> Tuple[List[Event], Optional[str]]:
+    """
+    Apply keyset ordering and filtering to an Event query and fetch a single page.
+
+    Args:
+        db: Database session
+        query: Filtered select(Event) statement without ordering
+        sort: Sort field (date_created, votes or relevance)
+        order: Sort order (asc or desc), ignored for relevance which is best first
+        cursor: Cursor of the previous page, if any
+        limit: Requested page size, clamped to MAX_PAGE_SIZE
+        rank_column: Full-text rank of each row (lower is better) for search queries
+
+    Returns:
+        tuple: (events on this page, cursor for the next page or None)
+
+    Raises:
+        InvalidCursorError: If the cursor is invalid
+    """
+    sort = normalize_sort(sort, ranked=rank_column is not None)
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    if sort == RELEVANCE_SORT:
+        column = rank_column
+        descending = False
+        query = query.add_columns(rank_column)
+    else:
+        column = SORT_COLUMNS[sort]
+        descending = order == "desc"
+
+    if cursor:
+        value, last_id = decode_cursor(cursor, sort)
+        if descending:
+            query = query.filter(or_(
+                column < value,
+                and_(column == value, Event.id < last_id)
+            ))
+        else:
+            query = query.filter(or_(
+                column > value,
+                and_(column == value, Event.id > last_id)
+            ))
+
+    if descending:
+        query = query.order_by(column.desc(), Event.id.desc())
+    else:
+        query = query.order_by(column.asc(), Event.id.asc())
+
+    # Read one extra row to find out whether another page exists
+    rows = (await db.execute(query.limit(limit + 1))).all()
+    events = [row[0] for row in rows]
+    if sort == RELEVANCE_SORT:
+        keys = [row[1] for row in rows]
+    else:
+        keys = [getattr(event, sort) for event in events]
+
+    next_cursor = None
+    if len(events) > limit:
+        events = events[:limit]
+        next_cursor = encode_cursor(sort, keys[limit - 1], events[-1].id)
+    return events, next_cursor
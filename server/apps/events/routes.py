@@ -4,35 +4,49 @@ This module provides a complete event management system for a community platform
 It handles event creation, viewing, registration, voting, commenting, and scheduled status updates.
 """
 
+import atexit
 import os
 import shutil
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Optional
 from uuid import UUID
 
 from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.interval import IntervalTrigger
-from fastapi import (APIRouter, BackgroundTasks, Depends, FastAPI, File, Form,
-                    HTTPException, Request, UploadFile)
+from apscheduler.triggers.date import DateTrigger
+from fastapi import (APIRouter, Depends, FastAPI, File, Form,
+                    HTTPException, Query, Request, UploadFile)
 from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.templating import Jinja2Templates
-from sqlalchemy import or_, desc, asc
+from sqlalchemy import asc, case, delete, false, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
-from server.apps.authentication.email.send_email import send_email
+from server.apps.authentication.email.outbox import email_outbox, enqueue_email
 from server.apps.authentication.models import User
+from server.apps.authentication.schemas import UserResponse
 from server.apps.events.models import EventCategory
-from server.core.database import get_db
+from server.core.database import get_async_db, get_db
+from server.core.page_cache import page_cache
 from server.core.security import OAuth2PasswordBearer, get_current_user
+from .comment_threads import (DEFAULT_REPLIES_PER_COMMENT, DEFAULT_THREAD_DEPTH,
+                              DEFAULT_THREAD_PAGE_SIZE, MAX_REPLIES_PER_COMMENT,
+                              MAX_THREAD_DEPTH, MAX_THREAD_PAGE_SIZE, load_comment_threads)
+from .vote_buffer import vote_buffer
+from .search import build_match_query, is_search_index_ready, search_events_subquery
+from .pagination import (DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursorError,
+                         paginate_events)
 from .models import (CommentUpdate, Event, EventComment, EventRegistration,
                     EventVote)
 from .schemas import (EventCommentCreate, EventCommentListResponse,
-                     EventCommentResponse, EventRegistrationListResponse,
-                     EventRegistrationResponse, EventResponse, EventStatus,
-                     EventVoteResponse)
+                     EventCommentResponse, EventCommentThreadListResponse,
+                     EventRegistrationListResponse,
+                     EventRegistrationResponse, EventRegistrationStatusResponse,
+                     EventResponse, EventStatus, EventUserState,
+                     EventUserStateListResponse, EventUserStateRequest,
+                     EventViewResponse, EventVoteResponse)
 router = APIRouter()
 
 # Set up Jinja2 templates
@@ -43,104 +57,204 @@ UPLOAD_DIR = Path("static/uploads/events")
 # Ensure the upload directory exists
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
-def update_event_statuses(db: Session):
+# Most events whose state can be requested at once
+MAX_STATE_EVENTS = MAX_PAGE_SIZE
+
+# Longest time the status job sleeps even when no event is due, so events created
+# by other processes are still picked up
+STATUS_UPDATE_MAX_DELAY = timedelta(hours=1)
+# Delay before retrying after a failed run (e.g. the database is not ready yet)
+STATUS_UPDATE_RETRY_DELAY = timedelta(minutes=1)
+STATUS_UPDATE_JOB_ID = "update_event_statuses"
+
+def update_event_statuses(db: Session, now: Optional[datetime] = None):
     """
     Automatically updates event statuses based on scheduled dates, marking past events as 'closed'.
+    The transition is done with a single set-based UPDATE instead of loading the events.
     Args:
         db (Session): Database session for database operations
+        now (Optional[datetime]): Current time (UTC); defaults to the clock
         
     Returns:
         int: Number of events that were updated to 'closed' status
     """
-    now = datetime.now(timezone.utc)
+    now = now or datetime.now(timezone.utc)
 
-    # Find all events with status 'open' and a scheduled date in the past
-    events_to_update = (
-        db.query(Event)
-        .filter(
+    # Close all events with status 'open' and a scheduled date in the past
+    statement = (
+        update(Event)
+        .where(
             Event.status == EventStatus.OPEN.value,
             Event.date_scheduled < now
         )
-        .all()
+        .values(status=EventStatus.CLOSED.value)
+        .execution_options(synchronize_session=False)
     )
 
-    # Update the status of these events to 'closed'
-    for event in events_to_update:
-        event.status = EventStatus.CLOSED.value
+    updated = db.execute(statement).rowcount
 
-    # Commit the changes to the database
-    if events_to_update:
-        db.commit()
-        print(f"Updated {len(events_to_update)} events to 'closed' status")
+    db.commit()
+    if updated:
+        print(f"Updated {updated} events to 'closed' status")
 
-    return len(events_to_update)
+    return updated
 
-# Create a background task to run the status update function periodically
-def schedule_status_updates(app: FastAPI):
+def get_next_status_update_time(db: Session,
+                                now: Optional[datetime] = None) -> Optional[datetime]:
     """
-    Sets up a background scheduler to periodically run the event status update function.
+    Finds when the next open event starts, i.e. when its status will need updating.
+    Pass the same now as to update_event_statuses, so an event scheduled between
+    the two calls is not missed by both.
     Args:
-        app (FastAPI): The FastAPI application instance
+        db (Session): Database session
+        now (Optional[datetime]): Current time (UTC); defaults to the clock
+        
+    Returns:
+        Optional[datetime]: Earliest upcoming scheduled date (UTC), or None if there is none
+    """
+    now = now or datetime.now(timezone.utc)
+    next_due = db.query(func.min(Event.date_scheduled)).filter(
+        Event.status == EventStatus.OPEN.value,
+        Event.date_scheduled >= now
+    ).scalar()
+
+    if next_due is not None and next_due.tzinfo is None:
+        # SQLite returns naive datetimes; scheduled dates are stored in UTC
+        next_due = next_due.replace(tzinfo=timezone.utc)
+    return next_due
+
+def schedule_next_status_update(scheduler: BackgroundScheduler, run_date: datetime):
+    """
+    (Re)schedules the status update job to run once at the given time.
+    Args:
+        scheduler (BackgroundScheduler): Scheduler owning the job
+        run_date (datetime): When the job should run next
         
     Returns:
         None
     """
-    scheduler = BackgroundScheduler()
-
-    def task():
-        # Correctly get a database session without using a context manager
-        db = next(get_db())
-        try:
-            update_event_statuses(db)
-        finally:
-            db.close()  # Make sure to close the session when done
-
-    # Run the task every 30 seconds (for testing, you can change it to hours in production)
     scheduler.add_job(
-        task,
-        IntervalTrigger(hours=1),  # Changed from hours=1 to seconds=30 for testing
-        id="update_event_statuses",
+        run_status_update_job,
+        DateTrigger(run_date=run_date),
+        args=[scheduler],
+        id=STATUS_UPDATE_JOB_ID,
         name="Update event statuses",
         replace_existing=True,
+        misfire_grace_time=None,
     )
 
+def notify_event_scheduled(scheduler: Optional[BackgroundScheduler],
+                           date_scheduled: Optional[datetime]):
+    """
+    Brings the status update job forward if a new event starts before its next run.
+    Args:
+        scheduler (Optional[BackgroundScheduler]): Scheduler owning the job, if running
+        date_scheduled (Optional[datetime]): Scheduled date of the new event
+        
+    Returns:
+        None
+    """
+    if scheduler is None or date_scheduled is None:
+        return
+
+    if date_scheduled.tzinfo is None:
+        date_scheduled = date_scheduled.replace(tzinfo=timezone.utc)
+
+    job = scheduler.get_job(STATUS_UPDATE_JOB_ID)
+    if job is None or job.next_run_time is None or date_scheduled < job.next_run_time:
+        schedule_next_status_update(scheduler, date_scheduled)
+
+def run_status_update_job(scheduler: BackgroundScheduler):
+    """
+    Closes past-due events, then schedules the next run for the earliest upcoming event.
+    Args:
+        scheduler (BackgroundScheduler): Scheduler owning the job
+        
+    Returns:
+        None
+    """
+    now = datetime.now(timezone.utc)
+    run_date = now + STATUS_UPDATE_RETRY_DELAY
+
+    db = next(get_db())
+    try:
+        update_event_statuses(db, now)
+        next_due = get_next_status_update_time(db, now)
+        run_date = now + STATUS_UPDATE_MAX_DELAY
+        if next_due is not None:
+            run_date = min(next_due, run_date)
+    except Exception as e:  # pylint: disable=broad-except
+        print(f"Error updating event statuses: {e}")
+    finally:
+        db.close()  # Make sure to close the session when done
+        schedule_next_status_update(scheduler, run_date)
+
+# Create a background task to run the status update function when events become due
+def schedule_status_updates(app: FastAPI):
+    """
+    Sets up a background scheduler that closes events as soon as they start.
+    Args:
+        app (FastAPI): The FastAPI application instance
+        
+    Returns:
+        None
+    """
+    scheduler = BackgroundScheduler()
+
+    # Run once right away; each run schedules the next one
+    schedule_next_status_update(scheduler, datetime.now(timezone.utc))
+
     # Start the scheduler
     scheduler.start()
 
     # Add the scheduler to the app state to keep a reference
     app.state.scheduler = scheduler
 
+async def get_events_page(db: AsyncSession, query, sort: Optional[str], order: Optional[str],
+                          cursor: Optional[str], limit: int, rank_column=None):
+    """
+    Fetches one keyset-paginated page of events, turning bad cursors into HTTP errors.
+    Args:
+        db (AsyncSession): Database session
+        query: Filtered select(Event) statement without ordering
+        sort (Optional[str]): Field to sort by (date_created, votes, relevance)
+        order (Optional[str]): Sort order (asc, desc)
+        cursor (Optional[str]): Cursor returned with the previous page
+        limit (int): Number of events per page
+        rank_column: Full-text rank column when the query is a search
+        
+    Returns:
+        tuple: (events on this page, cursor for the next page or None)
+    """
+    try:
+        return await paginate_events(db, query, sort, order, cursor, limit, rank_column)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
 @router.get("/", response_class=HTMLResponse)
-def events_page(
+async def events_page(
     request: Request,
-    start: Optional[int] = None,
-    end: Optional[int] = None,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
     ):
     """
-    Renders the main events listing page, supporting pagination with start/end parameters.
+    Renders the main events listing page, one cursor-paginated page at a time.
     Args:
         request (Request): The FastAPI request object
-        start (Optional[int]): Starting index for pagination
-        end (Optional[int]): Ending index for pagination
-        db (Session): Database session
+        cursor (Optional[str]): Cursor returned with the previous page
+        limit (int): Number of events per page
+        db (AsyncSession): Database session
         
     Returns:
         HTMLResponse: Rendered HTML template with event data
     """
-    # Query the database for all events, sorted by date_created
-    db_events = db.query(Event).order_by(desc(Event.date_created)).all()
-
-    # Apply slicing if start and end are valid
-    try:
-        if start is not None or end is not None:
-            db_events = db_events[start:end]
-    except (TypeError, ValueError):
-        # If slicing fails due to invalid start/end, return all events
-        pass
+    # Query a single page of events, newest first
+    db_events, next_cursor = await get_events_page(db, select(Event), "date_created", "desc",
+                                                   cursor, limit)
 
     # Convert database events to EventResponse objects which include author_username
-    events = [EventResponse.from_orm(event, db) for event in db_events]
+    events = await EventResponse.from_orm_many(db_events, db)
 
     # Render the template with the list of events
     return templates.TemplateResponse(
@@ -148,47 +262,63 @@ def events_page(
         {
             "request": request,
             "events": events,  # Now contains processed events with author_username
+            "next_cursor": next_cursor,
         },
     )
 
 @router.get("/api", response_class=JSONResponse)
-def get_events(
+async def get_events(
     sort: Optional[str] = None,
     order: Optional[str] = "desc",
     status: Optional[str] = None,
     category: Optional[str] = None,
     search: Optional[str] = None,  # Search parameter for title description location or author name
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
     ):
     """
     API endpoint that retrieves events with flexible filtering and sorting options.
+    Searches are served from the full-text index and default to relevance order.
     Args:
-        sort (Optional[str]): Field to sort by (date_created, votes)
+        sort (Optional[str]): Field to sort by (date_created, votes, relevance)
         order (Optional[str]): Sort order (asc, desc)
         status (Optional[str]): Filter by event status
         category (Optional[str]): Filter by event category
         search (Optional[str]): Search term for title, description, location, or author name
-        db (Session): Database session
+        cursor (Optional[str]): Cursor returned with the previous page
+        limit (int): Number of events per page
+        db (AsyncSession): Database session
         
     Returns:
-        dict: JSON response with filtered and sorted events
+        dict: JSON response with one page of filtered and sorted events and the next cursor
     """
     # Start with base query
-    query = db.query(Event)
+    query = select(Event)
 
     # Apply filters
     if status:
-        query = query.filter(Event.status == status)
+        query = query.where(Event.status == status)
 
     # Apply category filter if provided
     if category:
-        query = query.filter(Event.category == category)
+        query = query.where(Event.category == category)
 
     # Apply search filter if provided
-    if search:
+    rank_column = None
+    if search and is_search_index_ready():
+        match = build_match_query(search)
+        if match:
+            matches = search_events_subquery(match)
+            query = query.join(matches, matches.c.event_id == Event.id)
+            rank_column = matches.c.rank
+        else:
+            # Nothing searchable in the input (e.g. only punctuation)
+            query = query.where(false())
+    elif search:
         search_term = f"%{search}%"
         # Join with User table for author name search
-        query = query.join(User, Event.author_id == User.id).filter(
+        query = query.join(User, Event.author_id == User.id).where(
             or_(
                 Event.title.ilike(search_term), # pylint: disable=no-member
                 Event.description.ilike(search_term), # pylint: disable=no-member
@@ -200,48 +330,33 @@ def get_events(
             )
         )
 
-    # Apply sorting
-    if sort == "date_created" or sort is None:
-        if order == "desc":
-            query = query.order_by(desc(Event.date_created))
-        else:
-            query = query.order_by(Event.date_created)
-    elif sort == "votes":
-        if order == "desc":
-            query = query.order_by(desc(Event.votes))
-        else:
-            query = query.order_by(Event.votes)
-
-    # Execute query
-    db_events = query.all()
+    # Apply sorting and fetch a single page
+    db_events, next_cursor = await get_events_page(db, query, sort, order, cursor, limit,
+                                                   rank_column)
 
     # Convert to response models
-    events = [EventResponse.from_orm(event, db) for event in db_events]
+    events = await EventResponse.from_orm_many(db_events, db)
 
-    return {"events": [event.dict() for event in events]}
+    return {"events": [event.dict() for event in events], "next_cursor": next_cursor}
 
 @router.get("/create_event", response_class=HTMLResponse)
-def create_event_page():
+def create_event_page(request: Request):
     """
     Returns the HTML page for event creation.
     Args:
-        None
+        request: FastAPI request object
         
     Returns:
         HTMLResponse: HTML content for the event creation page
     """
-    # Path to the registration HTML file
-    html_file_path = Path(__file__).parent.parent.parent.parent / "src/pages/create-event-page.html"
-
-    # Read the HTML file content
-    if html_file_path.exists():
-        html_content = html_file_path.read_text(encoding="utf-8")
-        return HTMLResponse(content=html_content)
-    else:
-        return HTMLResponse(content="<h1>Create event page not found</h1>", status_code=404)
+    # Serve the event creation page from the in-memory page cache
+    return page_cache.response(
+        request, "create-event-page.html", "<h1>Create event page not found</h1>"
+    )
 
 @router.post("/create_event", response_model=EventResponse)
 async def create_event(
+    request: Request,
     title: str = Form(...),
     description: str = Form(...),
     date_scheduled: str = Form(...),
@@ -251,11 +366,12 @@ async def create_event(
     image_file: Optional[UploadFile] = File(None),
     image_caption: Optional[str] = Form(None),
     token: str = Depends(OAuth2PasswordBearer(tokenUrl="auth/login")),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
     ):
     """
     Creates a new event with optional image upload, validating user permissions.
     Args:
+        request (Request): The FastAPI request object
         title (str): Event title
         description (str): Event description
         date_scheduled (str): ISO formatted date for the event
@@ -265,13 +381,13 @@ async def create_event(
         image_file (Optional[UploadFile]): Optional image file to upload
         image_caption (Optional[str]): Optional caption for the image
         token (str): Authentication token
-        db (Session): Database session
+        db (AsyncSession): Database session
         
     Returns:
         EventResponse: Created event details
     """
     # Validate the token and get the current user
-    user = get_current_user(token, db)
+    user = await get_current_user(token, db)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
 
@@ -325,8 +441,12 @@ async def create_event(
 
         # Add the new event to the database session
         db.add(new_event)
-        db.commit()
-        db.refresh(new_event)
+        await db.commit()
+        await db.refresh(new_event)
+
+        # Make sure the event gets closed as soon as it starts
+        notify_event_scheduled(getattr(request.app.state, "scheduler", None),
+                               new_event.date_scheduled)
 
         # Ensure date_created is accessed as a datetime object
         if not isinstance(new_event.date_created, str):
@@ -353,13 +473,14 @@ async def create_event(
         raise HTTPException(status_code=500, detail=f"Error creating event: {str(e)}") from e
 
 @router.get("/view_event/{event_id}", response_class=HTMLResponse)
-def view_event_page(event_id: str, request: Request, db: Session = Depends(get_db)):
+async def view_event_page(event_id: str, request: Request,
+                          db: AsyncSession = Depends(get_async_db)):
     """
     Renders the detailed view for a specific event, including comment and vote counts.
     Args:
         event_id (str): UUID of the event to view
         request (Request): The FastAPI request object
-        db (Session): Database session
+        db (AsyncSession): Database session
         
     Returns:
         HTMLResponse: Rendered HTML template with event details
@@ -371,18 +492,24 @@ def view_event_page(event_id: str, request: Request, db: Session = Depends(get_d
         raise HTTPException(status_code=400, detail="Invalid event ID format") from e
 
     # Query the database for the event
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = await db.get(Event, event_id)
     if event is None:
         raise HTTPException(status_code=404, detail="Event not found")
 
     # Convert the event to the EventResponse model
-    event_data = EventResponse.from_orm(event, db)
+    event_data = await EventResponse.from_orm(event, db)
 
     # Get comment count
-    comment_count = db.query(EventComment).filter(EventComment.event_id == event_id).count()
+    comment_count = await db.scalar(
+        select(func.count())  # pylint: disable=not-callable
+        .where(EventComment.event_id == event_id)
+    )
 
     # Get vote count
-    vote_count = db.query(EventVote).filter(EventVote.event_id == event_id).count()
+    vote_count = await db.scalar(
+        select(func.count())  # pylint: disable=not-callable
+        .where(EventVote.event_id == event_id)
+    )
 
     # Add these counts to the event data
     event_dict = event_data.dict()
@@ -411,54 +538,55 @@ def get_event_categories():
     return [category.value for category in EventCategory]
 
 @router.get("/user_events/{user_id}", response_class=HTMLResponse)
-def your_events_page(
+async def your_events_page(
     request: Request,
     user_id: str,
-    start: Optional[int] = None,
-    end: Optional[int] = None,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db)
     ):
     """
-    Displays events created by a specific user, with pagination support.
+    Displays events created by a specific user, one cursor-paginated page at a time.
     Args:
         request (Request): The FastAPI request object
         user_id (str): UUID of the user whose events to display
-        start (Optional[int]): Starting index for pagination
-        end (Optional[int]): Ending index for pagination
-        db (Session): Database session
+        cursor (Optional[str]): Cursor returned with the previous page
+        limit (int): Number of events per page
+        db (AsyncSession): Database session
         
     Returns:
         HTMLResponse: Rendered HTML template with user's events
     """
-    db_events = db.query(Event).filter(Event.author_id == \
-                                        UUID(user_id)).order_by(desc(Event.date_created)).all()
+    try:
+        user_uuid = UUID(user_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail="Invalid user ID format") from e
 
-    if start is not None or end is not None:
-        try:
-            db_events = db_events[start:end]
-        except (TypeError, ValueError):
-            # Log the error and return all events if slicing fails
-            print("Invalid slicing parameters, returning all events")
+    query = select(Event).where(Event.author_id == user_uuid)
+    db_events, next_cursor = await get_events_page(db, query, "date_created", "desc", cursor, limit)
 
     # Convert database events to EventResponse objects which include author_username
-    events = [EventResponse.from_orm(event, db) for event in db_events]
+    events = await EventResponse.from_orm_many(db_events, db)
     return templates.TemplateResponse(
         "user-events-page.html",
         {
             "request": request,
             "events": events,
+            "next_cursor": next_cursor,
         },
     )
 
 @router.get("/user_events_api/{user_id}", response_class=JSONResponse)
-def get_user_events(
+async def get_user_events(
     user_id: str,
     sort: Optional[str] = None,
     order: Optional[str] = "desc",
     status: Optional[str] = None,
     category: Optional[str] = None,
     search: Optional[str] = None,  # Add search parameter
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
     ):
     """
     API endpoint for retrieving events created by a specific user with filtering options.
@@ -469,32 +597,44 @@ def get_user_events(
         status (Optional[str]): Filter by event status
         category (Optional[str]): Filter by event category
         search (Optional[str]): Search term for filtering
-        db (Session): Database session
+        cursor (Optional[str]): Cursor returned with the previous page
+        limit (int): Number of events per page
+        db (AsyncSession): Database session
         
     Returns:
-        dict: JSON response with filtered user events
+        dict: JSON response with one page of filtered user events and the next cursor
     """
     # Parse the user_id
     try:
         user_uuid = UUID(user_id)
     except ValueError:
-        return {"events": []}
+        return {"events": [], "next_cursor": None}
 
     # Start with base query filtered by user_id
-    query = db.query(Event).filter(Event.author_id == user_uuid)
+    query = select(Event).where(Event.author_id == user_uuid)
 
     # Apply additional filters
     if status:
-        query = query.filter(Event.status == status)
+        query = query.where(Event.status == status)
 
     # Apply category filter if provided
     if category:
-        query = query.filter(Event.category == category)
+        query = query.where(Event.category == category)
 
     # Apply search filter if provided
-    if search:
+    rank_column = None
+    if search and is_search_index_ready():
+        match = build_match_query(search, columns=("title", "description", "location"))
+        if match:
+            matches = search_events_subquery(match)
+            query = query.join(matches, matches.c.event_id == Event.id)
+            rank_column = matches.c.rank
+        else:
+            # Nothing searchable in the input (e.g. only punctuation)
+            query = query.where(false())
+    elif search:
         search_term = f"%{search}%"
-        query = query.filter(
+        query = query.where(
             or_(
                 Event.title.ilike(search_term), # pylint: disable=no-member
                 Event.description.ilike(search_term), # pylint: disable=no-member
@@ -502,25 +642,14 @@ def get_user_events(
             )
         )
 
-    # Apply sorting
-    if sort == "date_created" or sort is None:
-        if order == "desc":
-            query = query.order_by(desc(Event.date_created))
-        else:
-            query = query.order_by(Event.date_created)
-    elif sort == "votes":
-        if order == "desc":
-            query = query.order_by(desc(Event.votes))
-        else:
-            query = query.order_by(Event.votes)
-
-    # Execute query
-    db_events = query.all()
+    # Apply sorting and fetch a single page
+    db_events, next_cursor = await get_events_page(db, query, sort, order, cursor, limit,
+                                                   rank_column)
 
     # Convert to response models
-    events = [EventResponse.from_orm(event, db) for event in db_events]
+    events = await EventResponse.from_orm_many(db_events, db)
 
-    return {"events": [event.dict() for event in events]}
+    return {"events": [event.dict() for event in events], "next_cursor": next_cursor}
 
 def configure_app_with_schedulers(app: FastAPI):
     """
@@ -534,28 +663,153 @@ def configure_app_with_schedulers(app: FastAPI):
     # Start the event status update scheduler
     schedule_status_updates(app)
 
+    # Start delivering queued emails in the background
+    email_outbox.start()
+    atexit.register(email_outbox.stop)
+
+    # Start flushing buffered votes in the background if buffering is enabled
+    if vote_buffer is not None:
+        vote_buffer.start()
+        atexit.register(vote_buffer.stop)
+
     # Return the configured app
     return app
 
-# Add this to existing router in routes.py file
+async def get_event_votes(db: AsyncSession, event_uuid: UUID) -> int:
+    """
+    Reads the current vote count of an event.
+    Args:
+        db (AsyncSession): Database session
+        event_uuid (UUID): UUID of the event
+        
+    Returns:
+        int: Current vote count
+
+    Raises:
+        HTTPException: If the event does not exist
+    """
+    votes = await db.scalar(select(Event.votes).where(Event.id == event_uuid))
+    if votes is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    return votes
+
+async def apply_vote_delta(db: AsyncSession, event_uuid: UUID, delta: int) -> Optional[int]:
+    """
+    Atomically adds delta to an event's vote counter with a database-side UPDATE,
+    never letting it drop below zero. Does not commit.
+    Args:
+        db (AsyncSession): Database session
+        event_uuid (UUID): UUID of the event
+        delta (int): Amount to add to the vote count
+        
+    Returns:
+        Optional[int]: The new vote count, or None if the event does not exist
+    """
+    result = await db.execute(
+        update(Event)
+        .where(Event.id == event_uuid)
+        .values(votes=case((Event.votes + delta < 0, 0), else_=Event.votes + delta))
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        return None
+    # The row is write-locked by the UPDATE, so this read sees our own change
+    return await db.scalar(select(Event.votes).where(Event.id == event_uuid))
+
+async def has_stored_vote(db: AsyncSession, event_uuid: UUID, user_id: UUID) -> bool:
+    """
+    Checks whether a user's vote for an event is stored in the database.
+    Args:
+        db (AsyncSession): Database session
+        event_uuid (UUID): UUID of the event
+        user_id (UUID): UUID of the user
+        
+    Returns:
+        bool: True if the vote exists
+    """
+    return await db.scalar(select(EventVote.id).where(
+        EventVote.event_id == event_uuid,
+        EventVote.user_id == user_id
+    ).limit(1)) is not None
+
+async def get_vote_status(db: AsyncSession, event_id: str, event_uuid: UUID,
+                          stored_votes: int, user_id: Optional[UUID]) -> EventVoteResponse:
+    """
+    Builds an event's vote count and a user's vote status, including buffered votes.
+    Args:
+        db (AsyncSession): Database session
+        event_id (str): Event ID as received in the request
+        event_uuid (UUID): UUID of the event
+        stored_votes (int): Vote count stored on the event
+        user_id (Optional[UUID]): UUID of the user, or None for an anonymous viewer
+        
+    Returns:
+        EventVoteResponse: Vote count and the user's vote status
+    """
+    # Votes still waiting in the write-behind buffer take precedence
+    has_voted = None
+    vote_count = stored_votes
+    if vote_buffer is not None:
+        if user_id is not None:
+            has_voted = vote_buffer.pending_state(event_uuid, user_id)
+        vote_count = max(vote_count + vote_buffer.pending_delta(event_uuid), 0)
+
+    # Check if the user has already voted for this event
+    if has_voted is None:
+        has_voted = user_id is not None and await has_stored_vote(db, event_uuid, user_id)
+
+    return EventVoteResponse(
+        event_id=event_id,
+        vote_count=vote_count,
+        has_voted=has_voted
+    )
+
+async def submit_buffered_vote(db: AsyncSession, event_id: str, event_uuid: UUID,
+                               user_id: UUID, has_voted: bool) -> EventVoteResponse:
+    """
+    Records a vote or unvote in the write-behind buffer instead of writing it directly.
+    Args:
+        db (AsyncSession): Database session
+        event_id (str): Event ID as received in the request
+        event_uuid (UUID): UUID of the event
+        user_id (UUID): UUID of the voting user
+        has_voted (bool): True for a vote, False for an unvote
+        
+    Returns:
+        EventVoteResponse: Vote count and status including buffered votes
+    """
+    vote_count = await get_event_votes(db, event_uuid)
+
+    # Only ask the database when nothing is buffered for this user and event yet
+    stored = vote_buffer.pending_state(event_uuid, user_id)
+    if stored is None:
+        stored = await has_stored_vote(db, event_uuid, user_id)
+    vote_buffer.submit(event_uuid, user_id, has_voted, stored)
+
+    return EventVoteResponse(
+        event_id=event_id,
+        vote_count=max(vote_count + vote_buffer.pending_delta(event_uuid), 0),
+        has_voted=has_voted
+    )
+
 @router.post("/vote/{event_id}", response_model=EventVoteResponse)
 async def vote_for_event(
     event_id: str,
     token: str = Depends(OAuth2PasswordBearer(tokenUrl="auth/login")),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
     ):
     """
     Allows a user to vote for an event, with checks to prevent duplicate votes.
     Args:
         event_id (str): UUID of the event to vote for
         token (str): Authentication token
-        db (Session): Database session
+        db (AsyncSession): Database session
         
     Returns:
         EventVoteResponse: Updated vote count and status
     """
     # Validate the token and get the current user
-    user = get_current_user(token, db)
+    user = await get_current_user(token, db)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
 
@@ -565,41 +819,33 @@ async def vote_for_event(
     except ValueError as e:
         raise HTTPException(status_code=400, detail="Invalid event ID") from e
 
-    # Check if the event exists
-    event = db.query(Event).filter(Event.id == event_uuid).first()
-    if not event:
-        raise HTTPException(status_code=404, detail="Event not found")
+    if vote_buffer is not None:
+        return await submit_buffered_vote(db, event_id, event_uuid, user.id, True)
 
-    # Check if the user has already voted for this event
-    existing_vote = db.query(EventVote).filter(
-        EventVote.event_id == event_uuid,
-        EventVote.user_id == user.id
-    ).first()
-
-    if existing_vote:
+    # Record the vote; the unique (event_id, user_id) constraint rejects duplicates
+    try:
+        db.add(EventVote(event_id=event_uuid, user_id=user.id))
+        await db.flush()
+    except IntegrityError:
         # User has already voted
+        await db.rollback()
         return EventVoteResponse(
             event_id=event_id,
-            vote_count=event.votes,
+            vote_count=await get_event_votes(db, event_uuid),
             has_voted=True
         )
 
-    # Create a new vote record
-    new_vote = EventVote(
-        event_id=event_uuid,
-        user_id=user.id
-    )
+    # Increment the event's vote count in the database, in the same transaction
+    vote_count = await apply_vote_delta(db, event_uuid, 1)
+    if vote_count is None:
+        await db.rollback()
+        raise HTTPException(status_code=404, detail="Event not found")
 
-    # Increment the event's vote count
-    event.votes += 1
-
-    # Add the new vote to the database and commit changes
-    db.add(new_vote)
-    db.commit()
+    await db.commit()
 
     return EventVoteResponse(
         event_id=event_id,
-        vote_count=event.votes,
+        vote_count=vote_count,
         has_voted=True
     )
 
@@ -607,20 +853,20 @@ async def vote_for_event(
 async def check_vote_status(
     event_id: str,
     token: str = Depends(OAuth2PasswordBearer(tokenUrl="auth/login")),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
     ):
     """
     Checks if the current user has already voted for a specific event.
     Args:
         event_id (str): UUID of the event to check
         token (str): Authentication token
-        db (Session): Database session
+        db (AsyncSession): Database session
         
     Returns:
         EventVoteResponse: Vote count and user's vote status
     """
     # Validate the token and get the current user
-    user = get_current_user(token, db)
+    user = await get_current_user(token, db)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
 
@@ -630,41 +876,28 @@ async def check_vote_status(
     except ValueError as e:
         raise HTTPException(status_code=400, detail="Invalid event ID") from e
 
-    # Check if the event exists
-    event = db.query(Event).filter(Event.id == event_uuid).first()
-    if not event:
-        raise HTTPException(status_code=404, detail="Event not found")
-
-    # Check if the user has already voted for this event
-    existing_vote = db.query(EventVote).filter(
-        EventVote.event_id == event_uuid,
-        EventVote.user_id == user.id
-    ).first()
-
-    return EventVoteResponse(
-        event_id=event_id,
-        vote_count=event.votes,
-        has_voted=existing_vote is not None
-    )
+    # Read the stored vote count, which also checks that the event exists
+    stored_votes = await get_event_votes(db, event_uuid)
+    return await get_vote_status(db, event_id, event_uuid, stored_votes, user.id)
 
 @router.delete("/vote/{event_id}", response_model=EventVoteResponse)
 async def remove_vote_from_event(
     event_id: str,
     token: str = Depends(OAuth2PasswordBearer(tokenUrl="auth/login")),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
     ):
     """
     Removes a user's vote from an event.
     Args:
         event_id (str): UUID of the event to remove vote from
         token (str): Authentication token
-        db (Session): Database session
+        db (AsyncSession): Database session
         
     Returns:
         EventVoteResponse: Updated vote count and status
     """
     # Validate the token and get the current user
-    user = get_current_user(token, db)
+    user = await get_current_user(token, db)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
 
@@ -674,63 +907,58 @@ async def remove_vote_from_event(
     except ValueError as e:
         raise HTTPException(status_code=400, detail="Invalid event ID") from e
 
-    # Check if the event exists
-    event = db.query(Event).filter(Event.id == event_uuid).first()
-    if not event:
-        raise HTTPException(status_code=404, detail="Event not found")
+    if vote_buffer is not None:
+        return await submit_buffered_vote(db, event_id, event_uuid, user.id, False)
 
-    # Check if the user has already voted for this event
-    existing_vote = db.query(EventVote).filter(
+    # Delete the vote record, if any
+    deleted = (await db.execute(delete(EventVote).where(
         EventVote.event_id == event_uuid,
         EventVote.user_id == user.id
-    ).first()
+    ).execution_options(synchronize_session=False))).rowcount
 
-    if not existing_vote:
+    if not deleted:
         # User hasn't voted, nothing to remove
+        await db.rollback()
         return EventVoteResponse(
             event_id=event_id,
-            vote_count=event.votes,
+            vote_count=await get_event_votes(db, event_uuid),
             has_voted=False
         )
 
-    # Delete the vote record
-    db.delete(existing_vote)
-
-    # Decrement the event's vote count
-    if event.votes > 0:
-        event.votes -= 1
+    # Decrement the event's vote count in the database, in the same transaction
+    vote_count = await apply_vote_delta(db, event_uuid, -1)
+    if vote_count is None:
+        await db.rollback()
+        raise HTTPException(status_code=404, detail="Event not found")
 
-    # Commit changes
-    db.commit()
+    await db.commit()
 
     return EventVoteResponse(
         event_id=event_id,
-        vote_count=event.votes,
+        vote_count=vote_count,
         has_voted=False
     )
 
 @router.post("/register/{event_id}", response_model=EventRegistrationResponse)
 async def register_for_event(
     event_id: str,
-    background_tasks: BackgroundTasks,
     notes: Optional[str] = None,
     token: str = Depends(OAuth2PasswordBearer(tokenUrl="auth/login")),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
     ):
     """
-    Registers a user for an event and sends a confirmation email.
+    Registers a user for an event and queues a confirmation email.
     Args:
         event_id (str): UUID of the event to register for
-        background_tasks (BackgroundTasks): FastAPI background tasks object
         notes (Optional[str]): Optional registration notes
         token (str): Authentication token
-        db (Session): Database session
+        db (AsyncSession): Database session
         
     Returns:
         EventRegistrationResponse: Registration details
     """
     # Validate the token and get the current user
-    user = get_current_user(token, db)
+    user = await get_current_user(token, db)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
 
@@ -741,7 +969,7 @@ async def register_for_event(
         raise HTTPException(status_code=400, detail="Invalid event ID") from e
 
     # Check if the event exists
-    event = db.query(Event).filter(Event.id == event_uuid).first()
+    event = await db.get(Event, event_uuid)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
 
@@ -750,10 +978,10 @@ async def register_for_event(
         raise HTTPException(status_code=400, detail="Event is not open for registration")
 
     # Check if user is already registered for this event
-    existing_registration = db.query(EventRegistration).filter(
+    existing_registration = (await db.execute(select(EventRegistration).where(
         EventRegistration.event_id == event_uuid,
         EventRegistration.user_id == user.id
-    ).first()
+    ))).scalars().first()
 
     if existing_registration:
         raise HTTPException(status_code=400, detail="You are already registered for this event")
@@ -768,10 +996,8 @@ async def register_for_event(
     try:
         # Add the registration to the database
         db.add(new_registration)
-        db.commit()
-        db.refresh(new_registration)
 
-        # Schedule the email notification in the background
+        # Queue the email notification, committed together with the registration
         if user.email:
             email_subject = f"Registration Confirmation: {event.title}"
             email_body = f"""
@@ -789,44 +1015,40 @@ async def register_for_event(
             Tribuna
             """
 
-            background_tasks.add_task(
-                send_email,
-                recipient_email=user.email,
-                subject=email_subject,
-                body=email_body
-            )
+            enqueue_email(db, user.email, email_subject, email_body)
+
+        await db.commit()
+        await db.refresh(new_registration)
 
         # Return the registration data
-        return EventRegistrationResponse.from_orm(new_registration, db)
+        return await EventRegistrationResponse.from_orm(new_registration, db)
 
     except IntegrityError as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=400, \
                             detail="You are already registered for this event") from e
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error registering for event: {str(e)}") from e
 
 @router.delete("/register/{event_id}", response_model=dict)
 async def cancel_event_registration(
     event_id: str,
-    background_tasks: BackgroundTasks,
     token: str = Depends(OAuth2PasswordBearer(tokenUrl="auth/login")),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
     ):
     """
-    Cancels a user's event registration and sends a notification email.
+    Cancels a user's event registration and queues a notification email.
     Args:
         event_id (str): UUID of the event to cancel registration for
-        background_tasks (BackgroundTasks): FastAPI background tasks object
         token (str): Authentication token
-        db (Session): Database session
+        db (AsyncSession): Database session
         
     Returns:
         dict: Confirmation message
     """
     # Validate the token and get the current user
-    user = get_current_user(token, db)
+    user = await get_current_user(token, db)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
 
@@ -837,22 +1059,21 @@ async def cancel_event_registration(
         raise HTTPException(status_code=400, detail="Invalid event ID") from e
 
     # Find the registration
-    registration = db.query(EventRegistration).filter(
+    registration = (await db.execute(select(EventRegistration).where(
         EventRegistration.event_id == event_uuid,
         EventRegistration.user_id == user.id
-    ).first()
+    ))).scalars().first()
 
     if not registration:
         raise HTTPException(status_code=404, detail="Registration not found")
 
     # Get the event for the notification
-    event = db.query(Event).filter(Event.id == event_uuid).first()
+    event = await db.get(Event, event_uuid)
 
     # Delete the registration
-    db.delete(registration)
-    db.commit()
+    await db.delete(registration)
 
-    # Send cancellation notification
+    # Queue the cancellation notification, committed together with the deletion
     if user.email and event:
         email_subject = f"Registration Cancelled: {event.title}"
         email_body = f"""
@@ -865,33 +1086,56 @@ async def cancel_event_registration(
         Best regards,
         The Community Events Team
         """
-        background_tasks.add_task(
-            send_email,
-            recipient_email=user.email,
-            subject=email_subject,
-            body=email_body
-        )
+        enqueue_email(db, user.email, email_subject, email_body)
+
+    await db.commit()
 
     return {"message": "Registration cancelled successfully"}
 
-@router.get("/register/{event_id}/status", response_model=dict)
+async def get_registration_status(db: AsyncSession, event_id: str, event_uuid: UUID,
+                                  user_id: UUID) -> EventRegistrationStatusResponse:
+    """
+    Looks up whether a user is registered for an event.
+    Args:
+        db (AsyncSession): Database session
+        event_id (str): Event ID as received in the request
+        event_uuid (UUID): UUID of the event
+        user_id (UUID): UUID of the user
+        
+    Returns:
+        EventRegistrationStatusResponse: Registration status information
+    """
+    registration = (await db.execute(select(EventRegistration).where(
+        EventRegistration.event_id == event_uuid,
+        EventRegistration.user_id == user_id
+    ))).scalars().first()
+
+    return EventRegistrationStatusResponse(
+        event_id=event_id,
+        is_registered=registration is not None,
+        registration_id=str(registration.id) if registration else None,
+        registration_time=registration.registration_time.isoformat() if registration else None,
+        attendance_status=registration.attendance_status if registration else None
+    )
+
+@router.get("/register/{event_id}/status", response_model=EventRegistrationStatusResponse)
 async def check_registration_status(
     event_id: str,
     token: str = Depends(OAuth2PasswordBearer(tokenUrl="auth/login")),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
     ):
     """
     Checks if the current user is registered for a specific event.
     Args:
         event_id (str): UUID of the event to check
         token (str): Authentication token
-        db (Session): Database session
+        db (AsyncSession): Database session
         
     Returns:
-        dict: Registration status information
+        EventRegistrationStatusResponse: Registration status information
     """
     # Validate the token and get the current user
-    user = get_current_user(token, db)
+    user = await get_current_user(token, db)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
 
@@ -902,52 +1146,95 @@ async def check_registration_status(
         raise HTTPException(status_code=400, detail="Invalid event ID") from e
 
     # Check if the user is registered for this event
-    registration = db.query(EventRegistration).filter(
-        EventRegistration.event_id == event_uuid,
-        EventRegistration.user_id == user.id
-    ).first()
+    return await get_registration_status(db, event_id, event_uuid, user.id)
 
-    return {
-        "event_id": event_id,
-        "is_registered": registration is not None,
-        "registration_id": str(registration.id) if registration else None,
-        "registration_time": registration.registration_time.isoformat() if registration else None,
-        "attendance_status": registration.attendance_status if registration else None
-    }
+@router.post("/me/state", response_model=EventUserStateListResponse)
+async def get_my_event_states(
+    request_data: EventUserStateRequest,
+    token: str = Depends(OAuth2PasswordBearer(tokenUrl="auth/login")),
+    db: AsyncSession = Depends(get_async_db)
+    ):
+    """
+    Returns the current user's vote and registration flags for a list of events,
+    with one query for the votes and one for the registrations.
+    Args:
+        request_data (EventUserStateRequest): IDs of the events to check
+        token (str): Authentication token
+        db (AsyncSession): Database session
+        
+    Returns:
+        EventUserStateListResponse: Flags for each requested event, in request order;
+        unknown events are reported as neither voted nor registered
+    """
+    # Validate the token and get the current user
+    user = await get_current_user(token, db)
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid or expired token")
+
+    # Drop duplicates, keeping the request order
+    event_ids = list(dict.fromkeys(request_data.event_ids))
+    if len(event_ids) > MAX_STATE_EVENTS:
+        raise HTTPException(status_code=400,
+                            detail=f"At most {MAX_STATE_EVENTS} events can be checked at once")
+    if not event_ids:
+        return EventUserStateListResponse(states=[])
+
+    # Both lookups are served by the (user_id, event_id) indexes
+    voted = set((await db.execute(select(EventVote.event_id).where(
+        EventVote.user_id == user.id,
+        EventVote.event_id.in_(event_ids)  # pylint: disable=no-member
+    ))).scalars())
+    registered = set((await db.execute(select(EventRegistration.event_id).where(
+        EventRegistration.user_id == user.id,
+        EventRegistration.event_id.in_(event_ids)  # pylint: disable=no-member
+    ))).scalars())
+
+    states = []
+    for event_uuid in event_ids:
+        # Votes still waiting in the write-behind buffer take precedence
+        has_voted = vote_buffer.pending_state(event_uuid, user.id) if vote_buffer else None
+        states.append(EventUserState(
+            event_id=event_uuid,
+            has_voted=event_uuid in voted if has_voted is None else has_voted,
+            is_registered=event_uuid in registered
+        ))
+
+    return EventUserStateListResponse(states=states)
 
 @router.get("/user_registrations", response_model=EventRegistrationListResponse)
 async def get_user_registrations(
     token: str = Depends(OAuth2PasswordBearer(tokenUrl="auth/login")),
     status: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
     ):
     """
     Returns all events the current user is registered for.
     Args:
         token (str): Authentication token
         status (Optional[str]): Filter by attendance status
-        db (Session): Database session
+        db (AsyncSession): Database session
         
     Returns:
         EventRegistrationListResponse: List of user's event registrations
     """
     # Validate the token and get the current user
-    user = get_current_user(token, db)
+    user = await get_current_user(token, db)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
 
     # Query for registrations
-    query = db.query(EventRegistration).filter(EventRegistration.user_id == user.id)
+    query = select(EventRegistration).where(EventRegistration.user_id == user.id)
 
     # Apply status filter if provided
     if status:
-        query = query.filter(EventRegistration.attendance_status == status)
+        query = query.where(EventRegistration.attendance_status == status)
 
     # Execute query
-    registrations = query.all()
+    registrations = (await db.execute(query)).scalars().all()
 
     # Convert to response models
-    registration_responses = [EventRegistrationResponse.from_orm(reg, db) for reg in registrations]
+    registration_responses = [await EventRegistrationResponse.from_orm(reg, db)
+                              for reg in registrations]
 
     return EventRegistrationListResponse(registrations=registration_responses)
 
@@ -955,20 +1242,20 @@ async def get_user_registrations(
 async def get_event_registrations(
     event_id: str,
     token: str = Depends(OAuth2PasswordBearer(tokenUrl="auth/login")),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
     ):
     """
     Returns all registrations for a specific event (restricted to event creator or admins).
     Args:
         event_id (str): UUID of the event
         token (str): Authentication token
-        db (Session): Database session
+        db (AsyncSession): Database session
         
     Returns:
         EventRegistrationListResponse: List of registrations for the event
     """
     # Validate the token and get the current user
-    user = get_current_user(token, db)
+    user = await get_current_user(token, db)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
 
@@ -979,7 +1266,7 @@ async def get_event_registrations(
         raise HTTPException(status_code=400, detail="Invalid event ID") from e
 
     # Get the event
-    event = db.query(Event).filter(Event.id == event_uuid).first()
+    event = await db.get(Event, event_uuid)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
 
@@ -989,11 +1276,13 @@ async def get_event_registrations(
                             detail="You are not authorized to view this information")
 
     # Get all registrations for this event
-    registrations = db.query(EventRegistration).filter(EventRegistration.event_id \
-                                                        == event_uuid).all()
+    registrations = (await db.execute(select(EventRegistration).where(
+        EventRegistration.event_id == event_uuid
+    ))).scalars().all()
 
     # Convert to response models
-    registration_responses = [EventRegistrationResponse.from_orm(reg, db) for reg in registrations]
+    registration_responses = [await EventRegistrationResponse.from_orm(reg, db)
+                              for reg in registrations]
 
     return EventRegistrationListResponse(registrations=registration_responses)
 
@@ -1002,7 +1291,7 @@ async def create_comment(
     event_id: str,
     comment_data: EventCommentCreate,
     token: str = Depends(OAuth2PasswordBearer(tokenUrl="auth/login")),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
     ):
     """
     Creates a new comment on an event.
@@ -1010,13 +1299,13 @@ async def create_comment(
         event_id (str): UUID of the event to comment on
         comment_data (EventCommentCreate): Comment data including content
         token (str): Authentication token
-        db (Session): Database session
+        db (AsyncSession): Database session
         
     Returns:
         EventCommentResponse: Created comment details
     """
     # Validate the token and get the current user
-    user = get_current_user(token, db)
+    user = await get_current_user(token, db)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
 
@@ -1027,7 +1316,7 @@ async def create_comment(
         raise HTTPException(status_code=400, detail="Invalid event ID") from e
 
     # Check if the event exists
-    event = db.query(Event).filter(Event.id == event_uuid).first()
+    event = await db.get(Event, event_uuid)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
 
@@ -1044,21 +1333,21 @@ async def create_comment(
     # Increment comments count on the event
     event.comments_count += 1
 
-    db.commit()
-    db.refresh(new_comment)
+    await db.commit()
+    await db.refresh(new_comment)
 
-    return EventCommentResponse.from_orm(new_comment, db)
+    return await EventCommentResponse.from_orm(new_comment, db)
 
 @router.get("/{event_id}/comments", response_model=EventCommentListResponse)
 async def get_event_comments(
     event_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
     ):
     """
     Retrieves all non-deleted comments for an event.
     Args:
         event_id (str): UUID of the event
-        db (Session): Database session
+        db (AsyncSession): Database session
         
     Returns:
         EventCommentListResponse: List of comments for the event
@@ -1070,28 +1359,169 @@ async def get_event_comments(
         raise HTTPException(status_code=400, detail="Invalid event ID") from e
 
     # Check if the event exists
-    event = db.query(Event).filter(Event.id == event_uuid).first()
+    event = await db.get(Event, event_uuid)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
 
     # Get all non-deleted comments for this event
-    comments = db.query(EventComment).filter(
+    comments = (await db.execute(select(EventComment).where(
         EventComment.event_id == event_uuid,
         EventComment.is_deleted == False  # pylint: disable=singleton-comparison
-    ).order_by(asc(EventComment.date_created)).all()
+    ).order_by(asc(EventComment.date_created)))).scalars().all()
 
     # Convert to response models
-    comment_responses = [EventCommentResponse.from_orm(comment, db) for comment in comments]
+    comment_responses = [await EventCommentResponse.from_orm(comment, db) for comment in comments]
 
     return EventCommentListResponse(comments=comment_responses)
 
+@router.get("/{event_id}/view_state", response_model=EventViewResponse)
+async def get_event_view_state(
+    event_id: str,
+    token: Optional[str] = Depends(OAuth2PasswordBearer(tokenUrl="auth/login", auto_error=False)),
+    db: AsyncSession = Depends(get_async_db)
+    ):
+    """
+    Returns everything the event view page needs in one round trip: the event, the
+    vote count and the viewer's vote and registration state, the first page of
+    comment threads and the viewer's profile. The token is resolved and the event
+    loaded once for all of them; anonymous viewers get the public parts only.
+    Args:
+        event_id (str): UUID of the event
+        token (Optional[str]): Authentication token, if the viewer is logged in
+        db (AsyncSession): Database session
+        
+    Returns:
+        EventViewResponse: Event, viewer state, comments and viewer profile
+    """
+    try:
+        # Convert the event_id to UUID
+        event_uuid = UUID(event_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail="Invalid event ID") from e
+
+    # Validate the token and get the current user, if one was sent
+    user = await get_current_user(token, db) if token else None
+
+    # Check if the event exists
+    event = await db.get(Event, event_uuid)
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+
+    threads, next_cursor = await load_comment_threads(db, event_uuid)
+    vote = await get_vote_status(db, event_id, event_uuid, event.votes,
+                                 user.id if user else None)
+    registration = await get_registration_status(db, event_id, event_uuid,
+                                                 user.id) if user else None
+
+    return EventViewResponse(
+        event=await EventResponse.from_orm(event, db),
+        vote=vote,
+        registration=registration,
+        comments=EventCommentThreadListResponse(comments=threads, next_cursor=next_cursor),
+        viewer=UserResponse(
+            id=str(user.id),
+            first_name=user.first_name,
+            last_name=user.last_name,
+            email=user.email,
+            bio=user.bio or "",  # Ensure bio is not None
+        ) if user else None
+    )
+
+@router.get("/{event_id}/comments/threaded", response_model=EventCommentThreadListResponse)
+async def get_event_comment_threads(
+    event_id: str,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_THREAD_PAGE_SIZE, ge=1, le=MAX_THREAD_PAGE_SIZE),
+    depth: int = Query(DEFAULT_THREAD_DEPTH, ge=0, le=MAX_THREAD_DEPTH),
+    replies_limit: int = Query(DEFAULT_REPLIES_PER_COMMENT, ge=1, le=MAX_REPLIES_PER_COMMENT),
+    db: AsyncSession = Depends(get_async_db)
+    ):
+    """
+    Retrieves a page of top-level comments for an event with their nested replies.
+    Args:
+        event_id (str): UUID of the event
+        cursor (Optional[str]): Cursor returned with the previous page
+        limit (int): Number of top-level comments per page
+        depth (int): Levels of nested replies to include
+        replies_limit (int): Maximum replies returned under any single comment
+        db (AsyncSession): Database session
+        
+    Returns:
+        EventCommentThreadListResponse: Comment threads and the cursor for the next page
+    """
+    try:
+        # Convert the event_id to UUID
+        event_uuid = UUID(event_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail="Invalid event ID") from e
+
+    # Check if the event exists
+    if await db.scalar(select(Event.id).where(Event.id == event_uuid)) is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+
+    try:
+        threads, next_cursor = await load_comment_threads(
+            db, event_uuid, cursor=cursor, limit=limit, depth=depth,
+            replies_limit=replies_limit
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    return EventCommentThreadListResponse(comments=threads, next_cursor=next_cursor)
+
+@router.get("/comments/{comment_id}/replies", response_model=EventCommentThreadListResponse)
+async def get_comment_replies(
+    comment_id: str,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_REPLIES_PER_COMMENT, ge=1, le=MAX_THREAD_PAGE_SIZE),
+    depth: int = Query(DEFAULT_THREAD_DEPTH, ge=0, le=MAX_THREAD_DEPTH),
+    replies_limit: int = Query(DEFAULT_REPLIES_PER_COMMENT, ge=1, le=MAX_REPLIES_PER_COMMENT),
+    db: AsyncSession = Depends(get_async_db)
+    ):
+    """
+    Loads more replies to a comment ("load more replies"), with their own nested replies.
+    Args:
+        comment_id (str): UUID of the comment whose replies to load
+        cursor (Optional[str]): replies_cursor of the comment, or of the previous page
+        limit (int): Number of direct replies per page
+        depth (int): Levels of nested replies to include below each reply
+        replies_limit (int): Maximum replies returned under any single reply
+        db (AsyncSession): Database session
+        
+    Returns:
+        EventCommentThreadListResponse: Replies and the cursor for the next page
+    """
+    try:
+        # Convert the comment_id to UUID
+        comment_uuid = UUID(comment_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail="Invalid comment ID") from e
+
+    # Get the comment to find its event; a deleted comment is shown as a placeholder
+    # while it has replies, so they can still be loaded
+    event_uuid = await db.scalar(select(EventComment.event_id).where(
+        EventComment.id == comment_uuid
+    ))
+    if event_uuid is None:
+        raise HTTPException(status_code=404, detail="Comment not found")
+
+    try:
+        threads, next_cursor = await load_comment_threads(
+            db, event_uuid, parent_comment_id=comment_uuid, cursor=cursor, limit=limit,
+            depth=depth, replies_limit=replies_limit
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    return EventCommentThreadListResponse(comments=threads, next_cursor=next_cursor)
+
 # Fixed to use a Pydantic model for the update request
 @router.put("/comments/{comment_id}", response_model=EventCommentResponse)
 async def update_comment(
     comment_id: str,
     comment_data: CommentUpdate,  # Using a Pydantic model instead of raw string
     token: str = Depends(OAuth2PasswordBearer(tokenUrl="auth/login")),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
     ):
     """
     Updates an existing comment, with permission checks.
@@ -1099,13 +1529,13 @@ async def update_comment(
         comment_id (str): UUID of the comment to update
         comment_data (CommentUpdate): Updated comment data
         token (str): Authentication token
-        db (Session): Database session
+        db (AsyncSession): Database session
         
     Returns:
         EventCommentResponse: Updated comment details
     """
     # Validate the token and get the current user
-    user = get_current_user(token, db)
+    user = await get_current_user(token, db)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
 
@@ -1116,10 +1546,10 @@ async def update_comment(
         raise HTTPException(status_code=400, detail="Invalid comment ID") from e
 
     # Get the comment
-    comment = db.query(EventComment).filter(
+    comment = (await db.execute(select(EventComment).where(
         EventComment.id == comment_uuid,
         EventComment.is_deleted == False  # pylint: disable=singleton-comparison
-    ).first()
+    ))).scalars().first()
 
     if not comment:
         raise HTTPException(status_code=404, detail="Comment not found")
@@ -1133,30 +1563,30 @@ async def update_comment(
     comment.date_updated = datetime.now(timezone.utc)
 
     # Commit changes
-    db.commit()
-    db.refresh(comment)
+    await db.commit()
+    await db.refresh(comment)
 
     # Return updated comment
-    return EventCommentResponse.from_orm(comment, db)
+    return await EventCommentResponse.from_orm(comment, db)
 
 @router.delete("/comments/{comment_id}", response_model=dict)
 async def delete_comment(
     comment_id: str,
     token: str = Depends(OAuth2PasswordBearer(tokenUrl="auth/login")),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
     ):
     """
     Soft-deletes a comment while preserving the content.
     Args:
         comment_id (str): UUID of the comment to delete
         token (str): Authentication token
-        db (Session): Database session
+        db (AsyncSession): Database session
         
     Returns:
         dict: Confirmation message
     """
     # Validate the token and get the current user
-    user = get_current_user(token, db)
+    user = await get_current_user(token, db)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
 
@@ -1167,10 +1597,10 @@ async def delete_comment(
         raise HTTPException(status_code=400, detail="Invalid comment ID") from e
 
     # Get the comment
-    comment = db.query(EventComment).filter(
+    comment = (await db.execute(select(EventComment).where(
         EventComment.id == comment_uuid,
         EventComment.is_deleted == False  # pylint: disable=singleton-comparison
-    ).first()
+    ))).scalars().first()
 
     if not comment:
         raise HTTPException(status_code=404, detail="Comment not found")
@@ -1180,7 +1610,7 @@ async def delete_comment(
         raise HTTPException(status_code=403, detail="You can only delete your own comments")
 
     # Get the associated event
-    event = db.query(Event).filter(Event.id == comment.event_id).first()
+    event = await db.get(Event, comment.event_id)
 
     # Soft delete the comment
     comment.is_deleted = True
@@ -1192,7 +1622,7 @@ async def delete_comment(
         event.comments_count -= 1
 
     # Commit changes
-    db.commit()
+    await db.commit()
 
     return {"message": "Comment deleted successfully"}
 
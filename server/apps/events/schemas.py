@@ -8,13 +8,22 @@ from typing import List, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, validator
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import Field
 
 from server.apps.authentication.models import User
+from server.apps.authentication.schemas import UserResponse
 from server.apps.events.models import Event, EventCategory, EventComment
 
 
+def format_username(first_name: str, last_name: Optional[str]) -> str:
+    """Build the display name shown for a user from their first and last name."""
+    if last_name:
+        return f"{first_name} {last_name}"
+    return first_name
+
+
 class EventStatus(str, Enum):
     """Enum representing the possible statuses of an event."""
     OPEN = "open"
@@ -71,7 +80,7 @@ class EventResponse(BaseModel):
     comments_count: int = Field(default=0)  # Add comments counter to response
 
     @classmethod
-    def from_orm(cls, obj, db: Optional[Session] = None):
+    async def from_orm(cls, obj, db: Optional[AsyncSession] = None):
         """
         Convert an ORM event object to this schema, including author information.
         
@@ -84,16 +93,46 @@ class EventResponse(BaseModel):
         """
         event = obj  # Use a local variable for clarity while keeping the method signature
         # Query the user by author_id
-        user = db.query(User).filter(User.id == event.author_id).first()
+        user = await db.get(User, event.author_id)
         if not user:
             raise ValueError(f"User with ID {event.author_id} not found")
 
-        # Construct the username
-        author_username = user.first_name
-        if user.last_name:
-            author_username += f" {user.last_name}"
+        return cls._from_event(event, format_username(user.first_name, user.last_name))
 
-        # Return the EventResponse instance
+    @classmethod
+    async def from_orm_many(cls, objs, db: AsyncSession):
+        """
+        Convert a list of ORM event objects to this schema, resolving all authors
+        with a single query instead of one query per event.
+        
+        Args:
+            objs: Iterable of Event ORM objects
+            db: Database session for related queries
+        
+        Returns:
+            list[EventResponse]: The formatted event responses, in input order
+        """
+        events = list(objs)
+        author_ids = {event.author_id for event in events}
+        if not author_ids:
+            return []
+
+        # Fetch only the columns needed for the username in one IN query
+        rows = (await db.execute(select(User.id, User.first_name, User.last_name).where(
+            User.id.in_(author_ids)  # pylint: disable=no-member
+        ))).all()
+        usernames = {row.id: format_username(row.first_name, row.last_name) for row in rows}
+
+        responses = []
+        for event in events:
+            if event.author_id not in usernames:
+                raise ValueError(f"User with ID {event.author_id} not found")
+            responses.append(cls._from_event(event, usernames[event.author_id]))
+        return responses
+
+    @classmethod
+    def _from_event(cls, event, author_username: Optional[str]):
+        """Build the response from an Event ORM object and an already resolved author name."""
         return cls(
             id=event.id,
             title=event.title,
@@ -147,7 +186,7 @@ class EventRegistrationResponse(BaseModel):
     event_date: Optional[str] = None
 
     @classmethod
-    def from_orm(cls, obj, db: Optional[Session] = None):
+    async def from_orm(cls, obj, db: Optional[AsyncSession] = None):
         """
         Convert an ORM registration object to this schema, including event information.
         
@@ -160,7 +199,7 @@ class EventRegistrationResponse(BaseModel):
         """
         registration = obj  # Use a local variable for clarity while keeping the method signature
         # Get event information
-        event = db.query(Event).filter(Event.id == registration.event_id).first()
+        event = await db.get(Event, registration.event_id)
 
         return cls(
             id=registration.id,
@@ -202,7 +241,7 @@ class EventCommentResponse(BaseModel):
     parent_comment_author: Optional[str] = None
 
     @classmethod
-    def from_orm(cls, obj, db: Optional[Session] = None):
+    async def from_orm(cls, obj, db: Optional[AsyncSession] = None):
         """
         Convert an ORM comment object to this schema, including author information.
         
@@ -215,7 +254,7 @@ class EventCommentResponse(BaseModel):
         """
         comment = obj  # Use a local variable for clarity while keeping the method signature
         # Query the user to get username
-        user = db.query(User).filter(User.id == comment.user_id).first()
+        user = await db.get(User, comment.user_id)
 
         # Construct the username
         author_username = "Unknown User"
@@ -227,14 +266,10 @@ class EventCommentResponse(BaseModel):
         # Get parent comment author if this is a reply
         parent_comment_author = None
         if comment.parent_comment_id:
-            parent_comment = db.query(EventComment).filter(
-                EventComment.id == comment.parent_comment_id
-            ).first()
+            parent_comment = await db.get(EventComment, comment.parent_comment_id)
 
             if parent_comment:
-                parent_user = db.query(User).filter(
-                    User.id == parent_comment.user_id
-                ).first()
+                parent_user = await db.get(User, parent_comment.user_id)
 
                 if parent_user:
                     parent_comment_author = parent_user.first_name
@@ -261,3 +296,68 @@ class EventCommentListResponse(BaseModel):
     comments: List[EventCommentResponse]
 
     model_config = {"from_attributes": True}
+
+
+class EventCommentThreadResponse(EventCommentResponse):
+    """
+    Schema for a comment together with its nested replies.
+
+    When more replies exist than were returned (either past the requested depth or
+    past the per-comment reply limit), has_more_replies is set and replies_cursor
+    can be passed to the replies endpoint to continue after the last one shown.
+    A deleted comment that still has replies is kept as a placeholder: is_deleted
+    is set and its content is empty.
+    """
+    depth: int = 0
+    is_deleted: bool = False
+    replies: List["EventCommentThreadResponse"] = []
+    has_more_replies: bool = False
+    replies_cursor: Optional[str] = None
+
+
+class EventCommentThreadListResponse(BaseModel):
+    """Schema for a page of comment threads."""
+    comments: List[EventCommentThreadResponse]
+    next_cursor: Optional[str] = None
+
+    model_config = {"from_attributes": True}
+
+
+class EventRegistrationStatusResponse(BaseModel):
+    """Schema for a user's registration status for an event."""
+    event_id: str
+    is_registered: bool
+    registration_id: Optional[str] = None
+    registration_time: Optional[str] = None
+    attendance_status: Optional[str] = None
+
+
+class EventViewResponse(BaseModel):
+    """
+    Schema for everything the event view page loads, in a single response.
+
+    registration and viewer are only set, and vote.has_voted only reflects the
+    viewer, when the request is authenticated.
+    """
+    event: EventResponse
+    vote: EventVoteResponse
+    registration: Optional[EventRegistrationStatusResponse] = None
+    comments: EventCommentThreadListResponse
+    viewer: Optional[UserResponse] = None
+
+
+class EventUserStateRequest(BaseModel):
+    """Schema for requesting the current user's state for several events."""
+    event_ids: List[UUID]
+
+
+class EventUserState(BaseModel):
+    """Schema for the current user's vote and registration flags for one event."""
+    event_id: UUID
+    has_voted: bool
+    is_registered: bool
+
+
+class EventUserStateListResponse(BaseModel):
+    """Schema for the current user's state for a list of events."""
+    states: List[EventUserState]
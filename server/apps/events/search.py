@@ -0,0 +1,222 @@
+"""
+Full-text search for events backed by an SQLite FTS5 index.
+
+The event_fts virtual table mirrors each event's title, description, location and
+author name. Triggers on the event and user tables keep it in sync, so searches
+are answered from the index with BM25 ranking and prefix matching instead of
+scanning every event with ILIKE. Each index row has the rowid of its event, so
+the triggers find it through the rowid instead of scanning the index. VACUUM may
+renumber event rowids; the index is rebuilt at startup when they no longer match.
+Databases that predate the index can be backfilled with:
+
+    python -m server.apps.events.search
+"""
+import re
+from typing import Iterable, Optional
+
+from sqlalchemy import Float, String, column, text
+from sqlalchemy.engine import Engine
+
+FTS_TABLE = "event_fts"
+
+# Indexed columns, in table order (event_id is stored but not tokenized; rows are
+# looked up by rowid, which is the rowid of the event)
+FTS_COLUMNS = ("title", "description", "location", "author_name")
+
+# BM25 column weights: event_id, title, description, location, author_name
+BM25_WEIGHTS = (0.0, 10.0, 1.0, 2.0, 5.0)
+
+_AUTHOR_NAME_SQL = """(SELECT COALESCE(first_name, '') || ' ' || COALESCE(last_name, '')
+                       FROM "user" WHERE "user".id = NEW.author_id)"""
+
+_TRIGGERS = ("event_insert", "event_update", "event_delete", "user_rename")
+
+_CREATE_STATEMENTS = (
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        event_id UNINDEXED,
+        title,
+        description,
+        location,
+        author_name,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_event_insert AFTER INSERT ON event
+    BEGIN
+        INSERT INTO {FTS_TABLE} (rowid, event_id, title, description, location, author_name)
+        VALUES (NEW.rowid, NEW.id, NEW.title, NEW.description, NEW.location,
+                {_AUTHOR_NAME_SQL});
+    END
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_event_update
+    AFTER UPDATE OF title, description, location, author_id ON event
+    BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = OLD.rowid;
+        INSERT INTO {FTS_TABLE} (rowid, event_id, title, description, location, author_name)
+        VALUES (NEW.rowid, NEW.id, NEW.title, NEW.description, NEW.location,
+                {_AUTHOR_NAME_SQL});
+    END
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_event_delete AFTER DELETE ON event
+    BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = OLD.rowid;
+    END
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_user_rename
+    AFTER UPDATE OF first_name, last_name ON "user"
+    BEGIN
+        UPDATE {FTS_TABLE}
+        SET author_name = COALESCE(NEW.first_name, '') || ' ' || COALESCE(NEW.last_name, '')
+        WHERE rowid IN (SELECT rowid FROM event WHERE author_id = NEW.id);
+    END
+    """,
+)
+
+_REBUILD_STATEMENTS = (
+    f"DELETE FROM {FTS_TABLE}",
+    f"""
+    INSERT INTO {FTS_TABLE} (rowid, event_id, title, description, location, author_name)
+    SELECT event.rowid, event.id, event.title, event.description, event.location,
+           COALESCE("user".first_name, '') || ' ' || COALESCE("user".last_name, '')
+    FROM event LEFT JOIN "user" ON "user".id = event.author_id
+    """,
+)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Set once the index has been verified or created for the application's database
+_search_index_ready = False
+
+
+def ensure_event_search_index(engine: Engine) -> bool:
+    """
+    Create the FTS5 table and its sync triggers if missing, backfilling a new index.
+
+    Args:
+        engine: Database engine
+
+    Returns:
+        bool: True if the index is available, False for non-SQLite databases or
+        SQLite builds without FTS5 (search then falls back to ILIKE)
+    """
+    global _search_index_ready  # pylint: disable=global-statement
+    if engine.dialect.name != "sqlite":
+        return False
+
+    try:
+        with engine.begin() as connection:
+            existed = connection.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {"name": FTS_TABLE},
+            ).first() is not None
+            # Triggers are recreated so databases get the current definitions
+            for trigger in _TRIGGERS:
+                connection.execute(text(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{trigger}"))
+            for statement in _CREATE_STATEMENTS:
+                connection.execute(text(statement))
+            # Backfill a new index, or one whose rows no longer line up with the events
+            if not existed or not _index_matches_events(connection):
+                for statement in _REBUILD_STATEMENTS:
+                    connection.execute(text(statement))
+    except Exception as error:  # pylint: disable=broad-except
+        print(f"Event search index unavailable, falling back to ILIKE search: {error}")
+        return False
+
+    _search_index_ready = True
+    return True
+
+
+def _index_matches_events(connection) -> bool:
+    """Return True if every event has exactly one index row, keyed by its rowid."""
+    events = _count(connection, "event")
+    matched = connection.execute(text(
+        f"SELECT COUNT(*) FROM event JOIN {FTS_TABLE} "
+        f"ON {FTS_TABLE}.rowid = event.rowid AND {FTS_TABLE}.event_id = event.id"
+    )).scalar()
+    return matched == events == _count(connection, FTS_TABLE)
+
+
+def _count(connection, table_name: str) -> int:
+    """Return the number of rows in a table."""
+    return connection.execute(text(f"SELECT COUNT(*) FROM {table_name}")).scalar()
+
+
+def rebuild_event_search_index(engine: Engine) -> int:
+    """
+    Repopulate the search index from the event and user tables.
+
+    Args:
+        engine: Database engine
+
+    Returns:
+        int: Number of indexed events
+    """
+    ensure_event_search_index(engine)
+    with engine.begin() as connection:
+        for statement in _REBUILD_STATEMENTS:
+            connection.execute(text(statement))
+        return _count(connection, FTS_TABLE)
+
+
+def is_search_index_ready() -> bool:
+    """Return True if searches can be served from the FTS5 index."""
+    return _search_index_ready
+
+
+def build_match_query(term: str, columns: Optional[Iterable[str]] = None) -> Optional[str]:
+    """
+    Turn free-form user input into an FTS5 MATCH expression.
+
+    Every word becomes a quoted prefix query and all words must match, so the
+    search works as the user types.
+
+    Args:
+        term: Raw search input
+        columns: Optional subset of FTS_COLUMNS to search in
+
+    Returns:
+        Optional[str]: MATCH expression, or None if the input has no searchable words
+    """
+    tokens = _TOKEN_RE.findall(term)
+    if not tokens:
+        return None
+    match = " ".join(f'"{token}"*' for token in tokens)
+    if columns:
+        match = "{" + " ".join(columns) + "} : (" + match + ")"
+    return match
+
+
+def search_events_subquery(match: str):
+    """
+    Build a subquery of (event_id, rank) for events matching an FTS5 expression.
+
+    Lower ranks are better matches, as returned by bm25().
+
+    Args:
+        match: Expression produced by build_match_query
+
+    Returns:
+        Subquery with event_id and rank columns, to be joined against Event.id
+    """
+    weights = ", ".join(str(weight) for weight in BM25_WEIGHTS)
+    return (
+        text(
+            f"SELECT event_id, bm25({FTS_TABLE}, {weights}) AS rank "
+            f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match"
+        )
+        .bindparams(match=match)
+        .columns(column("event_id", String), column("rank", Float))
+        .subquery("event_search")
+    )
+
+
+if __name__ == "__main__":
+    from server.core.database import engine as app_engine
+
+    indexed = rebuild_event_search_index(app_engine)
+    print(f"Rebuilt event search index with {indexed} events")
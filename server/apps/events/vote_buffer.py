@@ -0,0 +1,263 @@
+"""
+Optional write-behind buffer for event votes.
+
+When VOTE_BUFFER_ENABLED is set, vote and unvote requests are recorded in memory,
+deduplicated per (user, event) and written to EventVote and Event.votes in
+batched transactions every VOTE_BUFFER_FLUSH_MS milliseconds, or as soon as
+VOTE_BUFFER_MAX_PENDING entries are waiting. Pending votes are consulted when
+answering vote status requests, so a user always sees their own vote.
+
+Votes for events or users deleted while they were buffered are dropped. A batch
+that fails on a transient error such as "database is locked" is retried as a
+whole; after any other error its votes are written one by one, and those that
+still fail are logged and dropped so they cannot hold up the rest.
+"""
+import logging
+import threading
+from collections import defaultdict
+from typing import Dict, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import case, select, update
+from sqlalchemy.exc import OperationalError
+
+from server.apps.authentication.models import User
+from server.core.config import settings
+from server.core.database import SessionLocal
+from .models import Event, EventVote
+
+logger = logging.getLogger(__name__)
+
+# (event_id, user_id) -> (desired has_voted state, state already stored in the database)
+PendingVotes = Dict[Tuple[UUID, UUID], Tuple[bool, bool]]
+
+
+class VoteBuffer:
+    """
+    In-process aggregation layer that batches vote writes.
+
+    Args:
+        session_factory: Callable returning a new database session
+        flush_interval (float): Seconds between periodic flushes
+        max_pending (int): Number of pending entries that triggers an early flush
+    """
+
+    def __init__(self, session_factory, flush_interval: float = 0.2, max_pending: int = 500):
+        self._session_factory = session_factory
+        self._flush_interval = flush_interval
+        self._max_pending = max_pending
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending: PendingVotes = {}
+        self._in_flight: PendingVotes = {}
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start the background flush thread."""
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="vote-buffer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the flush thread, writing out everything still buffered."""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def submit(self, event_id: UUID, user_id: UUID, has_voted: bool, stored: bool):
+        """
+        Record that a user wants their vote on an event to be in the given state.
+
+        Args:
+            event_id: UUID of the event
+            user_id: UUID of the voting user
+            has_voted: True for a vote, False for an unvote
+            stored: Whether the vote currently exists in the database
+        """
+        key = (event_id, user_id)
+        with self._lock:
+            # The baseline is what the database will hold once earlier writes land
+            if key in self._pending:
+                baseline = self._pending[key][1]
+            elif key in self._in_flight:
+                baseline = self._in_flight[key][0]
+            else:
+                baseline = stored
+
+            if has_voted == baseline:
+                self._pending.pop(key, None)
+            else:
+                self._pending[key] = (has_voted, baseline)
+            full = len(self._pending) >= self._max_pending
+
+        if full:
+            self._wakeup.set()
+
+    def pending_state(self, event_id: UUID, user_id: UUID) -> Optional[bool]:
+        """
+        Return the buffered vote state for a user and event.
+
+        Returns:
+            Optional[bool]: Buffered has_voted state, or None if nothing is buffered
+        """
+        key = (event_id, user_id)
+        with self._lock:
+            if key in self._pending:
+                return self._pending[key][0]
+            if key in self._in_flight:
+                return self._in_flight[key][0]
+        return None
+
+    def pending_delta(self, event_id: UUID) -> int:
+        """
+        Return the change to an event's vote count that has not been written yet.
+
+        Args:
+            event_id: UUID of the event
+
+        Returns:
+            int: Net number of buffered votes minus unvotes
+        """
+        delta = 0
+        with self._lock:
+            for entries in (self._in_flight, self._pending):
+                for (entry_event_id, _), (has_voted, stored) in entries.items():
+                    if entry_event_id == event_id and has_voted != stored:
+                        delta += 1 if has_voted else -1
+        return delta
+
+    def flush(self) -> int:
+        """
+        Write all buffered votes to the database in a single transaction.
+
+        Returns:
+            int: Number of buffered entries written
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+                self._in_flight = batch
+            if not batch:
+                return 0
+
+            try:
+                self._write(batch)
+            except OperationalError as error:
+                # Transient (e.g. "database is locked"): try the whole batch again later
+                logger.warning("Failed to flush %d buffered votes, will retry: %s",
+                               len(batch), error)
+                self._requeue(batch)
+                return 0
+            except Exception as error:  # pylint: disable=broad-except
+                logger.error("Failed to flush %d buffered votes, writing them one by one: %s",
+                             len(batch), error)
+                return self._write_each(batch)
+            finally:
+                with self._lock:
+                    self._in_flight = {}
+            return len(batch)
+
+    def _write_each(self, batch: PendingVotes) -> int:
+        """Write the entries of a failed batch separately, dropping those that keep failing."""
+        written = 0
+        for key, entry in batch.items():
+            try:
+                self._write({key: entry})
+                written += 1
+            except OperationalError:
+                self._requeue({key: entry})
+            except Exception as error:  # pylint: disable=broad-except
+                logger.error("Dropping buffered vote of user %s on event %s: %s",
+                             key[1], key[0], error)
+        return written
+
+    def _requeue(self, batch: PendingVotes):
+        """Put a batch that failed to write back in front of newer entries."""
+        with self._lock:
+            for key, (has_voted, stored) in batch.items():
+                if key in self._pending:
+                    # A newer request superseded this one; keep its target state
+                    has_voted = self._pending[key][0]
+                if has_voted == stored:
+                    self._pending.pop(key, None)
+                else:
+                    self._pending[key] = (has_voted, stored)
+
+    def _write(self, batch: PendingVotes):
+        """Apply a batch of votes and the matching vote count changes."""
+        db = self._session_factory()
+        try:
+            # Votes for events or users deleted in the meantime have nothing to apply to
+            known_events = set(db.scalars(select(Event.id).where(
+                Event.id.in_({event_id for event_id, _ in batch}))))  # pylint: disable=no-member
+            known_users = set(db.scalars(select(User.id).where(
+                User.id.in_({user_id for _, user_id in batch}))))  # pylint: disable=no-member
+
+            additions = defaultdict(set)
+            removals = defaultdict(set)
+            dropped = 0
+            for (event_id, user_id), (has_voted, _) in batch.items():
+                if event_id not in known_events or user_id not in known_users:
+                    dropped += 1
+                    continue
+                (additions if has_voted else removals)[event_id].add(user_id)
+            if dropped:
+                logger.warning("Dropped %d buffered votes for deleted events or users", dropped)
+
+            for event_id in set(additions) | set(removals):
+                delta = 0
+                if removals[event_id]:
+                    delta -= db.query(EventVote).filter(
+                        EventVote.event_id == event_id,
+                        EventVote.user_id.in_(removals[event_id])  # pylint: disable=no-member
+                    ).delete(synchronize_session=False)
+
+                if additions[event_id]:
+                    existing = {
+                        row.user_id for row in db.query(EventVote.user_id).filter(
+                            EventVote.event_id == event_id,
+                            EventVote.user_id.in_(additions[event_id])  # pylint: disable=no-member
+                        )
+                    }
+                    new_voters = additions[event_id] - existing
+                    db.add_all(EventVote(event_id=event_id, user_id=user_id)
+                               for user_id in new_voters)
+                    delta += len(new_voters)
+
+                if delta:
+                    db.execute(
+                        update(Event)
+                        .where(Event.id == event_id)
+                        .values(votes=case((Event.votes + delta < 0, 0),
+                                           else_=Event.votes + delta))
+                        .execution_options(synchronize_session=False)
+                    )
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _run(self):
+        """Flush periodically, or early when the buffer fills up, until stopped."""
+        while not self._stopped.is_set():
+            self._wakeup.wait(self._flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+
+vote_buffer: Optional[VoteBuffer] = None
+if settings.VOTE_BUFFER_ENABLED:
+    vote_buffer = VoteBuffer(
+        SessionLocal,
+        flush_interval=settings.VOTE_BUFFER_FLUSH_MS / 1000,
+        max_pending=settings.VOTE_BUFFER_MAX_PENDING,
+    )
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, HTTPException, Depends, Path, status
+from fastapi import APIRouter, HTTPException, Depends, Path, Request, status
 from fastapi.responses import HTMLResponse, RedirectResponse
-from sqlalchemy.orm import Session
-from pathlib import Path as FilePath
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from server.apps.forum.models import Post, Comment, Like, Question, Answer
-from server.core.database import get_db
+from server.core.database import get_async_db
+from server.core.page_cache import page_cache
 from server.core.security import get_current_user
 from server.apps.forum.schemas import CommentBase, CommentCreate, Comment as CommentSchema
 
@@ -11,7 +12,7 @@ from server.apps.forum.schemas import CommentBase, CommentCreate, Comment as Com
 router = APIRouter()
 
 # Optional current user dependency that doesn't raise an exception if user is not authenticated
-async def get_optional_user(db: Session = Depends(get_db)):
+async def get_optional_user(db: AsyncSession = Depends(get_async_db)):
     try:
         return await get_current_user(db)
     except:
@@ -19,52 +20,39 @@ async def get_optional_user(db: Session = Depends(get_db)):
 
 # HTML Page routes
 @router.get("/", response_class=HTMLResponse)
-def events_page():
-    # Path to the forum HTML file
-    html_file_path = FilePath(__file__).parent.parent.parent.parent / "src/pages/forum-posts-page.html"
-    # Read the HTML file content
-    if html_file_path.exists():
-        html_content = html_file_path.read_text(encoding="utf-8")
-        return HTMLResponse(content=html_content)
-    else:
-        return HTMLResponse(content="<h1>Forum page not found</h1>", status_code=404)
+def events_page(request: Request):
+    # Serve the forum page from the in-memory page cache
+    return page_cache.response(request, "forum-posts-page.html", "<h1>Forum page not found</h1>")
 
 @router.get("/create_post", response_class=HTMLResponse)
-async def create_post_page(current_user: dict = Depends(get_optional_user)):
+async def create_post_page(request: Request, current_user: dict = Depends(get_optional_user)):
     # Check if user is authenticated
     if not current_user:
         # Redirect to login page if user is not authenticated
         return RedirectResponse(url="/auth/login?next=/forum/create_post", status_code=status.HTTP_302_FOUND)
 
-    # Path to the create post HTML file
-    html_file_path = FilePath(__file__).parent.parent.parent.parent / "src/pages/create-post-page.html"
-    # Read the HTML file content
-    if html_file_path.exists():
-        html_content = html_file_path.read_text(encoding="utf-8")
-        return HTMLResponse(content=html_content)
-    else:
-        return HTMLResponse(content="<h1>Create post page not found</h1>", status_code=404)
+    # Serve the create post page from the in-memory page cache
+    return page_cache.response(
+        request, "create-post-page.html", "<h1>Create post page not found</h1>"
+    )
 
 @router.get("/view_post/{post_id}", response_class=HTMLResponse)
-def view_post_page(post_id: int, db: Session = Depends(get_db)):
+async def view_post_page(post_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
     # Check if post exists - any user can view posts
-    post = db.query(Post).filter(Post.id == post_id).first()
+    post = await db.get(Post, post_id)
     if post is None:
         return HTMLResponse(content="<h1>Post not found</h1>", status_code=404)
 
-    html_file_path = FilePath(__file__).parent.parent.parent.parent / "src/pages/post-view-page.html"
-    # Read the HTML file content
-    if html_file_path.exists():
-        html_content = html_file_path.read_text(encoding="utf-8")
-        return HTMLResponse(content=html_content)
-    else:
-        return HTMLResponse(content="<h1>View post page not found</h1>", status_code=404)
+    # Serve the post view page from the in-memory page cache
+    return page_cache.response(
+        request, "post-view-page.html", "<h1>View post page not found</h1>"
+    )
 
 # Post routes - Create requires authentication
 @router.post("/posts")
 async def create_post(
     post: dict,  # Use your actual schema here if available
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)  # Will raise 401 if not authenticated
 ):
     # Create a post using your actual model
@@ -74,28 +62,28 @@ async def create_post(
         user_id=current_user.get("id")
     )
     db.add(new_post)
-    db.commit()
-    db.refresh(new_post)
+    await db.commit()
+    await db.refresh(new_post)
     return new_post
 
 # View routes - No authentication required
 @router.get("/posts")
-def get_posts(
+async def get_posts(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     # Get posts using your actual model - anyone can view posts
-    posts = db.query(Post).offset(skip).limit(limit).all()
+    posts = (await db.execute(select(Post).offset(skip).limit(limit))).scalars().all()
     return posts
 
 @router.get("/posts/{post_id}")
-def get_post(
+async def get_post(
     post_id: int = Path(..., title="The ID of the post to get"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     # Get a specific post - anyone can view posts
-    post = db.query(Post).filter(Post.id == post_id).first()
+    post = await db.get(Post, post_id)
     if post is None:
         raise HTTPException(status_code=404, detail="Post not found")
     return post
@@ -104,11 +92,11 @@ def get_post(
 async def update_post(
     post_id: int,
     post_update: dict,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)  # Will raise 401 if not authenticated
 ):
     # Get the post
-    db_post = db.query(Post).filter(Post.id == post_id).first()
+    db_post = await db.get(Post, post_id)
     if db_post is None:
         raise HTTPException(status_code=404, detail="Post not found")
 
@@ -121,18 +109,18 @@ async def update_post(
         if hasattr(db_post, key):
             setattr(db_post, key, value)
 
-    db.commit()
-    db.refresh(db_post)
+    await db.commit()
+    await db.refresh(db_post)
     return db_post
 
 @router.delete("/posts/{post_id}")
 async def delete_post(
     post_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)  # Will raise 401 if not authenticated
 ):
     # Get the post
-    db_post = db.query(Post).filter(Post.id == post_id).first()
+    db_post = await db.get(Post, post_id)
     if db_post is None:
         raise HTTPException(status_code=404, detail="Post not found")
 
@@ -141,19 +129,19 @@ async def delete_post(
         raise HTTPException(status_code=403, detail="You can only delete your own posts")
 
     # Delete the post
-    db.delete(db_post)
-    db.commit()
+    await db.delete(db_post)
+    await db.commit()
     return {"message": "Post deleted successfully"}
 
 @router.post("/posts/{post_id}/comments")
 async def create_comment(
     post_id: int,
     comment: CommentCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     # Перевіряємо чи існує пост
-    post = db.query(Post).filter(Post.id == post_id).first()
+    post = await db.get(Post, post_id)
     if post is None:
         raise HTTPException(status_code=404, detail="Post not found")
 
@@ -164,34 +152,36 @@ async def create_comment(
         user_id=current_user.get("id")
     )
     db.add(new_comment)
-    db.commit()
-    db.refresh(new_comment)
+    await db.commit()
+    await db.refresh(new_comment)
     return new_comment
 
 @router.get("/posts/{post_id}/comments")
-def get_post_comments(
+async def get_post_comments(
     post_id: int,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     # Перевіряємо чи існує пост
-    post = db.query(Post).filter(Post.id == post_id).first()
+    post = await db.get(Post, post_id)
     if post is None:
         raise HTTPException(status_code=404, detail="Post not found")
 
     # Отримуємо коментарі до поста
-    comments = db.query(Comment).filter(Comment.post_id == post_id).offset(skip).limit(limit).all()
+    comments = (await db.execute(
+        select(Comment).where(Comment.post_id == post_id).offset(skip).limit(limit)
+    )).scalars().all()
     return comments
 
 @router.delete("/comments/{comment_id}")
 async def delete_comment(
     comment_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     # Отримуємо коментар
-    comment = db.query(Comment).filter(Comment.id == comment_id).first()
+    comment = await db.get(Comment, comment_id)
     if comment is None:
         raise HTTPException(status_code=404, detail="Comment not found")
 
@@ -200,32 +190,32 @@ async def delete_comment(
         raise HTTPException(status_code=403, detail="You can only delete your own comments")
 
     # Видаляємо коментар
-    db.delete(comment)
-    db.commit()
+    await db.delete(comment)
+    await db.commit()
     return {"message": "Comment deleted successfully"}
 
 # Роути для лайків
 @router.post("/posts/{post_id}/like")
 async def like_post(
     post_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     # Перевіряємо чи існує пост
-    post = db.query(Post).filter(Post.id == post_id).first()
+    post = await db.get(Post, post_id)
     if post is None:
         raise HTTPException(status_code=404, detail="Post not found")
 
     # Перевіряємо чи користувач вже лайкнув цей пост
-    existing_like = db.query(Like).filter(
+    existing_like = (await db.execute(select(Like).where(
         Like.post_id == post_id,
         Like.user_id == current_user.get("id")
-    ).first()
+    ))).scalars().first()
 
     if existing_like:
         # Якщо лайк вже існує, видаляємо його (тобто "знімаємо" лайк)
-        db.delete(existing_like)
-        db.commit()
+        await db.delete(existing_like)
+        await db.commit()
         return {"message": "Like removed successfully"}
     else:
         # Інакше додаємо новий лайк
@@ -234,27 +224,27 @@ async def like_post(
             user_id=current_user.get("id")
         )
         db.add(new_like)
-        db.commit()
+        await db.commit()
         return {"message": "Post liked successfully"}
 
 @router.get("/posts/{post_id}/likes")
-def get_post_likes(
+async def get_post_likes(
     post_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     # Перевіряємо чи існує пост
-    post = db.query(Post).filter(Post.id == post_id).first()
+    post = await db.get(Post, post_id)
     if post is None:
         raise HTTPException(status_code=404, detail="Post not found")
 
     # Рахуємо кількість лайків
-    likes_count = db.query(Like).filter(Like.post_id == post_id).count()
+    likes_count = await db.scalar(select(func.count()).where(Like.post_id == post_id))
     return {"likes_count": likes_count}
 
 @router.get("/posts/{post_id}/likes/check")
 async def check_post_like(
     post_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_optional_user)
 ):
     # Якщо користувач не авторизований, повертаємо що він не лайкнув
@@ -262,39 +252,39 @@ async def check_post_like(
         return {"liked": False}
 
     # Перевіряємо чи існує пост
-    post = db.query(Post).filter(Post.id == post_id).first()
+    post = await db.get(Post, post_id)
     if post is None:
         raise HTTPException(status_code=404, detail="Post not found")
 
     # Перевіряємо чи користувач лайкнув цей пост
-    like = db.query(Like).filter(
+    like = (await db.execute(select(Like).where(
         Like.post_id == post_id,
         Like.user_id == current_user.get("id")
-    ).first()
+    ))).scalars().first()
 
     return {"liked": like is not None}
 # Аналогічні роути для лайків питань і відповідей
 @router.post("/questions/{question_id}/like")
 async def like_question(
     question_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     # Перевіряємо чи існує питання
-    question = db.query(Question).filter(Question.id == question_id).first()
+    question = await db.get(Question, question_id)
     if question is None:
         raise HTTPException(status_code=404, detail="Question not found")
 
     # Перевіряємо чи користувач вже лайкнув це питання
-    existing_like = db.query(Like).filter(
+    existing_like = (await db.execute(select(Like).where(
         Like.question_id == question_id,
         Like.user_id == current_user.get("id")
-    ).first()
+    ))).scalars().first()
 
     if existing_like:
         # Якщо лайк вже існує, видаляємо його
-        db.delete(existing_like)
-        db.commit()
+        await db.delete(existing_like)
+        await db.commit()
         return {"message": "Like removed successfully"}
     else:
         # Інакше додаємо новий лайк
@@ -303,30 +293,30 @@ async def like_question(
             user_id=current_user.get("id")
         )
         db.add(new_like)
-        db.commit()
+        await db.commit()
         return {"message": "Question liked successfully"}
 
 @router.post("/answers/{answer_id}/like")
 async def like_answer(
     answer_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     # Перевіряємо чи існує відповідь
-    answer = db.query(Answer).filter(Answer.id == answer_id).first()
+    answer = await db.get(Answer, answer_id)
     if answer is None:
         raise HTTPException(status_code=404, detail="Answer not found")
 
     # Перевіряємо чи користувач вже лайкнув цю відповідь
-    existing_like = db.query(Like).filter(
+    existing_like = (await db.execute(select(Like).where(
         Like.answer_id == answer_id,
         Like.user_id == current_user.get("id")
-    ).first()
+    ))).scalars().first()
 
     if existing_like:
         # Якщо лайк вже існує, видаляємо його
-        db.delete(existing_like)
-        db.commit()
+        await db.delete(existing_like)
+        await db.commit()
         return {"message": "Like removed successfully"}
     else:
         # Інакше додаємо новий лайк
@@ -335,8 +325,8 @@ async def like_answer(
             user_id=current_user.get("id")
         )
         db.add(new_like)
-        db.commit()
+        await db.commit()
         # Оновлюємо лічильник лайків у відповіді
         answer.likes += 1
-        db.commit()
+        await db.commit()
         return {"message": "Answer liked successfully"}
\ No newline at end of file
@@ -0,0 +1,178 @@
+"""
+Cache of authenticated tokens for get_current_user.
+
+Decoding the JWT and looking the user up by email is repeated on every
+authenticated request, and pages such as the event view fire several of them at
+once. TokenCache keeps the decoded claims and a lightweight snapshot of the user
+per token for a short TTL (never past the token's own expiry), bounded in size
+with LRU eviction. Routes that change or delete a user invalidate the user's
+entries so the change is visible on the next request.
+"""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Set, Tuple
+from uuid import UUID
+
+from server.apps.authentication.models import Role, User
+from .config import settings
+
+
+@dataclass(frozen=True)
+class UserSnapshot:
+    """
+    Read-only copy of the fields routes need from the authenticated user.
+
+    Attributes:
+        id (UUID): The unique identifier for the user.
+        first_name (str): The user's first name.
+        last_name (str): The user's last name.
+        email (str): The user's email address.
+        bio (Optional[str]): A short biography for the user.
+        role (Role): The role of the user.
+    """
+    id: UUID
+    first_name: str
+    last_name: str
+    email: str
+    bio: Optional[str]
+    role: Role
+
+    @property
+    def is_admin(self) -> bool:
+        """Whether the user has the admin role."""
+        return self.role == Role.ADMIN
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserSnapshot":
+        """Copy the snapshot fields from a User row."""
+        return cls(
+            id=user.id,
+            first_name=user.first_name,
+            last_name=user.last_name,
+            email=user.email,
+            bio=user.bio,
+            role=user.role,
+        )
+
+
+class TokenCache:
+    """
+    Bounded TTL/LRU cache mapping access tokens to (claims, user snapshot).
+
+    Args:
+        ttl (float): Seconds an entry may be served before it is resolved again
+        max_entries (int): Maximum number of cached tokens
+    """
+
+    def __init__(self, ttl: float = 60, max_entries: int = 1024):
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        # token -> (expires_at, claims, snapshot), least recently used first
+        self._entries: "OrderedDict[str, Tuple[float, dict, UserSnapshot]]" = OrderedDict()
+        self._tokens_by_user: Dict[UUID, Set[str]] = {}
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, token: str) -> Optional[Tuple[dict, UserSnapshot]]:
+        """
+        Look up a token.
+
+        Args:
+            token: JWT access token
+
+        Returns:
+            Optional[tuple]: (claims, user snapshot), or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self._misses += 1
+                return None
+            expires_at, claims, snapshot = entry
+            if expires_at <= time.monotonic():
+                self._remove(token)
+                self._misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self._hits += 1
+            return claims, snapshot
+
+    def put(self, token: str, claims: dict, snapshot: UserSnapshot):
+        """
+        Cache the resolved claims and user for a token.
+
+        Args:
+            token: JWT access token
+            claims: Decoded token payload
+            snapshot: Snapshot of the token's user
+        """
+        if self._ttl <= 0 or self._max_entries <= 0:
+            return
+        ttl = self._ttl
+        if "exp" in claims:
+            ttl = min(ttl, float(claims["exp"]) - time.time())
+            if ttl <= 0:
+                return
+
+        with self._lock:
+            self._remove(token)
+            self._entries[token] = (time.monotonic() + ttl, claims, snapshot)
+            self._tokens_by_user.setdefault(snapshot.id, set()).add(token)
+            while len(self._entries) > self._max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: UUID):
+        """
+        Drop every cached token of a user, after the user was changed or deleted.
+
+        Args:
+            user_id: UUID of the user
+        """
+        with self._lock:
+            for token in list(self._tokens_by_user.get(user_id, ())):
+                self._remove(token)
+
+    def clear(self):
+        """Drop all entries and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._tokens_by_user.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def stats(self) -> dict:
+        """
+        Report cache usage.
+
+        Returns:
+            dict: Number of entries, hits, misses and hit rate (0.0 - 1.0)
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+            }
+
+    def _remove(self, token: str):
+        """Remove a token; the caller must hold the lock."""
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return
+        user_id = entry[2].id
+        tokens = self._tokens_by_user.get(user_id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[user_id]
+
+
+token_cache = TokenCache(
+    ttl=settings.AUTH_CACHE_TTL_SECONDS,
+    max_entries=settings.AUTH_CACHE_MAX_ENTRIES,
+)
@@ -2,6 +2,8 @@
 This module defines the application settings and configuration using Pydantic's BaseSettings.
 """
 
+import os
+
 from pydantic.v1 import BaseSettings
 
 
@@ -14,11 +16,67 @@ class Settings(BaseSettings):
         SECRET_KEY (str): The secret key for cryptographic operations.
         ALGORITHM (str): The algorithm used for token encoding.
         ACCESS_TOKEN_EXPIRE_MINUTES (int): The token expiration time in minutes.
+        VOTE_BUFFER_ENABLED (bool): Whether event votes are buffered and written in batches.
+        VOTE_BUFFER_FLUSH_MS (int): How often buffered votes are flushed, in milliseconds.
+        VOTE_BUFFER_MAX_PENDING (int): Number of buffered votes that triggers an early flush.
+        PAGE_CACHE_REVALIDATE (bool): Whether cached HTML pages are reloaded when the files
+            change; disable in production.
+        AUTH_CACHE_TTL_SECONDS (int): How long a resolved access token is cached; 0 disables
+            the cache.
+        AUTH_CACHE_MAX_ENTRIES (int): Maximum number of cached access tokens.
+        BCRYPT_ROUNDS (int): bcrypt cost factor for new password hashes.
+        PASSWORD_HASH_CONCURRENCY (int): Number of passwords hashed or verified at once;
+            further requests wait in line.
+        FACTORIAL_WORKERS (int): Worker processes used to compute large factorials.
+        FACTORIAL_MAX_COMPUTE_N (int): Largest n the API computes beyond the pre-computed
+            factorials.
+        FACTORIAL_CHECKPOINT_INTERVAL (int): For a new factorial store, keep only every k-th
+            factorial; the rest are multiplied up from the nearest checkpoint.
+        FACTORIAL_CACHE_SIZE (int): Number of recently materialized factorials kept in memory.
+        FACTORIAL_SYNC_SECONDS (float): How often the pre-computation daemon commits and
+            fsyncs the factorials it has appended.
+        SQLITE_BUSY_TIMEOUT_MS (int): How long a SQLite connection waits for a lock before
+            failing with "database is locked".
+        SQLITE_CACHE_SIZE_KIB (int): SQLite page cache per connection, in KiB.
+        SQLITE_MMAP_SIZE (int): Bytes of the SQLite database file read through mmap.
+        DB_POOL_SIZE (int): Database connections kept open in the pool.
+        DB_MAX_OVERFLOW (int): Extra connections opened under load beyond DB_POOL_SIZE.
+        DB_POOL_TIMEOUT (int): Seconds a request waits for a free connection.
+        EMAIL_OUTBOX_WORKERS (int): Email delivery threads, each keeping one SMTP connection.
+        EMAIL_OUTBOX_BATCH_SIZE (int): Outbox messages a delivery thread claims at once.
+        EMAIL_OUTBOX_POLL_SECONDS (float): How often idle delivery threads check the outbox.
+        EMAIL_MAX_ATTEMPTS (int): Delivery attempts before an email is marked as failed.
+        EMAIL_RETRY_BASE_SECONDS (float): Delay before retrying a failed email, doubled
+            for each further attempt.
     """
     DATABASE_URL: str = "sqlite:///./database.db"
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    VOTE_BUFFER_ENABLED: bool = False
+    VOTE_BUFFER_FLUSH_MS: int = 200
+    VOTE_BUFFER_MAX_PENDING: int = 500
+    PAGE_CACHE_REVALIDATE: bool = True
+    AUTH_CACHE_TTL_SECONDS: int = 60
+    AUTH_CACHE_MAX_ENTRIES: int = 1024
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_CONCURRENCY: int = max(1, (os.cpu_count() or 2) // 2)
+    FACTORIAL_WORKERS: int = os.cpu_count() or 1
+    FACTORIAL_MAX_COMPUTE_N: int = 100000
+    FACTORIAL_CHECKPOINT_INTERVAL: int = 1
+    FACTORIAL_CACHE_SIZE: int = 16
+    FACTORIAL_SYNC_SECONDS: float = 1.0
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE_KIB: int = 65536
+    SQLITE_MMAP_SIZE: int = 268435456
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30
+    EMAIL_OUTBOX_WORKERS: int = 2
+    EMAIL_OUTBOX_BATCH_SIZE: int = 50
+    EMAIL_OUTBOX_POLL_SECONDS: float = 5.0
+    EMAIL_MAX_ATTEMPTS: int = 5
+    EMAIL_RETRY_BASE_SECONDS: float = 30.0
 
     class Config:
         """
@@ -1,16 +1,136 @@
 """
 This module handles database configuration, session management, and utility functions
 for creating and dropping database tables.
+
+SQLite connections get a performance profile on connect: write-ahead logging, so
+readers no longer block on a writer and the other way round, synchronous=NORMAL
+(durable across application crashes, and only a WAL commit can be lost on power
+failure), a busy timeout so concurrent writers wait for each other instead of
+failing with "database is locked", a larger page cache, memory-mapped reads,
+in-memory temporary tables and enforced foreign keys.
+
+Request handlers use an AsyncSession from get_async_db, on an async engine for the
+same database (aiosqlite for SQLite, asyncpg for PostgreSQL), so a query that
+waits for a lock or the network suspends only its own request instead of the
+worker's event loop. Scheduled jobs and background threads keep the synchronous
+engine and SessionLocal.
 """
 
-from typing import Generator  # Standard library imports
+from typing import AsyncGenerator, Generator  # Standard library imports
+from sqlalchemy import event  # Third-party imports
+from sqlalchemy.engine import Engine, make_url  # Third-party imports
+from sqlalchemy.ext.asyncio import (AsyncEngine, AsyncSession,  # Third-party imports
+                                    async_sessionmaker, create_async_engine)
 from sqlmodel import SQLModel, create_engine  # Third-party imports
 from sqlalchemy.orm import sessionmaker, Session  # Third-party imports
 from server.core.config import settings  # First-party imports
 
-engine = create_engine(settings.DATABASE_URL, connect_args={"check_same_thread": False})
+
+def apply_sqlite_profile(sqlite_engine: Engine):
+    """
+    Run the SQLite performance pragmas on every new connection of an engine.
+
+    Args:
+        sqlite_engine (Engine): Engine for a SQLite database
+    """
+    pragmas = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}",
+        f"PRAGMA cache_size=-{int(settings.SQLITE_CACHE_SIZE_KIB)}",
+        f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA foreign_keys=ON",
+    )
+
+    @event.listens_for(sqlite_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, _connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+def _engine_options(url: str) -> dict:
+    """Connection pool and driver options shared by the sync and async engines."""
+    if not url.startswith("sqlite"):
+        return {"pool_size": settings.DB_POOL_SIZE,
+                "max_overflow": settings.DB_MAX_OVERFLOW,
+                "pool_timeout": settings.DB_POOL_TIMEOUT,
+                "pool_pre_ping": True}
+
+    options = {"connect_args": {"check_same_thread": False}}
+    # In-memory databases live in a single connection, so they keep SQLAlchemy's default pool
+    if ":memory:" not in url and "mode=memory" not in url:
+        options.update(pool_size=settings.DB_POOL_SIZE,
+                       max_overflow=settings.DB_MAX_OVERFLOW,
+                       pool_timeout=settings.DB_POOL_TIMEOUT)
+    return options
+
+
+def create_database_engine(url: str) -> Engine:
+    """
+    Create an engine with a sized connection pool and, for SQLite, the performance profile.
+
+    Args:
+        url (str): Database URL
+
+    Returns:
+        Engine: The configured engine
+    """
+    database_engine = create_engine(url, **_engine_options(url))
+    if url.startswith("sqlite"):
+        apply_sqlite_profile(database_engine)
+    return database_engine
+
+
+def async_database_url(url: str) -> str:
+    """
+    Switch a database URL to the asyncio driver of its backend.
+
+    Args:
+        url (str): Database URL, e.g. sqlite:///./database.db
+
+    Returns:
+        str: The URL with aiosqlite for SQLite or asyncpg for PostgreSQL; URLs that
+        already name an asyncio driver are returned unchanged
+    """
+    parsed = make_url(url)
+    async_drivers = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+    backend = parsed.get_backend_name()
+    if backend not in async_drivers or parsed.get_driver_name() in ("aiosqlite", "asyncpg",
+                                                                    "psycopg"):
+        return url
+    return parsed.set(drivername=f"{backend}+{async_drivers[backend]}").render_as_string(
+        hide_password=False)
+
+
+def create_async_database_engine(url: str) -> AsyncEngine:
+    """
+    Create an async engine with the same pool sizing and SQLite profile as the sync one.
+
+    Args:
+        url (str): Database URL; the backend's asyncio driver is used
+
+    Returns:
+        AsyncEngine: The configured engine
+    """
+    database_engine = create_async_engine(async_database_url(url), **_engine_options(url))
+    if url.startswith("sqlite"):
+        apply_sqlite_profile(database_engine.sync_engine)
+    return database_engine
+
+
+engine = create_database_engine(settings.DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_async_database_engine(settings.DATABASE_URL)
+# Objects stay loaded after commit: an expired attribute cannot be lazy loaded
+# outside of an await
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 
 def create_db_and_tables():
     """
@@ -20,6 +140,20 @@ def create_db_and_tables():
     SQLModel.metadata.create_all(bind=engine)
 
 
+def create_missing_schema():
+    """
+    Creates the tables and indexes declared on the models that an existing database lacks.
+
+    create_all() only adds missing tables; it skips tables that already exist, and
+    with them any index added to the model later.
+    """
+    with engine.begin() as connection:
+        SQLModel.metadata.create_all(bind=connection)
+        for table in SQLModel.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=connection, checkfirst=True)
+
+
 def drop_db_and_tables():
     """
     Drops all tables in the database.
@@ -39,3 +173,14 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Provides an async database session for dependency injection in request handlers.
+
+    Yields:
+        AsyncSession: An async database session.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
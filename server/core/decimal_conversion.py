@@ -0,0 +1,135 @@
+"""
+Subquadratic conversion between large integers and decimal strings.
+
+CPython's built-in int <-> str conversion is quadratic in the number of digits,
+which is why it is capped by sys.set_int_max_str_digits. These converters split
+the number in halves recursively instead:
+
+- int -> str rebuilds the integer as a decimal.Decimal from its binary halves;
+  libmpdec multiplies large operands with a number-theoretic transform, and
+  str() of a Decimal is linear.
+- str -> int parses the two halves of the string and joins them with a cached
+  power of ten, so the work is done by Karatsuba multiplications.
+
+Numbers are always split so the low part has a power-of-two size. The powers
+2**w and 10**k that join the parts are therefore cached only for power-of-two w
+and k: one entry per doubling, all of them reused by every larger conversion,
+so the caches hold less than the largest number converted so far.
+"""
+import decimal
+import threading
+from typing import Dict, Union
+
+# Below these sizes the built-in conversions are faster than splitting further
+_BIT_LIMIT = 128
+_DIGIT_LIMIT = 2048
+
+# Values this small are converted with the built-ins directly
+_BUILTIN_BITS = 10000
+_BUILTIN_DIGITS = 3000
+
+_CONTEXT = decimal.Context(
+    prec=decimal.MAX_PREC, Emax=decimal.MAX_EMAX, Emin=decimal.MIN_EMIN,
+    traps=[decimal.Inexact, decimal.Overflow],
+)
+
+# Powers reused across conversions, for power-of-two exponents only: 2**w as
+# Decimal and 10**k as int
+_power_cache_lock = threading.Lock()
+_decimal_powers_of_two: Dict[int, decimal.Decimal] = {}
+_powers_of_ten: Dict[int, int] = {}
+
+
+def _split_size(size: int) -> int:
+    """Size of the low part when splitting size bits or digits: the largest power of
+    two below it."""
+    return 1 << ((size - 1).bit_length() - 1)
+
+
+def _decimal_power_of_two(exponent: int) -> decimal.Decimal:
+    """Get 2**exponent, for a power-of-two exponent, as an exact Decimal from the cache."""
+    power = _decimal_powers_of_two.get(exponent)
+    if power is None:
+        if exponent <= _BIT_LIMIT:
+            power = decimal.Decimal(1 << exponent)
+        else:
+            half = _decimal_power_of_two(exponent >> 1)
+            power = _CONTEXT.multiply(half, half)
+        with _power_cache_lock:
+            _decimal_powers_of_two[exponent] = power
+    return power
+
+
+def _power_of_ten(exponent: int) -> int:
+    """Get 10**exponent, for a power-of-two exponent, from the cache."""
+    power = _powers_of_ten.get(exponent)
+    if power is None:
+        if exponent <= _DIGIT_LIMIT:
+            power = 10 ** exponent
+        else:
+            half = _power_of_ten(exponent >> 1)
+            power = half * half
+        with _power_cache_lock:
+            _powers_of_ten[exponent] = power
+    return power
+
+
+def int_to_decimal(value: int) -> str:
+    """
+    Convert an integer to its decimal representation.
+
+    Args:
+        value (int): Integer of any size
+
+    Returns:
+        str: Decimal digits, with a leading "-" for negative values
+    """
+    if value < 0:
+        return "-" + int_to_decimal(-value)
+    if value.bit_length() <= _BUILTIN_BITS:
+        return str(value)
+
+    def to_decimal(number: int, bits: int) -> decimal.Decimal:
+        if bits <= _BIT_LIMIT:
+            return decimal.Decimal(number)
+        low_bits = _split_size(bits)
+        high = number >> low_bits
+        low = number - (high << low_bits)
+        return _CONTEXT.add(
+            _CONTEXT.multiply(to_decimal(high, bits - low_bits),
+                              _decimal_power_of_two(low_bits)),
+            to_decimal(low, low_bits),
+        )
+
+    return str(to_decimal(value, value.bit_length()))
+
+
+def decimal_to_int(digits: Union[str, bytes]) -> int:
+    """
+    Parse a decimal representation into an integer.
+
+    Args:
+        digits: Decimal digits as str or ASCII bytes, optionally with a leading "-"
+
+    Returns:
+        int: The parsed value
+
+    Raises:
+        ValueError: If the input is not a decimal number
+    """
+    text = digits.decode("ascii") if isinstance(digits, (bytes, bytearray)) else digits
+    text = text.strip()
+    if text.startswith("-"):
+        return -decimal_to_int(text[1:])
+    if not text.isdigit() or not text.isascii():
+        raise ValueError("Invalid decimal number")
+    if len(text) <= _BUILTIN_DIGITS:
+        return int(text)
+
+    def parse(start: int, end: int) -> int:
+        if end - start <= _DIGIT_LIMIT:
+            return int(text[start:end])
+        middle = end - _split_size(end - start)
+        return parse(start, middle) * _power_of_ten(end - middle) + parse(middle, end)
+
+    return parse(0, len(text))
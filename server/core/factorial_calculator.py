@@ -1,175 +1,173 @@
-""" Factorial calculator module """
+"""
+Factorial pre-computation daemon.
 
-import os
+Extends the factorial store from its last committed value, forever or up to a
+given n. Work is pipelined across a process pool: the products between
+consecutive checkpoints are computed ahead in parallel, multiplied into the
+running value in order, and the running values are converted to decimal in
+parallel as well. Only the in-order multiplications and the appends happen in
+this process.
+
+Appended values are committed in batches (see FactorialStoreWriter.commit), so
+stopping the daemon at any point, even with SIGKILL or a power loss, leaves the
+store at its last commit, and the next run resumes from there. SIGINT and SIGTERM
+stop it after the current append with a final commit:
+
+    python -m server.core.factorial_calculator [--workers N] [--until N]
+"""
+import argparse
+import multiprocessing
 import signal
-import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Optional
+
+from server.core.config import settings
+from server.core.decimal_conversion import int_to_decimal
+from server.core.factorial_engine import product_range
+from server.core.factorial_store import FactorialStore, factorial_store
+
+# Checkpoint gaps and values smaller than these are not worth sending to a worker
+_INLINE_PRODUCT_SPAN = 1000
+_INLINE_CONVERSION_BITS = 20000
+
+# Seconds between progress reports
+REPORT_SECONDS = 5.0
+
+
+def _ignore_signals():
+    """Pool initializer: leave SIGINT and SIGTERM to the daemon, which stops the pool."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
 
-sys.set_int_max_str_digits(1000000)
 
-def signal_handler(sig, frame):
-    print("\nExiting gracefully...")
-    sys.exit(0)
+def _run(pool: ProcessPoolExecutor, inline: bool, function, *args) -> Future:
+    """Run function in the pool, or right away in this process if inline."""
+    if not inline:
+        return pool.submit(function, *args)
+    future = Future()
+    future.set_result(function(*args))
+    return future
 
-signal.signal(signal.SIGINT, signal_handler)
 
-def get_last_factorial():
-    """Get the last factorial value and its index using only file cursor operations"""
-    if not os.path.exists("server/core/factorial_result.py"):
-        # Create file with initial factorial
-        with open("server/core/factorial_result.py", "w", encoding='utf-8') as file:
-            file.write("pre_calc = [\n")
-            file.write("    1\n")
-            file.write("]\n")
+def get_last_factorial(store: FactorialStore = factorial_store):
+    """Get the last committed factorial and its index, creating the store if empty"""
+    if store.max_index() < 0:
+        with store.writer() as writer:
+            writer.append(b"1")
         return 0, 1
-    
-    # Open the file and find the last value using cursor operations
-    with open("server/core/factorial_result.py", "r", encoding='utf-8') as file:
-        # Go to the end of the file
-        file.seek(0, os.SEEK_END)
-        file_size = file.tell()
-        
-        if file_size <= 0:
-            return 0, 1
-        
-        # Move backwards to find the last number
-        pos = file_size - 1
-        line_start = 0
-        found_number = False
-        number_line = ""
-        
-        while pos >= 0 and not found_number:
-            file.seek(pos)
-            char = file.read(1)
-            
-            if char == '\n':
-                line_start = pos + 1
-                file.seek(line_start)
-                line = file.readline().strip()
-                
-                # Skip the closing bracket
-                if line == "]":
-                    pos -= 1
-                    continue
-                
-                # Try to parse the line as a number
-                try:
-                    # Remove trailing comma and spaces, if any
-                    clean_line = line.rstrip(",").strip()
-                    last_value = int(clean_line)
-                    found_number = True
-                    number_line = clean_line
-                    break
-                except ValueError:
-                    # If it's not a number, move to the previous line
-                    pos = line_start - 2
-            else:
-                pos -= 1
-        
-        if not found_number:
-            return 0, 1
-        
-        # Count how many numbers are in the file to determine the index
-        file.seek(0)
-        content = file.readlines(1024)  # Read first chunk to find array start
-        
-        # Check if file is empty or doesn't contain our array
-        if not content or "pre_calc = [" not in ''.join(content):
-            return 0, 1
-            
-        # Count the numbers in the file
-        file.seek(0)  # Start from beginning
-        number_count = 0
-        in_array = False
-        
-        # Read the file in chunks to count numbers
-        while True:
-            chunk = file.read(8192)
-            if not chunk:
-                break
-                
-            for i, char in enumerate(chunk):
-                # Start counting after we find the array start
-                if not in_array and "pre_calc = [" in chunk[:i+1]:
-                    in_array = True
-                    continue
-                    
-                if in_array and char == ',':
-                    number_count += 1
-                    
-                # Stop if we reach the end of the array
-                if in_array and char == ']':
-                    # Add 1 for the last number (which doesn't have a comma after it)
-                    return number_count, int(number_line)
-        
-    # If we couldn't determine the count, but have a value, return a safe default
-    if found_number:
-        return 0, int(number_line)
-    return 0, 1
-
-def append_next_factorial(last_idx, last_value):
-    """Calculate and append the next factorial to the file"""
-    next_idx = last_idx + 1
-    next_value = last_value * next_idx
-    
-    with open("server/core/factorial_result.py", "r+", encoding='utf-8') as file:
-        # Navigate to right before the closing bracket
-        file.seek(0, os.SEEK_END)
-        pos = file.tell() - 1
-        
-        # Find the closing bracket by moving backward
-        while pos >= 0:
-            file.seek(pos)
-            char = file.read(1)
-            if char == ']':
-                # Found the closing bracket
-                file.seek(pos)
-                break
-            pos -= 1
-        
-        # If we couldn't find the closing bracket, the file may be corrupt
-        if pos < 0:
-            # Create file from scratch with the value we have
-            file.seek(0)
-            file.truncate(0)
-            file.write("pre_calc = [\n")
-            file.write(f"    {last_value}\n")
-            file.write("]\n")
-            return last_idx, last_value
-        
-        # Insert a comma after the last number if needed
-        file.seek(pos - 1)
-        char_before_bracket = file.read(1)
-        
-        file.seek(pos)
-        file.truncate()  # Remove the closing bracket
-        
-        if char_before_bracket not in [',', '\n']:
-            file.write(",\n")
-        elif char_before_bracket == ',':
-            file.write("\n")
-            
-        # Append the new factorial and close the list
-        file.write(f"    {next_value}\n")
-        file.write("]\n")
-        
-        return next_idx, next_value
-
-# Get the last calculated factorial
-last_idx, last_value = get_last_factorial()
-print(f"Starting with factorial {last_idx}")
-
-try:
-    current_idx = last_idx
-    current_value = last_value
-    
-    while True:
-        # Calculate and append the next factorial
-        current_idx, current_value = append_next_factorial(current_idx, current_value)
-        
-        # Show progress
-        print(f"Factorial of {current_idx} calculated")
-        
-except Exception as e:
-    print(f"Error occurred: {e}")
-    import traceback
-    traceback.print_exc()
+
+    last_idx = store.max_index()
+    return last_idx, store.get(last_idx)
+
+
+def precompute(store: FactorialStore = factorial_store, workers: Optional[int] = None,
+               until: Optional[int] = None, sync_seconds: Optional[float] = None,
+               stop: Optional[threading.Event] = None) -> int:
+    """
+    Append factorials to the store until n reaches until or stop is set.
+
+    Args:
+        store (FactorialStore): Store to extend; its interval decides which n are kept
+        workers (int): Worker processes; defaults to FACTORIAL_WORKERS
+        until (int): Largest n to store, None to run until stopped
+        sync_seconds (float): Seconds between commits; defaults to FACTORIAL_SYNC_SECONDS
+        stop (threading.Event): Set to finish the current append, commit and return
+
+    Returns:
+        int: The largest committed n
+    """
+    workers = max(1, workers or settings.FACTORIAL_WORKERS)
+    sync_seconds = settings.FACTORIAL_SYNC_SECONDS if sync_seconds is None else sync_seconds
+    stop = stop or threading.Event()
+
+    last_idx, value = get_last_factorial(store)
+    print(f"Resuming after {last_idx}! with {workers} workers")
+
+    # Ctrl+C and service managers signal the whole process group; the workers ignore
+    # that so an in-flight conversion can finish before the final commit. Workers live
+    # as long as the daemon: the powers int_to_decimal caches in them are only kept for
+    # power-of-two sizes, so they stay smaller than the latest value and every
+    # conversion reuses those of the previous ones.
+    pool = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_ignore_signals,
+    )
+    # (n, future of the product of (previous checkpoint, n]) and (n, future of the digits of n!)
+    products = deque()
+    conversions = deque()
+    scheduled_idx = last_idx
+    started = last_commit = last_report = time.monotonic()
+    appended = appended_digits = 0
+
+    try:
+        with store.writer(autocommit=False) as writer:
+            interval = writer.interval
+            inline_product = interval < _INLINE_PRODUCT_SPAN
+            while not stop.is_set():
+                # Keep a batch of products and conversions queued for every worker
+                while len(products) < workers and (until is None
+                                                   or scheduled_idx + interval <= until):
+                    products.append((scheduled_idx + interval, _run(
+                        pool, inline_product, product_range,
+                        scheduled_idx, scheduled_idx + interval,
+                    )))
+                    scheduled_idx += interval
+                while len(conversions) < workers and products:
+                    idx, product = products.popleft()
+                    value *= product.result()
+                    conversions.append((idx, _run(
+                        pool, value.bit_length() < _INLINE_CONVERSION_BITS,
+                        int_to_decimal, value,
+                    )))
+                if not conversions:
+                    break  # Reached until
+
+                idx, digits = conversions.popleft()
+                digits = digits.result().encode("ascii")
+                writer.append(digits)
+                appended += 1
+                appended_digits += len(digits)
+
+                now = time.monotonic()
+                if now - last_commit >= sync_seconds:
+                    writer.commit(sync=True)
+                    last_commit = now
+                if now - last_report >= REPORT_SECONDS:
+                    elapsed = now - started
+                    print(f"Stored {idx}! ({len(digits)} digits): "
+                          f"{appended / elapsed:.1f} factorials/s, "
+                          f"{appended_digits / elapsed / 1e6:.2f} MB/s")
+                    last_report = now
+
+            writer.commit(sync=True)
+            last_idx = writer.next_index - interval
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+    elapsed = time.monotonic() - started
+    print(f"Stored {appended} factorials up to {last_idx}! in {elapsed:.1f}s")
+    return last_idx
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-compute factorials into the store.")
+    parser.add_argument("--workers", type=int, default=settings.FACTORIAL_WORKERS,
+                        help="worker processes")
+    parser.add_argument("--until", type=int, default=None,
+                        help="stop after this n instead of running until interrupted")
+    arguments = parser.parse_args()
+
+    stop_event = threading.Event()
+
+    def signal_handler(sig, frame):
+        print("\nExiting gracefully...")
+        stop_event.set()
+
+    signal.signal(signal.SIGINT, signal_handler)
+    signal.signal(signal.SIGTERM, signal_handler)
+
+    precompute(workers=arguments.workers, until=arguments.until, stop=stop_event)
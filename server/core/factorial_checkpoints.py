@@ -0,0 +1,126 @@
+"""
+On-demand factorials from a sparse checkpoint store.
+
+A store with checkpoint interval k keeps only (i * k)!. Any other n! is
+materialized as c! * (c + 1) * ... * n, where c is the nearest stored checkpoint
+below n and the second factor is computed as a balanced product tree. Recently
+materialized values are kept in a small LRU cache.
+
+An existing dense store can be rewritten as a sparse one with:
+
+    python -m server.core.factorial_checkpoints compact INTERVAL DEST_DIR
+"""
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from server.core.config import settings
+from server.core.factorial_engine import compute_factorial, parallel_product_range
+from server.core.factorial_store import FactorialStore, factorial_store
+
+
+class FactorialCache:
+    """
+    Thread-safe LRU cache of materialized factorials.
+
+    Args:
+        max_entries (int): Maximum number of cached values
+    """
+
+    def __init__(self, max_entries: int = 16):
+        self._max_entries = max_entries
+        self._values: "OrderedDict[int, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, n: int) -> Optional[int]:
+        """Return the cached n!, or None."""
+        with self._lock:
+            value = self._values.get(n)
+            if value is not None:
+                self._values.move_to_end(n)
+            return value
+
+    def put(self, n: int, value: int):
+        """Cache n!, evicting the least recently used value if full."""
+        if self._max_entries <= 0:
+            return
+        with self._lock:
+            self._values[n] = value
+            self._values.move_to_end(n)
+            while len(self._values) > self._max_entries:
+                self._values.popitem(last=False)
+
+    def clear(self):
+        """Drop all cached values."""
+        with self._lock:
+            self._values.clear()
+
+
+factorial_cache = FactorialCache(settings.FACTORIAL_CACHE_SIZE)
+
+
+def materialize_factorial(n: int, store: FactorialStore = factorial_store,
+                          cache: FactorialCache = factorial_cache) -> int:
+    """
+    Get n! from the store, multiplying up from the nearest checkpoint if needed.
+
+    Args:
+        n (int): Non-negative integer
+        store (FactorialStore): Checkpoint store
+        cache (FactorialCache): Cache of recently materialized values
+
+    Returns:
+        int: n!
+    """
+    value = cache.get(n)
+    if value is not None:
+        return value
+
+    checkpoint = min(n // store.interval * store.interval, store.max_index())
+    if checkpoint < 0:
+        value = compute_factorial(n)
+    else:
+        base = store.get(checkpoint)
+        value = base if checkpoint == n else base * parallel_product_range(checkpoint, n)
+
+    cache.put(n, value)
+    return value
+
+
+def compact_store(source: FactorialStore, destination: FactorialStore) -> int:
+    """
+    Copy every checkpoint of the destination's interval from a dense store.
+
+    The digits are copied as they are, without parsing them.
+
+    Args:
+        source (FactorialStore): Store to read from; its interval must divide the
+            destination's
+        destination (FactorialStore): New store, created with the target interval
+
+    Returns:
+        int: Number of checkpoints written
+    """
+    written = 0
+    with destination.writer() as writer:
+        if writer.interval % source.interval:
+            raise ValueError("Destination interval must be a multiple of the source interval")
+        while writer.next_index <= source.max_index():
+            writer.append(source.get_digits(writer.next_index))
+            written += 1
+    return written
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "compact":
+        target_directory = sys.argv[3]
+        compacted = compact_store(factorial_store, FactorialStore(
+            os.path.join(target_directory, os.path.basename(factorial_store.data_path)),
+            os.path.join(target_directory, os.path.basename(factorial_store.index_path)),
+            interval=int(sys.argv[2]),
+        ))
+        print(f"Wrote {compacted} checkpoints to {target_directory}")
+    else:
+        print(__doc__)
@@ -0,0 +1,413 @@
+"""
+Binary indexed storage for pre-computed factorials.
+
+Values are kept as ASCII decimal digits, one after another, in a data file. A
+companion index file starts with a fixed header followed by one fixed-width
+record per factorial: record n holds the byte offset and length of n! in the
+data file, so any value is found with two seeks instead of scanning a file.
+
+A store can be sparse: with a checkpoint interval k it keeps only the factorials
+of multiples of k, and record i holds (i * k)!. Other values are multiplied up
+from the nearest checkpoint (see server.core.factorial_checkpoints), which cuts
+disk usage roughly by a factor of k.
+
+Index file layout (little-endian):
+    header  32 bytes: magic b"FACTIDX\\0", format version (u32), record size (u32),
+            checkpoint interval (u32, 0 in older files meaning 1), 4 reserved bytes,
+            committed record count (u64, version 2 and later)
+    records 16 bytes each: data offset (u64), length in bytes (u64)
+
+Values are appended data first, index record second, and only then counted in
+the header, so a reader never sees a record pointing at bytes that were not
+written. The header count is the single source of the store's size: readers
+re-read it only when a stat() of the index file shows a change, which makes
+max_index() O(1) without scanning or even opening the files. Writers can batch
+several appends into one commit, optionally fsync'ed, and anything past the
+last commit is discarded when the store is next opened for writing, so a crash
+at any point leaves the store at its last commit. The API process reads through
+MappedFactorialStore, which maps both files once and hands out memoryview slices
+of the digits, so serving a value never copies or parses it as a whole.
+"""
+import mmap
+import os
+import struct
+import threading
+from typing import Iterator, Optional, Tuple
+
+from server.core.config import settings
+from server.core.decimal_conversion import decimal_to_int
+
+DATA_PATH = "server/core/factorial_data.bin"
+INDEX_PATH = "server/core/factorial_index.bin"
+
+# Size of the slices streamed from a mapped value
+CHUNK_SIZE = 64 * 1024
+
+MAGIC = b"FACTIDX\0"
+FORMAT_VERSION = 2
+HEADER = struct.Struct("<8sIII4xQ")
+COUNT = struct.Struct("<Q")
+COUNT_OFFSET = HEADER.size - COUNT.size
+RECORD = struct.Struct("<QQ")
+
+
+class FactorialStoreError(Exception):
+    """Raised when the store files are missing or malformed."""
+
+
+class FactorialStore:
+    """
+    Read and append access to a factorial data file and its offset index.
+
+    Args:
+        data_path (str): Path of the data file with the decimal digits
+        index_path (str): Path of the index file
+        interval (int): Checkpoint interval for a new store; an existing store keeps
+            the interval recorded in its header
+    """
+
+    def __init__(self, data_path: str = DATA_PATH, index_path: str = INDEX_PATH,
+                 interval: int = 1):
+        self.data_path = data_path
+        self.index_path = index_path
+        self._interval = max(1, interval)
+        # stat() signature of the index file when the header was last read, and its count
+        self._signature = None
+        self._count = 0
+
+    @property
+    def interval(self) -> int:
+        """Checkpoint interval k: only multiples of k are stored."""
+        self.record_count()
+        return self._interval
+
+    def exists(self) -> bool:
+        """Whether the store has been created."""
+        return os.path.exists(self.index_path) and os.path.exists(self.data_path)
+
+    def create(self):
+        """Create empty store files if they do not exist yet."""
+        if not os.path.exists(self.index_path):
+            with open(self.index_path, "wb") as index_file:
+                index_file.write(
+                    HEADER.pack(MAGIC, FORMAT_VERSION, RECORD.size, self._interval, 0)
+                )
+        if not os.path.exists(self.data_path):
+            with open(self.data_path, "wb"):
+                pass
+
+    def record_count(self) -> int:
+        """
+        Get the number of committed factorials.
+
+        The header is only re-read when the index file's stat() changes.
+
+        Returns:
+            int: Number of records counted in the header, 0 if the store is missing
+        """
+        try:
+            stat = os.stat(self.index_path)
+        except OSError:
+            self._signature = None
+            return 0
+        signature = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        if signature != self._signature:
+            with open(self.index_path, "rb") as index_file:
+                self._interval, count = self._check_header(index_file.read(HEADER.size))
+            records = max(stat.st_size - HEADER.size, 0) // RECORD.size
+            self._count = records if count is None else min(count, records)
+            # A record written but not yet counted will be counted without changing the
+            # file size, possibly within the same mtime tick, so keep checking until then
+            self._signature = signature if self._count == records else None
+        return self._count
+
+    def max_index(self) -> int:
+        """
+        Get the largest n whose factorial is stored.
+
+        Returns:
+            int: The maximum stored index, or -1 if the store is empty or missing
+        """
+        count = self.record_count()
+        return (count - 1) * self.interval if count else -1
+
+    def locate(self, n: int) -> Optional[tuple]:
+        """
+        Look up where n! is stored.
+
+        Args:
+            n (int): Factorial index
+
+        Returns:
+            tuple: (offset, length) of the digits in the data file, or None if not stored
+        """
+        if n < 0 or n > self.max_index() or n % self.interval:
+            return None
+        with open(self.index_path, "rb") as index_file:
+            index_file.seek(HEADER.size + n // self.interval * RECORD.size)
+            return RECORD.unpack(index_file.read(RECORD.size))
+
+    def get_digits(self, n: int) -> Optional[bytes]:
+        """
+        Read the decimal digits of n!.
+
+        Args:
+            n (int): Factorial index
+
+        Returns:
+            bytes: ASCII decimal digits, or None if n! is not stored
+        """
+        location = self.locate(n)
+        if location is None:
+            return None
+        offset, length = location
+        with open(self.data_path, "rb") as data_file:
+            data_file.seek(offset)
+            return data_file.read(length)
+
+    def get(self, n: int) -> Optional[int]:
+        """
+        Read n! as an integer.
+
+        Args:
+            n (int): Factorial index
+
+        Returns:
+            int: The factorial value, or None if n! is not stored
+        """
+        digits = self.get_digits(n)
+        return decimal_to_int(digits) if digits is not None else None
+
+    def writer(self, autocommit: bool = True) -> "FactorialStoreWriter":
+        """
+        Open the store for appending, creating it if needed.
+
+        Args:
+            autocommit (bool): Commit after every append; otherwise appended values
+                are only visible to readers after FactorialStoreWriter.commit()
+
+        Returns:
+            FactorialStoreWriter: The writer, to be used as a context manager
+        """
+        self.create()
+        return FactorialStoreWriter(self, autocommit)
+
+    def _check_header(self, header: bytes) -> Tuple[int, Optional[int]]:
+        """
+        Validate the index file header.
+
+        Returns:
+            tuple: (checkpoint interval, committed record count or None for version 1
+            files, whose size is determined by the file length)
+        """
+        if len(header) != HEADER.size:
+            raise FactorialStoreError(f"{self.index_path}: truncated header")
+        magic, version, record_size, interval, count = HEADER.unpack(header)
+        if magic != MAGIC or record_size != RECORD.size:
+            raise FactorialStoreError(f"{self.index_path}: not a factorial index")
+        if version not in (1, FORMAT_VERSION):
+            raise FactorialStoreError(f"{self.index_path}: unsupported version {version}")
+        return max(1, interval), count if version >= 2 else None
+
+
+class FactorialStoreWriter:
+    """
+    Appends factorials to a store, keeping both files open between appends.
+
+    Use as a context manager; values must be appended in order of n, and only
+    for multiples of the store's checkpoint interval. Without autocommit, values
+    appended since the last commit() are dropped when the writer is closed.
+
+    Args:
+        store (FactorialStore): The store to append to
+        autocommit (bool): Commit after every append
+    """
+
+    def __init__(self, store: FactorialStore, autocommit: bool = True):
+        self.store = store
+        self.autocommit = autocommit
+        self._data_file = open(store.data_path, "ab")  # pylint: disable=consider-using-with
+        self._index_file = open(store.index_path, "r+b")  # pylint: disable=consider-using-with
+        self.interval, count = store._check_header(  # pylint: disable=protected-access
+            self._index_file.read(HEADER.size)
+        )
+
+        # Drop records that were never counted, e.g. after an interrupted append
+        index_size = self._index_file.seek(0, os.SEEK_END)
+        records = (index_size - HEADER.size) // RECORD.size
+        self._count = records if count is None else min(count, records)
+        committed_size = HEADER.size + self._count * RECORD.size
+        if committed_size != index_size:
+            self._index_file.truncate(committed_size)
+        # ...and the digits of those records
+        data_size = 0
+        if self._count:
+            self._index_file.seek(committed_size - RECORD.size)
+            offset, length = RECORD.unpack(self._index_file.read(RECORD.size))
+            data_size = offset + length
+        if os.fstat(self._data_file.fileno()).st_size > data_size:
+            self._data_file.truncate(data_size)
+        self._index_file.seek(0)
+        self._index_file.write(HEADER.pack(
+            MAGIC, FORMAT_VERSION, RECORD.size, self.interval, self._count
+        ))
+        self._index_file.flush()
+        self._index_file.seek(committed_size)
+        # The n whose factorial is appended next
+        self.next_index = self._count * self.interval
+        self._appended = self._count
+
+    def append(self, digits: bytes) -> int:
+        """
+        Append the digits of the next factorial.
+
+        Args:
+            digits: ASCII decimal digits of next_index!
+
+        Returns:
+            int: The index that was written
+        """
+        offset = self._data_file.seek(0, os.SEEK_END)
+        self._data_file.write(digits)
+        self._data_file.flush()
+        self._index_file.write(RECORD.pack(offset, len(digits)))
+        self._appended += 1
+        self.next_index += self.interval
+        if self.autocommit:
+            self.commit()
+        return self.next_index - self.interval
+
+    def commit(self, sync: bool = False) -> int:
+        """
+        Make the values appended so far visible to readers.
+
+        The record count in the header is published with a single in-place write,
+        after the digits and index records it covers.
+
+        Args:
+            sync (bool): fsync the data before publishing the count and the header
+                after it, so the commit survives a power loss
+
+        Returns:
+            int: Number of committed records
+        """
+        self._data_file.flush()
+        self._index_file.flush()
+        if self._appended == self._count:
+            return self._count
+        if sync:
+            os.fsync(self._data_file.fileno())
+            os.fsync(self._index_file.fileno())
+        os.pwrite(self._index_file.fileno(), COUNT.pack(self._appended), COUNT_OFFSET)
+        if sync:
+            os.fsync(self._index_file.fileno())
+        self._count = self._appended
+        return self._count
+
+    def close(self):
+        """Close both files."""
+        self._data_file.close()
+        self._index_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class MappedFactorialStore:
+    """
+    Read-only access to a store through memory maps of its files.
+
+    The maps are refreshed only when a value past the mapped range is requested,
+    to pick up factorials appended by the calculator since.
+
+    Args:
+        store (FactorialStore): The store to map
+    """
+
+    def __init__(self, store: FactorialStore):
+        self.store = store
+        self._lock = threading.Lock()
+        # (index map, data map, number of records, interval), replaced as a whole on refresh
+        self._maps = (None, None, 0, 1)
+
+    def open(self) -> int:
+        """
+        Map the store files, if they exist.
+
+        Returns:
+            int: The maximum mapped index, or -1 if the store is empty or missing
+        """
+        self.refresh()
+        return self.max_index()
+
+    def close(self):
+        """Drop the maps; they are released once no response is reading them."""
+        with self._lock:
+            self._maps = (None, None, 0, 1)
+
+    def refresh(self):
+        """Remap the files if the store has grown since they were mapped."""
+        with self._lock:
+            committed = self.store.record_count()
+            if committed <= self._maps[2]:
+                return
+            try:
+                # The index is mapped first: data is always written before its record
+                with open(self.store.index_path, "rb") as index_file:
+                    index_map = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+                with open(self.store.data_path, "rb") as data_file:
+                    data_map = (mmap.mmap(data_file.fileno(), 0, access=mmap.ACCESS_READ)
+                                if os.fstat(data_file.fileno()).st_size else None)
+            except (OSError, ValueError):
+                return
+            count = min(committed, (len(index_map) - HEADER.size) // RECORD.size)
+            self._maps = (index_map, data_map, count if data_map is not None else 0,
+                          self.store.interval)
+
+    def max_index(self) -> int:
+        """Get the largest mapped n, or -1 if nothing is mapped."""
+        _, _, count, interval = self._maps
+        return (count - 1) * interval if count else -1
+
+    def digits_view(self, n: int) -> Optional[memoryview]:
+        """
+        Get the digits of n! without copying them.
+
+        Args:
+            n (int): Factorial index
+
+        Returns:
+            memoryview: ASCII decimal digits backed by the data map, or None if not stored
+        """
+        if n > self.max_index():
+            self.refresh()
+        index_map, data_map, count, interval = self._maps
+        if n < 0 or n % interval or n // interval >= count:
+            return None
+        record = n // interval
+        offset, length = RECORD.unpack_from(index_map, HEADER.size + record * RECORD.size)
+        return memoryview(data_map)[offset:offset + length]
+
+
+def iter_digit_chunks(digits: memoryview, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Split mapped digits into chunks for streaming.
+
+    Only the chunk being sent is copied out of the map, so memory use stays the
+    same whatever the size of the value.
+
+    Args:
+        digits: Value returned by MappedFactorialStore.digits_view
+        chunk_size (int): Maximum bytes per chunk
+
+    Returns:
+        Iterator of byte chunks covering the digits in order
+    """
+    return (bytes(digits[start:start + chunk_size])
+            for start in range(0, len(digits), chunk_size))
+
+factorial_store = FactorialStore(interval=settings.FACTORIAL_CHECKPOINT_INTERVAL)
+mapped_factorial_store = MappedFactorialStore(factorial_store)
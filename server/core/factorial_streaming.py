@@ -0,0 +1,114 @@
+"""
+Plain-text streaming responses for factorial digits.
+
+Serves the decimal digits of a factorial as text/plain in chunks. The full length
+is known up front from the store, so responses carry a Content-Length, support
+single-range Range requests for fetching slices of the digits, and are gzipped on
+the fly when the client accepts it.
+"""
+import re
+import zlib
+from typing import Iterator, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response, StreamingResponse
+
+from server.core.factorial_store import iter_digit_chunks
+from server.core.page_cache import parse_accept_encoding
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+# Values shorter than this are not worth compressing
+GZIP_MIN_LENGTH = 1024
+
+
+class RangeNotSatisfiable(Exception):
+    """Raised when a Range header lies outside the digits."""
+
+
+def parse_range(header: Optional[str], length: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a Range header for a body of the given length.
+
+    Only a single byte range is supported; other forms are ignored and the full
+    body is sent, as RFC 9110 allows.
+
+    Args:
+        header: Raw Range header value, if any
+        length: Length of the full body
+
+    Returns:
+        tuple: (start, end) with an exclusive end, or None to send the full body
+
+    Raises:
+        RangeNotSatisfiable: If the range starts past the end of the body
+    """
+    if not header:
+        return None
+    match = _RANGE_RE.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        return None
+
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last) + 1, length) if last else length
+        if last and int(last) < start:
+            return None
+    else:
+        # Suffix range: the last N bytes
+        start, end = max(length - int(last), 0), length
+    if start >= length:
+        raise RangeNotSatisfiable()
+    return start, end
+
+
+def _gzip_chunks(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    """Compress a stream of chunks into a single gzip member."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def stream_digits_response(request: Request, digits: memoryview) -> Response:
+    """
+    Build a streaming text/plain response for factorial digits.
+
+    Args:
+        request: Incoming request, for the Range and Accept-Encoding headers
+        digits: Decimal digits, e.g. from MappedFactorialStore.digits_view
+
+    Returns:
+        Response: 200 with the digits, 206 with a slice of them, or 416
+    """
+    length = len(digits)
+    headers = {"Accept-Ranges": "bytes", "Vary": "Accept-Encoding"}
+
+    try:
+        byte_range = parse_range(request.headers.get("range"), length)
+    except RangeNotSatisfiable:
+        headers["Content-Range"] = f"bytes */{length}"
+        return Response(status_code=416, headers=headers)
+
+    if byte_range is not None:
+        # Ranges address the identity representation, so they are never gzipped
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end - 1}/{length}"
+        headers["Content-Length"] = str(end - start)
+        return StreamingResponse(
+            iter_digit_chunks(digits[start:end]), status_code=206,
+            media_type="text/plain", headers=headers,
+        )
+
+    accepted = parse_accept_encoding(request.headers.get("accept-encoding", ""))
+    if accepted.get("gzip", 0) > 0 and length >= GZIP_MIN_LENGTH:
+        headers["Content-Encoding"] = "gzip"
+        return StreamingResponse(
+            _gzip_chunks(iter_digit_chunks(digits)), media_type="text/plain", headers=headers,
+        )
+
+    headers["Content-Length"] = str(length)
+    return StreamingResponse(iter_digit_chunks(digits), media_type="text/plain", headers=headers)
@@ -10,7 +10,7 @@ from server.core.database import get_db
 from server.apps.authentication.models import User, Role
 from server.apps.events.models import Event, EventCategory, EventComment, \
       EventStatus, EventVote, EventRegistration
-from server.core.security import hash_password
+from server.core.security import hash_passwords
 
 def fill_db():
     """Fill the database with meaningful initial data for users and events"""
@@ -20,12 +20,16 @@ def fill_db():
     # Create users with different roles
     print("Creating users...")
 
+    # Hash the seed passwords up front, in parallel on the password worker pool; every
+    # seed user shares the same password, so its hash is computed once and reused
+    admin_password_hash, user_password_hash = hash_passwords(["admin1234", "1234"])
+
     # Admin user
     admin_user = User(
         first_name="Admin",
         last_name="User",
         email="admin@tribuna.ua",
-        hashed_password=hash_password('admin1234'),
+        hashed_password=admin_password_hash,
         bio="Site administrator with full access to all features.",
         role=Role.ADMIN
     )
@@ -39,42 +43,42 @@ def fill_db():
             first_name="Nazar",
             last_name="Pasichnyk",
             email="nazar@gmail.com",
-            hashed_password=hash_password('1234'),
+            hashed_password=user_password_hash,
             bio="UCU student majoring in Computer Science. Interested in mobile app development and AI."
         ),
         User(
             first_name="Roman",
             last_name="Prokhorov",
             email="roman@gmail.com",
-            hashed_password=hash_password('1234'),
+            hashed_password=user_password_hash,
             bio="Graphic designer and web developer with 5 years of experience. Creates beautiful UIs."
         ),
         User(
             first_name="Козак",
             last_name="Васильович",
             email="kozak@gmail.com",
-            hashed_password=hash_password('1234'),
+            hashed_password=user_password_hash,
             bio="Ukrainian history enthusiast. Collects old photographs of Ukrainian cities."
         ),
         User(
             first_name="Maria",
             last_name="Shevchenko",
             email="maria@gmail.com",
-            hashed_password=hash_password('1234'),
+            hashed_password=user_password_hash,
             bio="Environmental activist working on urban greening projects in Lviv."
         ),
         User(
             first_name="Oleh",
             last_name="Kravchenko",
             email="oleh@gmail.com",
-            hashed_password=hash_password('1234'),
+            hashed_password=user_password_hash,
             bio="IT specialist with a passion for cybersecurity. Conducts workshops on digital safety."
         ),
         User(
             first_name="Sophia",
             last_name="Kovalenko",
             email="sophia@gmail.com",
-            hashed_password=hash_password('1234'),
+            hashed_password=user_password_hash,
             bio="Medical student and volunteer at local hospital."
         )
     ]
@@ -95,7 +99,7 @@ def fill_db():
             first_name=random.choice(first_names),
             last_name=random.choice(last_names),
             email=f"user{i}@example.com",
-            hashed_password=hash_password('1234'),
+            hashed_password=user_password_hash,
             bio="Community member since 2025. Interested in local events and networking."
         )
         bulk_users.append(bulk_user)
@@ -0,0 +1,51 @@
+"""
+Convert the legacy factorial_result.py list into the binary indexed store.
+
+The source is read one line at a time and digits are copied without parsing them
+into integers, so files of any size can be converted. Values that are already in
+the store are skipped, so an interrupted migration can simply be run again:
+
+    python -m server.core.migrate_factorials [path/to/factorial_result.py]
+"""
+import sys
+
+from server.core.factorial_store import FactorialStore, factorial_store
+
+LEGACY_PATH = "server/core/factorial_result.py"
+
+
+def migrate_legacy_file(source_path: str = LEGACY_PATH,
+                        store: FactorialStore = factorial_store) -> int:
+    """
+    Append the factorials from a legacy Python-literal file to the store.
+
+    Args:
+        source_path (str): Path of the legacy "pre_calc = [...]" file
+        store (FactorialStore): Destination store
+
+    Returns:
+        int: Number of factorials appended
+    """
+    appended = 0
+    with open(source_path, "rb") as source, store.writer() as writer:
+        index = 0
+        for line in source:
+            digits = line.strip().rstrip(b",").strip()
+            if not digits.isdigit():
+                continue  # "pre_calc = [", "]" and blank lines
+
+            # Sparse stores only keep the checkpoints
+            if index == writer.next_index:
+                writer.append(digits)
+                appended += 1
+            index += 1
+
+            if index % 1000 == 0:
+                print(f"Read {index} factorials")
+    return appended
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else LEGACY_PATH
+    count = migrate_legacy_file(path)
+    print(f"Appended {count} factorials; store now holds 0!..{factorial_store.max_index()}!")
@@ -0,0 +1,183 @@
+"""
+In-memory cache for the static HTML pages served by the page routes.
+
+Each page is read from src/pages once and kept as pre-encoded bytes together with
+pre-compressed gzip and brotli variants and strong ETags. Requests are answered from memory, including 304 responses for
+matching If-None-Match headers. Files are revalidated by mtime at most once per
+PAGE_CACHE_REVALIDATE_INTERVAL seconds, or never when PAGE_CACHE_REVALIDATE is off
+(production mode).
+"""
+import gzip
+import hashlib
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import brotli
+from fastapi import Request
+from fastapi.responses import HTMLResponse, Response
+
+from server.core.config import settings
+
+PAGES_DIR = Path(__file__).parent.parent.parent / "src/pages"
+PAGE_CACHE_REVALIDATE_INTERVAL = 1.0
+
+
+class CachedPage:
+    """
+    A page held in memory with its compressed variants.
+
+    Attributes:
+        mtime_ns (Optional[int]): Modification time of the file, or None if it is missing
+        variants (dict): Content-Encoding ("identity", "gzip", "br") -> (body, ETag)
+        checked_at (float): Monotonic time of the last revalidation
+    """
+
+    def __init__(self, body: Optional[bytes], mtime_ns: Optional[int]):
+        self.mtime_ns = mtime_ns
+        self.checked_at = time.monotonic()
+        self.variants: Dict[str, tuple] = {}
+        if body is None:
+            return
+
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        self.variants["identity"] = (body, f'"{digest}"')
+        self.variants["gzip"] = (gzip.compress(body, compresslevel=9, mtime=0),
+                                 f'"{digest}-gz"')
+        self.variants["br"] = (brotli.compress(body, quality=11), f'"{digest}-br"')
+
+    @property
+    def exists(self) -> bool:
+        """Whether the page file was found."""
+        return bool(self.variants)
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """
+    Parse an Accept-Encoding header into encoding -> quality.
+
+    Args:
+        header: Raw header value
+
+    Returns:
+        dict: Lower-cased encodings mapped to their q-values
+    """
+    encodings = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        encodings[name.strip().lower()] = quality
+    return encodings
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Check an If-None-Match header against an ETag."""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return etag in candidates or f"W/{etag}" in candidates
+
+
+class PageCache:
+    """
+    Cache of HTML pages from a directory, keyed by file name.
+
+    Args:
+        pages_dir (Path): Directory containing the pages
+        revalidate (bool): Whether to pick up changes to the files on disk
+    """
+
+    def __init__(self, pages_dir: Path, revalidate: bool = True):
+        self._pages_dir = pages_dir
+        self._revalidate = revalidate
+        self._pages: Dict[str, CachedPage] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> CachedPage:
+        """
+        Return the cached page, loading or reloading it from disk when needed.
+
+        Args:
+            name: File name inside the pages directory
+
+        Returns:
+            CachedPage: The cached page (possibly a cached miss)
+        """
+        page = self._pages.get(name)
+        if page is not None and not self._is_stale(page):
+            return page
+
+        with self._lock:
+            page = self._pages.get(name)
+            if page is not None and not self._is_stale(page):
+                return page
+
+            path = self._pages_dir / name
+            try:
+                mtime_ns = path.stat().st_mtime_ns
+            except FileNotFoundError:
+                mtime_ns = None
+
+            if page is not None and page.mtime_ns == mtime_ns:
+                page.checked_at = time.monotonic()
+                return page
+
+            body = path.read_bytes() if mtime_ns is not None else None
+            page = CachedPage(body, mtime_ns)
+            self._pages[name] = page
+            return page
+
+    def _is_stale(self, page: CachedPage) -> bool:
+        """Whether the page is due for an mtime check."""
+        if not self._revalidate:
+            return False
+        return time.monotonic() - page.checked_at >= PAGE_CACHE_REVALIDATE_INTERVAL
+
+    def response(self, request: Request, name: str, not_found_html: str) -> Response:
+        """
+        Build the response for a page, negotiating encoding and honouring If-None-Match.
+
+        Args:
+            request: Incoming request
+            name: File name inside the pages directory
+            not_found_html: HTML returned with a 404 if the page does not exist
+
+        Returns:
+            Response: 200 with the page, 304 if the client copy is current, or 404
+        """
+        page = self.get(name)
+        if not page.exists:
+            return HTMLResponse(content=not_found_html, status_code=404)
+
+        accepted = parse_accept_encoding(request.headers.get("accept-encoding", ""))
+        encoding = "identity"
+        for candidate in ("br", "gzip"):
+            if candidate in page.variants and accepted.get(candidate, 0) > 0:
+                encoding = candidate
+                break
+        body, etag = page.variants[encoding]
+
+        headers = {
+            "ETag": etag,
+            "Vary": "Accept-Encoding",
+            "Cache-Control": "no-cache",
+        }
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return HTMLResponse(content=body, headers=headers)
+
+
+page_cache = PageCache(PAGES_DIR, revalidate=settings.PAGE_CACHE_REVALIDATE)
@@ -4,17 +4,21 @@ Core security module providing authentication and authorization functionality.
 This module handles password hashing, JWT token creation/verification,
 and user authentication for the application.
 """
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import List, Optional
 
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from server.core.database import get_db
+from server.core.database import get_async_db
 from server.apps.authentication.models import User
+from .auth_cache import UserSnapshot, token_cache
 from .config import settings
 
 
@@ -23,7 +27,15 @@ SECRET_KEY = settings.SECRET_KEY  # Change this to a secure random key
 ALGORITHM = settings.ALGORITHM
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 # Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
+
+# bcrypt releases the GIL, so a small thread pool keeps hashing off the event loop
+# while capping how many cores a burst of logins can occupy; extra requests queue
+password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_CONCURRENCY, thread_name_prefix="password-hash"
+)
 
 
 def hash_password(password: str) -> str:
@@ -53,6 +65,50 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+async def hash_password_async(password: str) -> str:
+    """
+    Hash a password on the password worker pool without blocking the event loop.
+    
+    Args:
+        password: Plain text password to hash
+        
+    Returns:
+        Securely hashed password
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password on the password worker pool without blocking the event loop.
+    
+    Args:
+        plain_password: Plain text password to check
+        hashed_password: Hashed password to compare against
+        
+    Returns:
+        True if password matches, False otherwise
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        password_executor, verify_password, plain_password, hashed_password
+    )
+
+
+def hash_passwords(passwords: List[str]) -> List[str]:
+    """
+    Hash several passwords in parallel on the password worker pool.
+    
+    Args:
+        passwords: Plain text passwords to hash
+        
+    Returns:
+        Hashes in the same order as the passwords
+    """
+    return list(password_executor.map(hash_password, passwords))
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Create a new JWT access token.
@@ -94,20 +150,28 @@ def decode_access_token(token: str) -> dict:
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def get_current_user(token: str = Depends(oauth2_scheme),
+                           db: AsyncSession = Depends(get_async_db)) -> UserSnapshot:
     """
     Get the current authenticated user from a JWT token.
+
+    Resolved tokens are cached (see server.core.auth_cache), so repeated requests
+    with the same token skip decoding and the user lookup.
     
     Args:
         token: JWT token extracted from Authorization header
         db: Database session
         
     Returns:
-        User object if authentication is successful
+        Read-only snapshot of the user if authentication is successful
         
     Raises:
         HTTPException: If token is invalid or user not found
     """
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached[1]
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email: str = payload.get("sub")
@@ -116,7 +180,10 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     except JWTError as exc:
         raise HTTPException(status_code=401, detail="Invalid authentication credentials") from exc
 
-    user = db.query(User).filter(User.email == email).first()
+    user = (await db.execute(select(User).where(User.email == email))).scalars().first()
     if user is None:
         raise HTTPException(status_code=401, detail="User not found")
-    return user
+
+    snapshot = UserSnapshot.from_user(user)
+    token_cache.put(token, payload, snapshot)
+    return snapshot
@@ -5,24 +5,36 @@ Main module for the FastAPI application.
 # Standard library imports
 import atexit
 import logging
-from pathlib import Path
+from itertools import chain
 
 # Third-party imports
 from apscheduler.schedulers.background import BackgroundScheduler
 import apscheduler.events
-from fastapi import FastAPI, APIRouter, HTTPException
+from fastapi import FastAPI, APIRouter, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import inspect
 
-from server.apps.authentication.email.send_email import send_event_reminder_emails
+from server.apps.authentication.email.reminders import send_event_reminder_emails
 from server.apps.authentication.routes import router as auth_router
 from server.apps.events.routes import router as events_router, configure_app_with_schedulers
+from server.apps.events.search import ensure_event_search_index
 from server.apps.forum.routes import router as forum_router
-from server.core.database import create_db_and_tables, drop_db_and_tables, engine
+from server.core.auth_cache import token_cache
+from server.core.database import (create_db_and_tables, create_missing_schema,
+                                  drop_db_and_tables, engine)
 from server.core.fill_database import fill_db
-from server.core.get_factorial import get_factorial, get_max_factorial_idx
+from server.core.factorial_store import iter_digit_chunks, mapped_factorial_store
+from server.core.factorial_streaming import stream_digits_response
+from server.core.decimal_conversion import int_to_decimal
+from server.core.factorial_engine import shutdown_engine
+from server.core.get_factorial import (get_factorial, get_max_computable_idx,
+                                       get_max_factorial_idx)
+from server.core.page_cache import page_cache
+
+logger = logging.getLogger(__name__)
 
 
 def lifespan(app_instance: FastAPI):
@@ -52,8 +64,23 @@ def lifespan(app_instance: FastAPI):
         print("Database recreated successfully.")
         fill_db()  # Fill the database with initial data
 
+    # Add tables and indexes introduced since the database was created
+    create_missing_schema()
+
+    # Make sure the full-text search index exists and is populated
+    ensure_event_search_index(engine)
+
+    # Map the pre-computed factorials once for the lifetime of the process
+    mapped_factorial_store.open()
+
     yield  # This marks the end of the startup phase and the beginning of the shutdown phase
     # Shutdown logic (if needed)
+    auth_cache_stats = token_cache.stats()
+    logger.info("Auth token cache: %d hits, %d misses, hit rate %.1f%%",
+                auth_cache_stats["hits"], auth_cache_stats["misses"],
+                auth_cache_stats["hit_rate"] * 100)
+    mapped_factorial_store.close()
+    shutdown_engine()
 
 
 logging.basicConfig()
@@ -80,38 +107,67 @@ app = configure_app_with_schedulers(app)
 
 
 @app.get("/", response_class=HTMLResponse)
-def home_page():
+def home_page(request: Request):
     """
     Serves the home page HTML content.
     """
-    # Path to the registration HTML file
-    html_file_path = Path(__file__).parent.parent / "src/pages/home-page.html"
+    # Serve the home page from the in-memory page cache
+    return page_cache.response(request, "home-page.html", "<h1>Home page not found</h1>")
 
-    # Read the HTML file content
-    if html_file_path.exists():
-        html_content = html_file_path.read_text(encoding="utf-8")
-        return HTMLResponse(content=html_content)
-    return HTMLResponse(content="<h1>Home page not found</h1>", status_code=404)
 
-
-@app.get("/api/factorial/{n}")
-async def factorial_endpoint(n: int):
+def get_factorial_digits(n: int) -> memoryview:
     """
-    API endpoint to calculate factorial of a given number.
-    Uses pre-calculated factorials for efficiency.
+    Get the decimal digits of n! for the factorial endpoints.
+
+    Stored values come straight from the memory-mapped store; larger values up
+    to FACTORIAL_MAX_COMPUTE_N are calculated.
+
+    Raises:
+        HTTPException: If n is out of range or the value cannot be read
     """
     if n < 0:
         raise HTTPException(status_code=400, detail="Factorial is not defined for negative numbers")
     
-    max_idx = get_max_factorial_idx()
-    if n > max_idx + 1:
-        raise HTTPException(status_code=400, detail=f"Maximum available factorial is {max_idx + 1}")
+    max_available = get_max_computable_idx()
+    if n > max_available:
+        raise HTTPException(status_code=400, detail=f"Maximum available factorial is {max_available}")
     
+    digits = mapped_factorial_store.digits_view(n)
+    if digits is not None:
+        return digits
+
     result = get_factorial(n)
     if result is None:
         raise HTTPException(status_code=500, detail="Failed to calculate factorial")
-        
-    return {"result": str(result)}
+    return memoryview(int_to_decimal(result).encode("ascii"))
+
+
+@app.get("/api/factorial/{n}")
+async def factorial_endpoint(n: int):
+    """
+    API endpoint to calculate factorial of a given number.
+    Uses pre-calculated factorials for efficiency.
+    """
+    # Computing values that are not stored is CPU-bound, so keep it off the event loop
+    digits = await run_in_threadpool(get_factorial_digits, n)
+
+    # The digits are streamed inside the JSON body without building a full copy
+    prefix, suffix = b'{"result": "', b'"}'
+    return StreamingResponse(
+        chain([prefix], iter_digit_chunks(digits), [suffix]),
+        media_type="application/json",
+        headers={"Content-Length": str(len(prefix) + len(digits) + len(suffix))},
+    )
+
+
+@app.get("/api/factorial/{n}/stream")
+async def factorial_stream_endpoint(n: int, request: Request):
+    """
+    API endpoint streaming the digits of n! as plain text.
+    Supports Range requests for slices of the digits and gzip transfer.
+    """
+    digits = await run_in_threadpool(get_factorial_digits, n)
+    return stream_digits_response(request, digits)
 
 
 @app.get("/api/max_factorial")
@@ -120,7 +176,7 @@ async def max_factorial_endpoint():
     API endpoint to get the maximum available pre-calculated factorial.
     """
     max_idx = get_max_factorial_idx()
-    return {"max_factorial": max_idx}
+    return {"max_factorial": max_idx, "max_computable": get_max_computable_idx()}
 
 
 @app.on_event("startup")
@@ -121,14 +121,7 @@
                     throw new Error('Failed to load comments');
                 }
             })
-            .then(data => {
-                commentsContainer.innerHTML = '';
-                renderComments(data.comments);
-                
-                updateCommentCount(data.comments.length);
-                
-                setupCommentFormListeners();
-            })
+            .then(data => showEventComments(data.comments))
             .catch(error => {
                 console.error('Error loading comments:', error);
                 commentsContainer.innerHTML = '<div class="error-message">Failed to load comments</div>';
@@ -141,6 +134,18 @@
     }
 }
 
+  function showEventComments(comments) {
+    const commentsContainer = document.getElementById('comments-container');
+    if (!commentsContainer) return;
+
+    commentsContainer.innerHTML = '';
+    renderComments(comments);
+
+    updateCommentCount(comments.length);
+
+    setupCommentFormListeners();
+  }
+
   function renderComments(comments) {
     const commentsContainer = document.getElementById('comments-container');
     
@@ -153,7 +158,10 @@
     
     const sortedComments = sortCommentsByDate(comments, 'desc');
     
-    getUserId().then(currentUserId => {
+    const knownUserId = document.body.getAttribute('data-user-id');
+    const currentUserIdPromise = knownUserId ? Promise.resolve(knownUserId) : getUserId().catch(() => null);
+
+    currentUserIdPromise.then(currentUserId => {
       for (const comment of sortedComments) {
         createCommentElement(comment, currentUserId).then(commentElement => {
           commentsContainer.appendChild(commentElement);
@@ -651,8 +659,6 @@ function updateCommentOrder(sortedComments) {
   }
 
   document.addEventListener('DOMContentLoaded', function() {
-    loadEventComments();
-    
     setupDateRefreshing();
   });
 
@@ -753,6 +759,7 @@ function updateCommentOrder(sortedComments) {
 
   export {
     loadEventComments,
+    showEventComments,
     createComment,
     updateComment,
     deleteComment,
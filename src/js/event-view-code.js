@@ -1,63 +1,78 @@
 import {formatEventDates} from './utils/post-format-utils.js';
 import {adjustUserEventsLink} from './user-events-link.js';
-import {getAuthToken} from './utils/auth-utils.js';
-import {loadEventComments} from './event-comments.js'
+import {getAuthToken, provideUserData} from './utils/auth-utils.js';
+import {loadEventComments, showEventComments} from './event-comments.js'
 import { createToast} from './utils/toast-utils.js';
 
+// Started before DOMContentLoaded so the header can take the profile from it
+const viewStatePromise = fetchEventViewState();
+provideUserData(viewStatePromise.then(state => state && state.viewer));
+
 document.addEventListener('DOMContentLoaded', function() {
   formatEventDates();
   setupEventListeners();
   adjustUserEventsLink();
-  checkRegistrationStatus();
-  checkVoteStatus();
+  applyEventViewState();
 });
 
-async function checkRegistrationStatus() {
+async function fetchEventViewState() {
   const eventId = getEventIdFromUrl();
-  if (!eventId) return;
-  
+  if (!eventId) return null;
+
   const token = getAuthToken();
-  if (!token) return;
-  
+  const headers = token ? {'Authorization': `Bearer ${token}`} : {};
+
   try {
-    const response = await fetch(`/events/register/${eventId}/status`, {
+    const response = await fetch(`/events/${eventId}/view_state`, {
       method: 'GET',
-      headers: {
-        'Authorization': `Bearer ${token}`
-      }
+      headers: headers
     });
-    
+
     if (response.ok) {
-      const data = await response.json();
-      updateRegistrationUI(data.is_registered);
+      return await response.json();
     }
   } catch (error) {
-    console.error('Error checking registration status:', error);
+    console.error('Error loading event state:', error);
   }
+  return null;
 }
 
-async function checkVoteStatus() {
-  const eventId = getEventIdFromUrl();
-  if (!eventId) return;
-  
-  const token = getAuthToken();
-  if (!token) return;
-  
-  try {
-    const response = await fetch(`/events/vote/${eventId}/status`, {
-      method: 'GET',
-      headers: {
-        'Authorization': `Bearer ${token}`
-      }
-    });
-    
-    if (response.ok) {
-      const data = await response.json();
-      updateVoteUI(data.vote_count, data.has_voted);
-    }
-  } catch (error) {
-    console.error('Error checking vote status:', error);
+async function applyEventViewState() {
+  const state = await viewStatePromise;
+  if (!state) {
+    loadEventComments();
+    return;
   }
+
+  if (state.viewer) {
+    document.body.setAttribute('data-user-id', state.viewer.id);
+    updateVoteUI(state.vote.vote_count, state.vote.has_voted);
+  }
+  if (state.registration) {
+    updateRegistrationUI(state.registration.is_registered);
+  }
+
+  // The first page is enough unless some comments or replies were left out of it
+  if (isCompleteCommentPage(state.comments)) {
+    showEventComments(flattenCommentThreads(state.comments.comments));
+  } else {
+    loadEventComments();
+  }
+}
+
+// Placeholders of deleted comments are left out, their replies are kept,
+// as on the flat comments endpoint
+function flattenCommentThreads(threads) {
+  return threads.flatMap(thread => [
+    ...(thread.is_deleted ? [] : [thread]),
+    ...flattenCommentThreads(thread.replies)
+  ]);
+}
+
+function isCompleteCommentPage(page) {
+  const hasMissingReplies = thread =>
+    thread.has_more_replies || thread.replies.some(hasMissingReplies);
+  return !page.next_cursor && !page.comments.some(hasMissingReplies);
 }
 
 function updateRegistrationUI(isRegistered) {
@@ -7,6 +7,7 @@ document.addEventListener('DOMContentLoaded', function() {
     const easterEgg = document.querySelector('.easter-egg');
     
     let maxFactorial = -1;
+    let maxAvailable = -1;
 
     // Fetch maximum available factorial on page load
     async function fetchMaxFactorial() {
@@ -14,7 +15,9 @@ document.addEventListener('DOMContentLoaded', function() {
         const response = await fetch('/api/max_factorial');
         const data = await response.json();
         maxFactorial = data.max_factorial;
-        factorialInput.setAttribute('max', maxFactorial + 1);
+        // Values past the pre-calculated ones are computed on demand up to max_computable
+        maxAvailable = data.max_computable ?? maxFactorial + 1;
+        factorialInput.setAttribute('max', maxAvailable);
       } catch (error) {
         console.error('Error fetching maximum factorial:', error);
       }
@@ -60,8 +63,8 @@ document.addEventListener('DOMContentLoaded', function() {
         return;
       }
 
-      if (maxFactorial >= 0 && number > maxFactorial + 1) {
-        factorialError.textContent = `Maximum available factorial is ${maxFactorial + 1}`;
+      if (maxAvailable >= 0 && number > maxAvailable) {
+        factorialError.textContent = `Maximum available factorial is ${maxAvailable}`;
         return;
       }
 
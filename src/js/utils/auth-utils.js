@@ -161,7 +161,22 @@ export function setupServerReconnection() {
   }, 5000);
 }
 
+// Profile already being loaded by the page, e.g. as part of an aggregate request
+let providedUserData = null;
+
+export function provideUserData(userDataPromise) {
+  providedUserData = userDataPromise;
+}
+
 export async function getUserData() {
+  if (providedUserData) {
+    const userData = await providedUserData.catch(() => null);
+    providedUserData = null;
+    if (userData) {
+      return userData;
+    }
+  }
+
   try {
     const response = await fetchWithAuth('/auth/get_user_data');
     
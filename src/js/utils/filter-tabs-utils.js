@@ -287,12 +287,15 @@ export function createEmptyState(message = 'No content available') {
  * @param {Object} params - Additional parameters (e.g., user_id, category, searchTerm)
  */
 export function fetchFilteredEvents(filterType, postsContainer, params = {}) {
-  postsContainer.innerHTML = createLoadingIndicator(params.searchTerm ? 'Searching events...' : 'Loading events...');
-  
   const isUserEvents = params.isUserEvents || false;
   const userId = params.userId || null;
   const category = params.category || null;
   const searchTerm = params.searchTerm || null;
+  const cursor = params.cursor || null;
+  
+  if (!cursor) {
+    postsContainer.innerHTML = createLoadingIndicator(searchTerm ? 'Searching events...' : 'Loading events...');
+  }
   
   let endpoint = isUserEvents && userId ? `/events/user_events_api/${userId}` : '/events/api';
   
@@ -323,6 +326,10 @@ export function fetchFilteredEvents(filterType, postsContainer, params = {}) {
     queryParams.append('search', searchTerm);
   }
   
+  if (cursor) {
+    queryParams.append('cursor', cursor);
+  }
+  
   endpoint += `?${queryParams.toString()}`;
   
   fetch(endpoint, {
@@ -338,7 +345,14 @@ export function fetchFilteredEvents(filterType, postsContainer, params = {}) {
     })
     .then(data => {
       if (data && data.events) {
-        updateEventsDisplay(data.events, postsContainer, searchTerm);
+        const loadMore = data.next_cursor
+          ? () => fetchFilteredEvents(filterType, postsContainer, {...params, cursor: data.next_cursor})
+          : null;
+        if (cursor) {
+          appendEventsDisplay(data.events, postsContainer, loadMore);
+        } else {
+          updateEventsDisplay(data.events, postsContainer, searchTerm, loadMore);
+        }
       } else {
         console.error('Invalid data format received:', data);
         postsContainer.innerHTML = createErrorState('Failed to parse events data. Please try again later.');
@@ -355,15 +369,17 @@ export function fetchFilteredEvents(filterType, postsContainer, params = {}) {
  * @param {Array} events - The events to display
  * @param {HTMLElement} postsContainer - Container element for the posts
  * @param {string} searchTerm - Optional search term used for displaying search results info
+ * @param {Function} loadMore - Optional callback fetching the next page of events
  */
-export function updateEventsDisplay(events, postsContainer, searchTerm = null) {
+export function updateEventsDisplay(events, postsContainer, searchTerm = null, loadMore = null) {
   let containerHTML = '';
   
   if (searchTerm) {
     const resultCount = events.length;
+    const countLabel = loadMore ? `${resultCount}+` : `${resultCount}`;
     containerHTML += `
       <div class="search-results-info">
-        <p>Found ${resultCount} result${resultCount !== 1 ? 's' : ''} for "${searchTerm}"</p>
+        <p>Found ${countLabel} result${resultCount !== 1 ? 's' : ''} for "${searchTerm}"</p>
         <button class="clear-search-btn" onclick="document.querySelector('#search-input').value = ''; 
                 document.querySelector('#search-input').dispatchEvent(new Event('search'));">
           Clear Search
@@ -378,6 +394,56 @@ export function updateEventsDisplay(events, postsContainer, searchTerm = null) {
     return;
   }
   
+  containerHTML += renderEventCards(events);
+  postsContainer.innerHTML = containerHTML;
+  
+  renderLoadMoreButton(postsContainer, loadMore);
+  formatEventDates();
+}
+
+/**
+ * Appends the next page of events below the ones already displayed
+ * @param {Array} events - The events to append
+ * @param {HTMLElement} postsContainer - Container element for the posts
+ * @param {Function} loadMore - Optional callback fetching the following page of events
+ */
+export function appendEventsDisplay(events, postsContainer, loadMore = null) {
+  postsContainer.insertAdjacentHTML('beforeend', renderEventCards(events));
+  
+  renderLoadMoreButton(postsContainer, loadMore);
+  formatEventDates();
+}
+
+/**
+ * Replaces the "load more" button at the end of the container
+ * @param {HTMLElement} postsContainer - Container element for the posts
+ * @param {Function} loadMore - Callback fetching the next page, or null when there is none
+ */
+function renderLoadMoreButton(postsContainer, loadMore) {
+  const existingButton = postsContainer.querySelector('.btn-load-more');
+  if (existingButton) {
+    existingButton.remove();
+  }
+  
+  if (!loadMore) return;
+  
+  const button = document.createElement('button');
+  button.className = 'btn btn-load-more';
+  button.textContent = 'Load more events';
+  button.addEventListener('click', () => {
+    button.disabled = true;
+    button.textContent = 'Loading...';
+    loadMore();
+  });
+  postsContainer.appendChild(button);
+}
+
+/**
+ * Builds the HTML for a list of event cards
+ * @param {Array} events - The events to render
+ * @returns {string} HTML for the event cards
+ */
+function renderEventCards(events) {
   let eventsHTML = '';
   events.forEach(event => {
     const formattedDate = event.date_scheduled 
@@ -433,10 +499,7 @@ export function updateEventsDisplay(events, postsContainer, searchTerm = null) {
     `;
   });
   
-  containerHTML += eventsHTML;
-  postsContainer.innerHTML = containerHTML;
-  
-  formatEventDates();
+  return eventsHTML;
 }
 
 /**
@@ -0,0 +1,147 @@
+"""
+Shared fixtures for the test suite.
+
+The settings are read when server.core.config is imported, so the test database
+and configuration are put in the environment before any server module is loaded.
+Every test gets freshly created tables in a scratch SQLite database.
+"""
+import asyncio
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone
+from typing import List
+from uuid import uuid4
+
+_DATA_DIR = tempfile.mkdtemp(prefix="tribuna-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_DATA_DIR, 'test.db')}"
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ["VOTE_BUFFER_ENABLED"] = "false"
+os.environ["BCRYPT_ROUNDS"] = "4"
+
+# pylint: disable=wrong-import-position,redefined-outer-name
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import Connection
+from sqlmodel import SQLModel
+
+from server.apps.authentication.models import User
+from server.apps.authentication.routes import router as auth_router
+from server.apps.events.models import Event
+from server.apps.events.routes import router as events_router
+from server.core.auth_cache import token_cache
+from server.core.database import SessionLocal, async_engine, engine
+from server.core.security import create_access_token
+
+
+@pytest.fixture
+def database():
+    """Empty tables in the test database, dropped again after the test."""
+    SQLModel.metadata.create_all(bind=engine)
+    token_cache.clear()
+    yield engine
+    asyncio.run(async_engine.dispose())
+    engine.dispose()
+    SQLModel.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def app(database):
+    """An app serving the authentication and events routes on the test database."""
+    test_app = FastAPI()
+    test_app.include_router(auth_router, prefix="/auth")
+    test_app.include_router(events_router, prefix="/events")
+    return test_app
+
+
+@pytest.fixture
+def client(app):
+    """HTTP client for the test app."""
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+class QueryCounter:
+    """Counts the SQL statements sent to the database by request handlers."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *_args):
+        self.count += 1
+
+
+@pytest.fixture
+def query_counter(database):
+    """A QueryCounter attached to the async engine for the duration of a test."""
+    counter = QueryCounter()
+    event.listen(async_engine.sync_engine, "before_cursor_execute", counter)
+    yield counter
+    event.remove(async_engine.sync_engine, "before_cursor_execute", counter)
+
+
+def create_user(first_name: str = "Test", email: str = None) -> tuple:
+    """
+    Add a user to the test database.
+
+    Returns:
+        tuple: (user id, authorization headers for requests as that user)
+    """
+    email = email or f"{uuid4().hex}@example.com"
+    with SessionLocal() as db:
+        user = User(first_name=first_name, last_name="User", email=email,
+                    hashed_password="not-a-hash")
+        db.add(user)
+        db.commit()
+        user_id = user.id
+    token = create_access_token({"sub": email})
+    return user_id, {"Authorization": f"Bearer {token}"}
+
+
+def create_events(author_ids, count: int) -> list:
+    """
+    Add events to the test database, spread over the given authors, newest last.
+
+    Returns:
+        list: Ids of the created events
+    """
+    now = datetime.now(timezone.utc)
+    with SessionLocal() as db:
+        events = [Event(title=f"Event {number}", description="Test event",
+                        author_id=author_ids[number % len(author_ids)],
+                        date_created=now + timedelta(seconds=number),
+                        date_scheduled=now + timedelta(days=1))
+                  for number in range(count)]
+        db.add_all(events)
+        db.commit()
+        return [created.id for created in events]
+
+
+def explain_query_plan(connection: Connection, statement) -> List[str]:
+    """
+    Get SQLite's query plan for a statement, as shown by EXPLAIN QUERY PLAN.
+
+    The statement is executed once first, so its parameters reach the driver in
+    exactly the form a real query uses; pass only SELECT statements.
+
+    Args:
+        connection (Connection): Connection to a SQLite database
+        statement: SELECT statement to explain
+
+    Returns:
+        List[str]: One line per plan step, e.g. "SEARCH event USING INDEX ix_... (author_id=?)"
+    """
+    executed = []
+
+    def capture(_conn, _cursor, sql, parameters, _context, _executemany):
+        executed.append((sql, parameters))
+
+    event.listen(connection, "before_cursor_execute", capture)
+    try:
+        connection.execute(statement).all()
+    finally:
+        event.remove(connection, "before_cursor_execute", capture)
+    sql, parameters = executed[-1]
+    return [row[-1] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}",
+                                                          parameters)]
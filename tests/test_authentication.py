@@ -0,0 +1,83 @@
+"""
+Tests for account management routes and the token cache they invalidate.
+"""
+from sqlalchemy import func, insert, literal, select
+
+from conftest import create_user
+from server.apps.authentication.models import User
+from server.apps.forum.models import Answer, Comment, Like, Post, Question, Suggestion
+from server.core.auth_cache import token_cache
+from server.core.database import SessionLocal
+
+
+def _add(db, model, user_id, **values):
+    """Insert a forum row by user_id (forum models type it as int) and return its id."""
+    statement = insert(model).values(user_id=literal(user_id, User.id.type), **values)
+    return db.execute(statement).inserted_primary_key[0]
+
+
+def test_delete_account_removes_forum_activity(client):
+    user_id, headers = create_user("Leaving")
+    other_id, _ = create_user("Staying")
+    with SessionLocal() as db:
+        post_id = _add(db, Post, user_id, title="Post", content="Text")
+        question_id = _add(db, Question, user_id, title="Question", content="Text")
+        other_question_id = _add(db, Question, other_id, title="Other", content="Text")
+        answer_id = _add(db, Answer, other_id, content="Answer", question_id=question_id)
+        kept_answer_id = _add(db, Answer, other_id, content="Answer",
+                              question_id=other_question_id, likes=1)
+        _add(db, Comment, other_id, content="Reply", post_id=post_id)
+        _add(db, Suggestion, user_id, content="Idea", question_id=other_question_id)
+        _add(db, Like, other_id, post_id=post_id)
+        _add(db, Like, other_id, answer_id=answer_id)
+        _add(db, Like, user_id, answer_id=kept_answer_id)
+        db.commit()
+
+    response = client.delete("/auth/delete_account", headers=headers)
+
+    assert response.status_code == 200
+    with SessionLocal() as db:
+        assert db.get(User, user_id) is None
+        for model in (Post, Comment, Suggestion, Like):
+            assert db.scalar(select(func.count()).select_from(model)) == 0  # pylint: disable=not-callable
+        assert db.scalars(select(Question.id)).all() == [other_question_id]
+        assert db.scalars(select(Answer.likes)).all() == [0]
+
+
+def _user_data(client, headers):
+    return client.get("/auth/get_user_data", headers=headers)
+
+
+def test_settings_change_is_seen_by_the_next_request(client):
+    email = "settings@example.com"
+    user_id, headers = create_user("Before", email=email)
+    assert _user_data(client, headers).json()["first_name"] == "Before"
+    assert token_cache.stats()["misses"] == 1
+
+    response = client.post("/auth/settings", headers=headers, json={
+        "first_name": "After", "last_name": "User", "email": email, "bio": "Hello"})
+
+    assert response.status_code == 200
+    data = _user_data(client, headers).json()
+    assert (data["id"], data["first_name"], data["bio"]) == (str(user_id), "After", "Hello")
+
+
+def test_email_change_invalidates_the_old_token(client):
+    _, headers = create_user("Moving", email="old@example.com")
+    assert _user_data(client, headers).status_code == 200
+
+    response = client.post("/auth/settings", headers=headers, json={
+        "first_name": "Moving", "last_name": "User", "email": "new@example.com"})
+
+    assert response.status_code == 200
+    # The token names the old email, which no longer belongs to any user
+    assert _user_data(client, headers).status_code == 401
+
+
+def test_deleted_account_token_is_rejected(client):
+    _, headers = create_user("Leaving")
+    assert _user_data(client, headers).status_code == 200
+
+    assert client.delete("/auth/delete_account", headers=headers).status_code == 200
+
+    assert _user_data(client, headers).status_code == 401
@@ -0,0 +1,158 @@
+"""
+Tests for threaded comment loading.
+"""
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+
+from conftest import create_events, create_user
+from server.apps.events.models import EventComment
+from server.core.database import SessionLocal
+
+_START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def thread_event(database):
+    """An event and a commenting user: (event id, user id)."""
+    user_id, _ = create_user("Commenter")
+    return create_events([user_id], 1)[0], user_id
+
+
+def add_comments(event_id, user_id, count, parent_id=None, offset=0):
+    """Add count comments, oldest first, and return their ids."""
+    with SessionLocal() as db:
+        comments = [EventComment(event_id=event_id, user_id=user_id, content=f"Comment {number}",
+                                 parent_comment_id=parent_id,
+                                 date_created=_START + timedelta(minutes=offset + number))
+                    for number in range(count)]
+        db.add_all(comments)
+        db.commit()
+        return [comment.id for comment in comments]
+
+
+def _threads(client, event_id, **params):
+    response = client.get(f"/events/{event_id}/comments/threaded", params=params)
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_replies_are_limited_per_comment(client, thread_event):
+    event_id, user_id = thread_event
+    root = add_comments(event_id, user_id, 1)[0]
+    reply_ids = add_comments(event_id, user_id, 50, parent_id=root, offset=1)
+
+    thread = _threads(client, event_id, replies_limit=5)["comments"][0]
+
+    assert [reply["id"] for reply in thread["replies"]] == [str(i) for i in reply_ids[:5]]
+    assert thread["has_more_replies"]
+    rest = client.get(f"/events/comments/{root}/replies",
+                      params={"cursor": thread["replies_cursor"], "limit": 100}).json()
+    assert [reply["id"] for reply in rest["comments"]] == [str(i) for i in reply_ids[5:]]
+    assert rest["next_cursor"] is None
+
+
+def test_exactly_replies_limit_replies_are_complete(client, thread_event):
+    event_id, user_id = thread_event
+    root = add_comments(event_id, user_id, 1)[0]
+    add_comments(event_id, user_id, 5, parent_id=root, offset=1)
+
+    thread = _threads(client, event_id, replies_limit=5)["comments"][0]
+
+    assert len(thread["replies"]) == 5
+    assert not thread["has_more_replies"]
+    assert thread["replies_cursor"] is None
+
+
+def test_replies_below_the_depth_are_flagged(client, thread_event):
+    event_id, user_id = thread_event
+    root = add_comments(event_id, user_id, 1)[0]
+    child = add_comments(event_id, user_id, 1, parent_id=root, offset=1)[0]
+    add_comments(event_id, user_id, 1, parent_id=child, offset=2)
+
+    thread = _threads(client, event_id, depth=1)["comments"][0]
+
+    reply = thread["replies"][0]
+    assert not thread["has_more_replies"]
+    assert reply["replies"] == []
+    assert reply["has_more_replies"]
+    assert reply["replies_cursor"] is None
+
+
+def test_top_level_pages_follow_the_cursor(client, thread_event):
+    event_id, user_id = thread_event
+    roots = add_comments(event_id, user_id, 5)
+    # Replies to the first comment of the next page are not part of this one
+    add_comments(event_id, user_id, 3, parent_id=roots[2], offset=10)
+
+    first = _threads(client, event_id, limit=2)
+    second = _threads(client, event_id, limit=3, cursor=first["next_cursor"])
+
+    assert [thread["id"] for thread in first["comments"]] == [str(i) for i in roots[:2]]
+    assert all(thread["replies"] == [] for thread in first["comments"])
+    assert [thread["id"] for thread in second["comments"]] == [str(i) for i in roots[2:]]
+    assert len(second["comments"][0]["replies"]) == 3
+    assert second["next_cursor"] is None
+
+
+def _delete_comment(comment_id):
+    with SessionLocal() as db:
+        db.get(EventComment, comment_id).is_deleted = True
+        db.commit()
+
+
+def test_deleted_comment_with_replies_is_a_placeholder(client, thread_event):
+    event_id, user_id = thread_event
+    root = add_comments(event_id, user_id, 1)[0]
+    reply_ids = add_comments(event_id, user_id, 2, parent_id=root, offset=1)
+    _delete_comment(root)
+
+    thread = _threads(client, event_id)["comments"][0]
+
+    assert thread["id"] == str(root)
+    assert thread["is_deleted"]
+    assert thread["content"] == ""
+    assert [reply["id"] for reply in thread["replies"]] == [str(i) for i in reply_ids]
+    assert not any(reply["is_deleted"] for reply in thread["replies"])
+
+
+def test_deleted_comment_without_replies_is_left_out(client, thread_event):
+    event_id, user_id = thread_event
+    roots = add_comments(event_id, user_id, 2)
+    reply_ids = add_comments(event_id, user_id, 2, parent_id=roots[0], offset=2)
+    _delete_comment(roots[1])
+    _delete_comment(reply_ids[1])
+
+    threads = _threads(client, event_id)["comments"]
+
+    assert [thread["id"] for thread in threads] == [str(roots[0])]
+    assert [reply["id"] for reply in threads[0]["replies"]] == [str(reply_ids[0])]
+    assert not threads[0]["has_more_replies"]
+
+
+def test_replies_of_a_deleted_comment_can_be_paged(client, thread_event):
+    event_id, user_id = thread_event
+    root = add_comments(event_id, user_id, 1)[0]
+    reply_ids = add_comments(event_id, user_id, 15, parent_id=root, offset=1)
+    _delete_comment(root)
+
+    thread = _threads(client, event_id, replies_limit=5)["comments"][0]
+    loaded = [reply["id"] for reply in thread["replies"]]
+    cursor = thread["replies_cursor"]
+    while cursor:
+        response = client.get(f"/events/comments/{root}/replies",
+                              params={"cursor": cursor, "limit": 4})
+        assert response.status_code == 200
+        page = response.json()
+        loaded += [reply["id"] for reply in page["comments"]]
+        cursor = page["next_cursor"]
+
+    assert thread["is_deleted"] and thread["has_more_replies"]
+    assert loaded == [str(i) for i in reply_ids]
+
+
+def test_replies_of_a_missing_comment_are_not_found(client, thread_event):
+    response = client.get(f"/events/comments/{uuid4()}/replies")
+
+    assert response.status_code == 404
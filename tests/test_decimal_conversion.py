@@ -0,0 +1,52 @@
+"""
+Tests for the subquadratic int <-> decimal string conversions.
+"""
+import random
+import sys
+
+import pytest
+
+from server.core import decimal_conversion
+from server.core.decimal_conversion import decimal_to_int, int_to_decimal
+
+
+@pytest.fixture(autouse=True)
+def unlimited_int_digits():
+    """Allow the built-in conversions the tests compare against on any size."""
+    previous = sys.get_int_max_str_digits()
+    sys.set_int_max_str_digits(0)
+    yield
+    sys.set_int_max_str_digits(previous)
+
+
+@pytest.mark.parametrize("bits", [1, 127, 128, 129, 10000, 10001, 65536, 65537, 300001])
+def test_round_trip_matches_builtins(bits):
+    value = random.Random(bits).getrandbits(bits) | (1 << (bits - 1))
+
+    digits = int_to_decimal(value)
+
+    assert digits == str(value)
+    assert decimal_to_int(digits) == value
+    assert int_to_decimal(-value) == "-" + digits
+    assert decimal_to_int("-" + digits) == -value
+
+
+def test_invalid_input_is_rejected():
+    with pytest.raises(ValueError):
+        decimal_to_int("12a4" * 1000)
+
+
+def test_power_caches_stay_small_across_many_conversions():
+    rng = random.Random(0)
+    largest = 0
+    for _ in range(200):
+        bits = rng.randrange(10000, 200000)
+        largest = max(largest, bits)
+        value = rng.getrandbits(bits)
+        assert decimal_to_int(int_to_decimal(value)) == value
+
+    # Only power-of-two exponents are cached, so one entry per doubling at most
+    for cache in (decimal_conversion._decimal_powers_of_two,  # pylint: disable=protected-access
+                  decimal_conversion._powers_of_ten):  # pylint: disable=protected-access
+        assert all(exponent & (exponent - 1) == 0 for exponent in cache)
+        assert len(cache) <= largest.bit_length()
@@ -0,0 +1,121 @@
+"""
+Tests for email delivery through the outbox, against a local aiosmtpd server.
+"""
+import logging
+import smtplib
+import socket
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from aiosmtpd.controller import Controller
+from sqlalchemy import select
+
+from server.apps.authentication.email.outbox import EmailOutbox
+from server.apps.authentication.models import OutboxEmail, OutboxStatus
+from server.core.database import SessionLocal
+
+
+class RecordingHandler:
+    """aiosmtpd handler that keeps the recipients of every message it receives."""
+
+    def __init__(self):
+        self.recipients = []
+
+    async def handle_DATA(self, _server, _session, envelope):  # pylint: disable=invalid-name
+        self.recipients.extend(envelope.rcpt_tos)
+        return "250 Message accepted for delivery"
+
+
+@pytest.fixture
+def smtp_server():
+    """A local SMTP server: (handler, connect function for the outbox)."""
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    logging.getLogger("mail.log").setLevel(logging.WARNING)
+    handler = RecordingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    yield handler, lambda: smtplib.SMTP("127.0.0.1", port, timeout=10)
+    controller.stop()
+
+
+def _add_messages(count: int) -> list:
+    with SessionLocal() as db:
+        messages = [OutboxEmail(recipient=f"user{number}@example.com", subject="Hello",
+                                body="Body") for number in range(count)]
+        db.add_all(messages)
+        db.commit()
+        return [message.id for message in messages]
+
+
+def _messages() -> list:
+    with SessionLocal() as db:
+        return db.scalars(select(OutboxEmail)).all()
+
+
+def _run_until(outbox: EmailOutbox, condition, timeout: float = 10, linger: float = 0):
+    """Run the outbox until condition() holds for the stored messages, then linger."""
+    outbox.start()
+    try:
+        deadline = time.monotonic() + timeout
+        while not condition(_messages()):
+            assert time.monotonic() < deadline, "outbox did not get there in time"
+            time.sleep(0.01)
+        time.sleep(linger)
+    finally:
+        outbox.stop()
+
+
+def test_messages_are_delivered(database, smtp_server):
+    handler, connect = smtp_server
+    _add_messages(5)
+    outbox = EmailOutbox(SessionLocal, connect=connect, workers=2, batch_size=2,
+                         poll_interval=0.01)
+
+    _run_until(outbox, lambda messages: all(
+        message.status == OutboxStatus.SENT.value for message in messages))
+
+    assert sorted(handler.recipients) == [f"user{number}@example.com" for number in range(5)]
+    assert all(message.attempts == 1 and message.date_sent for message in _messages())
+
+
+class FailingConnect:
+    """A connect function that always fails, counting the attempts."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        raise ConnectionRefusedError("connection refused")
+
+
+def test_failed_delivery_is_retried_with_backoff(database):
+    _add_messages(1)
+    connect = FailingConnect()
+    outbox = EmailOutbox(SessionLocal, connect=connect, workers=1, poll_interval=0.01,
+                         retry_base=60)
+    started = datetime.now(timezone.utc).replace(tzinfo=None)
+
+    # The outbox keeps polling for a while, but must not retry before the backoff
+    _run_until(outbox, lambda messages: messages[0].attempts == 1, linger=0.1)
+
+    message = _messages()[0]
+    assert connect.calls == 1
+    assert message.status == OutboxStatus.PENDING.value
+    assert "connection refused" in message.last_error
+    assert message.next_attempt_at >= started + timedelta(seconds=60)
+
+
+def test_message_fails_after_max_attempts(database):
+    _add_messages(1)
+    connect = FailingConnect()
+    outbox = EmailOutbox(SessionLocal, connect=connect, workers=1, poll_interval=0.01,
+                         max_attempts=3, retry_base=0.001)
+
+    _run_until(outbox, lambda messages: messages[0].status == OutboxStatus.FAILED.value)
+
+    assert connect.calls == 3
+    assert _messages()[0].attempts == 3
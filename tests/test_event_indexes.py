@@ -0,0 +1,96 @@
+"""
+Tests that the hot events queries use the indexes declared for them on the models.
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, select
+
+from conftest import create_events, create_user, explain_query_plan
+from server.apps.events.models import Event, EventComment, EventRegistration, EventStatus
+from server.core.database import SessionLocal
+
+_NOW = datetime.now(timezone.utc)
+
+QUERIES = {
+    "newest events": (
+        lambda ids: select(Event).order_by(Event.date_created.desc(), Event.id.desc())
+        .limit(21),
+        "ix_event_date_created_id"),
+    "most voted events": (
+        lambda ids: select(Event).order_by(Event.votes.desc(), Event.id.desc()).limit(21),
+        "ix_event_votes_id"),
+    "next open event": (
+        lambda ids: select(func.min(Event.date_scheduled)).where(  # pylint: disable=not-callable
+            Event.status == EventStatus.OPEN.value, Event.date_scheduled >= _NOW),
+        "ix_event_status_date_scheduled"),
+    "events tomorrow": (
+        lambda ids: select(Event.id).where(Event.date_scheduled.between(
+            _NOW + timedelta(days=1), _NOW + timedelta(days=2))),
+        "ix_event_date_scheduled"),
+    "author's events": (
+        lambda ids: select(Event).where(Event.author_id == ids["user"])
+        .order_by(Event.date_created.desc()),
+        "ix_event_author_id_date_created"),
+    "event comments": (
+        lambda ids: select(EventComment).where(
+            EventComment.event_id == ids["event"],
+            EventComment.is_deleted == False)  # pylint: disable=singleton-comparison
+        .order_by(EventComment.date_created),
+        "ix_eventcomment_event_id_is_deleted_date_created"),
+    "top-level comments": (
+        lambda ids: select(EventComment.id).where(
+            EventComment.event_id == ids["event"],
+            EventComment.parent_comment_id.is_(None))  # pylint: disable=no-member
+        .order_by(EventComment.date_created, EventComment.id),
+        "ix_eventcomment_event_id_date_created_top_level"),
+    "comment replies": (
+        lambda ids: select(EventComment.id).where(
+            EventComment.parent_comment_id == ids["comment"])
+        .order_by(EventComment.date_created, EventComment.id),
+        "ix_eventcomment_parent_comment_id_date_created"),
+    "user's comments": (
+        lambda ids: select(EventComment.id).where(EventComment.user_id == ids["user"]),
+        "ix_eventcomment_user_id"),
+    "user's registrations": (
+        lambda ids: select(EventRegistration).where(
+            EventRegistration.user_id == ids["user"],
+            EventRegistration.attendance_status == "registered"),
+        "ix_eventregistration_user_id_attendance_status"),
+}
+
+
+@pytest.fixture
+def sample_ids(database):
+    """A few users, events, comments and registrations: ids to query by."""
+    user_ids = [create_user(f"User {number}")[0] for number in range(3)]
+    event_ids = create_events(user_ids, 12)
+    with SessionLocal() as db:
+        for event_id in event_ids:
+            comments = [EventComment(event_id=event_id, user_id=user_ids[number % 3],
+                                     content="Comment", is_deleted=number == 3,
+                                     date_created=_NOW + timedelta(minutes=number))
+                        for number in range(4)]
+            db.add_all(comments)
+            db.flush()
+            db.add_all(EventComment(event_id=event_id, user_id=user_ids[0], content="Reply",
+                                    parent_comment_id=comments[0].id,
+                                    date_created=_NOW + timedelta(minutes=10 + number))
+                       for number in range(3))
+            db.add_all(EventRegistration(event_id=event_id, user_id=user_id)
+                       for user_id in user_ids)
+        db.commit()
+        comment_id = db.scalars(select(EventComment.parent_comment_id).where(
+            EventComment.parent_comment_id.is_not(None))).first()  # pylint: disable=no-member
+    return {"user": user_ids[0], "event": event_ids[len(event_ids) // 2],
+            "comment": comment_id}
+
+
+@pytest.mark.parametrize("name", QUERIES)
+def test_query_uses_its_index(database, sample_ids, name):
+    build_statement, index_name = QUERIES[name]
+
+    with database.connect() as connection:
+        plan = explain_query_plan(connection, build_statement(sample_ids))
+
+    assert any(f"INDEX {index_name}" in step for step in plan), plan
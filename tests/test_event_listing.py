@@ -0,0 +1,49 @@
+"""
+Tests for the event listing API.
+"""
+from conftest import create_events, create_user
+
+
+def _list_events(client, query_counter, **params):
+    """Fetch one page of events and return it with the number of queries it took."""
+    query_counter.count = 0
+    response = client.get("/events/api", params=params)
+    assert response.status_code == 200
+    return response.json(), query_counter.count
+
+
+def test_listing_query_count_does_not_grow_with_page_size(client, query_counter):
+    authors = [create_user(f"Author{number}")[0] for number in range(10)]
+    create_events(authors, 40)
+
+    small_page, small_queries = _list_events(client, query_counter, limit=5)
+    large_page, large_queries = _list_events(client, query_counter, limit=40)
+
+    assert len(small_page["events"]) == 5
+    assert len(large_page["events"]) == 40
+    # One query for the page and one for all of its authors
+    assert large_queries == small_queries <= 2
+
+
+def test_listing_resolves_every_author(client):
+    authors = [create_user(f"Author{number}")[0] for number in range(3)]
+    create_events(authors, 6)
+
+    events = client.get("/events/api", params={"limit": 6}).json()["events"]
+
+    assert {event["author_username"] for event in events} == {
+        "Author0 User", "Author1 User", "Author2 User"
+    }
+
+
+def test_listing_pages_follow_the_cursor(client):
+    author_id, _ = create_user()
+    create_events([author_id], 7)
+
+    first = client.get("/events/api", params={"limit": 4}).json()
+    second = client.get("/events/api",
+                        params={"limit": 4, "cursor": first["next_cursor"]}).json()
+
+    titles = [event["title"] for event in first["events"] + second["events"]]
+    assert titles == [f"Event {number}" for number in range(6, -1, -1)]
+    assert second["next_cursor"] is None
@@ -0,0 +1,34 @@
+"""
+Tests for the daily event reminder job.
+"""
+import datetime
+
+from sqlalchemy import func, select
+
+from conftest import create_events, create_user
+from server.apps.authentication.email.reminders import send_event_reminder_emails
+from server.apps.authentication.models import OutboxEmail
+from server.apps.events.models import Event, EventRegistration
+from server.core.database import SessionLocal
+
+_DAY = datetime.date(2026, 3, 14)
+
+
+def _queued() -> int:
+    with SessionLocal() as db:
+        return db.scalar(select(func.count()).select_from(OutboxEmail))  # pylint: disable=not-callable
+
+
+def test_second_run_for_the_same_day_queues_nothing(database):
+    user_ids = [create_user(f"Guest {number}")[0] for number in range(2)]
+    event_id = create_events(user_ids, 1)[0]
+    with SessionLocal() as db:
+        db.get(Event, event_id).date_scheduled = datetime.datetime.combine(
+            _DAY, datetime.time(18, 30))
+        db.add_all(EventRegistration(event_id=event_id, user_id=user_id)
+                   for user_id in user_ids)
+        db.commit()
+
+    assert send_event_reminder_emails(day=_DAY) == 2
+    assert send_event_reminder_emails(day=_DAY) == 0
+    assert _queued() == 2
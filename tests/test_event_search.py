@@ -0,0 +1,71 @@
+"""
+Tests for the FTS5 event search index and its sync triggers.
+"""
+import pytest
+from sqlalchemy import text
+
+from conftest import create_events, create_user
+from server.apps.events.models import Event
+from server.apps.authentication.models import User
+from server.apps.events.search import FTS_TABLE, ensure_event_search_index
+from server.core.database import SessionLocal
+
+
+@pytest.fixture
+def search_index(database):
+    """The search index and its triggers on the test database."""
+    assert ensure_event_search_index(database)
+    yield database
+    with database.begin() as connection:
+        connection.execute(text(f"DROP TABLE IF EXISTS {FTS_TABLE}"))
+
+
+def _search(client, term):
+    response = client.get("/events/api", params={"search": term})
+    assert response.status_code == 200
+    return sorted(event["title"] for event in response.json()["events"])
+
+
+def test_index_follows_event_and_author_changes(client, search_index):
+    author_id, _ = create_user("Olena")
+    first, second = create_events([author_id], 2)
+    assert _search(client, "olena") == ["Event 0", "Event 1"]
+
+    with SessionLocal() as db:
+        db.get(Event, first).title = "Concert"
+        db.delete(db.get(Event, second))
+        db.get(User, author_id).first_name = "Marta"
+        db.commit()
+
+    assert _search(client, "concert") == ["Concert"]
+    assert _search(client, "test") == ["Concert"]
+    assert _search(client, "marta") == ["Concert"]
+    assert _search(client, "olena") == []
+
+
+def test_index_rows_are_keyed_by_event_rowid(search_index):
+    author_id, _ = create_user()
+    create_events([author_id], 3)
+
+    with search_index.connect() as connection:
+        mismatched = connection.execute(text(
+            f"SELECT COUNT(*) FROM event JOIN {FTS_TABLE} ON {FTS_TABLE}.rowid = event.rowid "
+            f"WHERE {FTS_TABLE}.event_id != event.id"
+        )).scalar()
+        indexed = connection.execute(text(f"SELECT COUNT(*) FROM {FTS_TABLE}")).scalar()
+    assert (mismatched, indexed) == (0, 3)
+
+
+def test_index_with_unrelated_rowids_is_rebuilt(client, search_index):
+    author_id, _ = create_user()
+    create_events([author_id], 2)
+    # An index as built before rows were keyed by rowid: same rows, other rowids
+    with search_index.begin() as connection:
+        connection.execute(text(f"UPDATE {FTS_TABLE} SET rowid = rowid + 1000"))
+
+    assert ensure_event_search_index(search_index)
+
+    with SessionLocal() as db:
+        db.delete(db.get(Event, create_events([author_id], 1)[0]))
+        db.commit()
+    assert _search(client, "event") == ["Event 0", "Event 1"]
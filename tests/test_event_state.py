@@ -0,0 +1,125 @@
+"""
+Tests for the batched viewer state endpoints: /events/me/state and
+/events/{event_id}/view_state.
+"""
+from uuid import uuid4
+
+from conftest import create_events, create_user
+from server.apps.events.comment_threads import DEFAULT_THREAD_PAGE_SIZE
+from server.apps.events.models import EventComment, EventRegistration, EventVote
+from server.core.database import SessionLocal
+
+
+def _add_state(user_id, voted=(), registered=()):
+    with SessionLocal() as db:
+        db.add_all(EventVote(event_id=event_id, user_id=user_id) for event_id in voted)
+        db.add_all(EventRegistration(event_id=event_id, user_id=user_id)
+                   for event_id in registered)
+        db.commit()
+
+
+def _states(client, headers, event_ids):
+    response = client.post("/events/me/state", headers=headers,
+                           json={"event_ids": [str(event_id) for event_id in event_ids]})
+    assert response.status_code == 200
+    return [(state["event_id"], state["has_voted"], state["is_registered"])
+            for state in response.json()["states"]]
+
+
+def test_states_of_mixed_events(client):
+    user_id, headers = create_user()
+    voted, registered, both, untouched = create_events([user_id], 4)
+    _add_state(user_id, voted=[voted, both], registered=[registered, both])
+    unknown = uuid4()
+
+    states = _states(client, headers, [both, unknown, voted, registered, untouched, voted])
+
+    assert states == [
+        (str(both), True, True),
+        (str(unknown), False, False),
+        (str(voted), True, False),
+        (str(registered), False, True),
+        (str(untouched), False, False),
+    ]
+
+
+def test_states_query_count_does_not_grow_with_events(client, query_counter):
+    user_id, headers = create_user()
+    event_ids = create_events([user_id], 20)
+    _add_state(user_id, voted=event_ids[::2], registered=event_ids[::3])
+    _states(client, headers, event_ids[:1])  # Caches the token
+
+    query_counter.count = 0
+    _states(client, headers, event_ids[:2])
+    few_queries = query_counter.count
+    query_counter.count = 0
+    _states(client, headers, event_ids)
+
+    # One query for the votes and one for the registrations
+    assert query_counter.count == few_queries == 2
+
+
+def test_states_require_authentication(client):
+    response = client.post("/events/me/state", json={"event_ids": []})
+
+    assert response.status_code == 401
+
+
+def _view_state(client, event_id, headers=None):
+    return client.get(f"/events/{event_id}/view_state", headers=headers or {})
+
+
+def test_view_state_of_a_voted_and_registered_event(client):
+    user_id, headers = create_user("Viewer")
+    event_id = create_events([user_id], 1)[0]
+    _add_state(user_id, voted=[event_id], registered=[event_id])
+
+    response = _view_state(client, event_id, headers)
+
+    assert response.status_code == 200
+    view = response.json()
+    assert view["event"]["id"] == str(event_id)
+    assert view["vote"]["has_voted"]
+    assert view["registration"]["is_registered"]
+    assert view["viewer"]["first_name"] == "Viewer"
+    assert view["comments"] == {"comments": [], "next_cursor": None}
+
+
+def test_view_state_for_anonymous_viewers(client):
+    user_id, _ = create_user()
+    event_id = create_events([user_id], 1)[0]
+    _add_state(user_id, voted=[event_id], registered=[event_id])
+
+    view = _view_state(client, event_id).json()
+
+    assert not view["vote"]["has_voted"]
+    assert view["registration"] is None
+    assert view["viewer"] is None
+
+
+def test_view_state_of_a_missing_event(client):
+    _, headers = create_user()
+
+    assert _view_state(client, uuid4(), headers).status_code == 404
+    assert _view_state(client, "not-a-uuid", headers).status_code == 400
+
+
+def test_view_state_query_count_does_not_grow_with_comments(client, query_counter):
+    user_id, headers = create_user()
+    quiet, busy = create_events([user_id], 2)
+    with SessionLocal() as db:
+        db.add(EventComment(event_id=quiet, user_id=user_id, content="Only comment"))
+        db.add_all(EventComment(event_id=busy, user_id=user_id, content=f"Comment {number}")
+                   for number in range(DEFAULT_THREAD_PAGE_SIZE + 5))
+        db.commit()
+    _view_state(client, quiet, headers)  # Caches the token
+
+    query_counter.count = 0
+    assert len(_view_state(client, quiet, headers).json()["comments"]["comments"]) == 1
+    quiet_queries = query_counter.count
+    query_counter.count = 0
+    busy_view = _view_state(client, busy, headers).json()
+
+    assert len(busy_view["comments"]["comments"]) == DEFAULT_THREAD_PAGE_SIZE
+    # The event, its author, the comment threads, the vote and the registration
+    assert query_counter.count == quiet_queries <= 5
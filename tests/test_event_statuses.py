@@ -0,0 +1,34 @@
+"""
+Tests for the scheduled event status updates.
+"""
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+
+from conftest import create_events, create_user
+from server.apps.events.models import Event, EventStatus
+from server.apps.events.routes import get_next_status_update_time, update_event_statuses
+from server.core.database import SessionLocal
+
+
+def _schedule(event_ids, dates):
+    with SessionLocal() as db:
+        for event_id, date in zip(event_ids, dates):
+            db.get(Event, event_id).date_scheduled = date
+        db.commit()
+
+
+def test_event_due_at_now_is_picked_up_by_the_next_run(database):
+    author_id, _ = create_user()
+    past, due, later = create_events([author_id], 3)
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    _schedule([past, due, later], [now - timedelta(seconds=1), now, now + timedelta(hours=2)])
+
+    with SessionLocal() as db:
+        assert update_event_statuses(db, now) == 1
+        next_due = get_next_status_update_time(db, now)
+        statuses = dict(db.execute(select(Event.id, Event.status)).all())
+
+    assert statuses[past] == EventStatus.CLOSED.value
+    assert statuses[due] == EventStatus.OPEN.value
+    assert next_due == now
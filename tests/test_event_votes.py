@@ -0,0 +1,76 @@
+"""
+Concurrency tests for event votes.
+
+Requests are sent concurrently on one event loop, so the handlers interleave at
+every database call as they do under load in a worker.
+"""
+import asyncio
+import random
+
+import httpx
+from sqlalchemy import func, select
+
+from conftest import create_events, create_user
+from server.apps.events.models import Event, EventVote
+from server.core.database import SessionLocal
+
+
+def _send_concurrently(app, requests):
+    """Send (method, url, headers) requests all at once and return the status codes."""
+    async def send_all():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            responses = await asyncio.gather(*(
+                client.request(method, url, headers=headers)
+                for method, url, headers in requests
+            ))
+        return [response.status_code for response in responses]
+    return asyncio.run(send_all())
+
+
+def _stored_votes(event_id):
+    """The event's vote counter and its number of EventVote rows."""
+    with SessionLocal() as db:
+        counter = db.get(Event, event_id).votes
+        rows = db.execute(select(func.count()).select_from(EventVote).where(  # pylint: disable=not-callable
+            EventVote.event_id == event_id)).scalar()
+    return counter, rows
+
+
+def test_concurrent_votes_are_all_counted(app):
+    voters = [create_user(f"Voter{number}")[1] for number in range(30)]
+    event_id = create_events([create_user()[0]], 1)[0]
+
+    statuses = _send_concurrently(app, [("POST", f"/events/vote/{event_id}", headers)
+                                        for headers in voters])
+
+    assert statuses == [200] * len(voters)
+    assert _stored_votes(event_id) == (len(voters), len(voters))
+
+
+def test_repeated_concurrent_votes_count_once(app):
+    voters = [create_user(f"Voter{number}")[1] for number in range(10)]
+    event_id = create_events([create_user()[0]], 1)[0]
+
+    statuses = _send_concurrently(app, [("POST", f"/events/vote/{event_id}", headers)
+                                        for headers in voters for _ in range(4)])
+
+    assert statuses == [200] * len(voters) * 4
+    assert _stored_votes(event_id) == (len(voters), len(voters))
+
+
+def test_counter_matches_rows_after_mixed_votes_and_unvotes(app):
+    voters = [create_user(f"Voter{number}")[1] for number in range(20)]
+    event_id = create_events([create_user()[0]], 1)[0]
+    _send_concurrently(app, [("POST", f"/events/vote/{event_id}", headers)
+                             for headers in voters[::2]])
+
+    rng = random.Random(0)
+    requests = [(rng.choice(("POST", "DELETE")), f"/events/vote/{event_id}", headers)
+                for headers in voters for _ in range(3)]
+    rng.shuffle(requests)
+    statuses = _send_concurrently(app, requests)
+
+    assert statuses == [200] * len(requests)
+    counter, rows = _stored_votes(event_id)
+    assert counter == rows
@@ -0,0 +1,33 @@
+"""
+Tests for the factorial pre-computation daemon.
+"""
+import math
+import os
+import sys
+
+import pytest
+
+from server.core.factorial_calculator import precompute
+from server.core.factorial_store import FactorialStore
+
+
+@pytest.fixture
+def sparse_store(tmp_path):
+    """An empty store keeping every 500th factorial."""
+    return FactorialStore(data_path=os.path.join(tmp_path, "factorials.data"),
+                          index_path=os.path.join(tmp_path, "factorials.index"),
+                          interval=500)
+
+
+def test_precompute_stores_exact_values_and_resumes(sparse_store):
+    previous = sys.get_int_max_str_digits()
+    sys.set_int_max_str_digits(0)
+    try:
+        # Values past 20000 bits are converted by the worker processes
+        assert precompute(sparse_store, workers=2, until=4000, sync_seconds=0) == 4000
+        assert precompute(sparse_store, workers=2, until=6000, sync_seconds=0) == 6000
+
+        for n in range(0, 6001, 500):
+            assert sparse_store.get(n) == math.factorial(n)
+    finally:
+        sys.set_int_max_str_digits(previous)
@@ -0,0 +1,91 @@
+"""
+Tests for streaming factorial digits with byte ranges and gzip.
+"""
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from server.core.factorial_streaming import GZIP_MIN_LENGTH, parse_range, stream_digits_response
+
+DIGITS = b"0123456789" * (GZIP_MIN_LENGTH // 5)
+
+
+@pytest.fixture
+def client():
+    """A client for an app serving DIGITS the way /factorial/{n}/digits does."""
+    app = FastAPI()
+
+    @app.get("/digits")
+    async def digits(request: Request):
+        return stream_digits_response(request, memoryview(DIGITS))
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def _get(client, **headers):
+    return client.get("/digits", headers={"Accept-Encoding": "identity", **headers})
+
+
+def test_full_body_without_range(client):
+    response = _get(client)
+
+    assert response.status_code == 200
+    assert response.content == DIGITS
+    assert response.headers["content-length"] == str(len(DIGITS))
+    assert response.headers["accept-ranges"] == "bytes"
+
+
+def test_range_returns_the_slice(client):
+    response = _get(client, Range="bytes=10-24")
+
+    assert response.status_code == 206
+    assert response.content == DIGITS[10:25]
+    assert response.headers["content-range"] == f"bytes 10-24/{len(DIGITS)}"
+    assert response.headers["content-length"] == "15"
+
+
+def test_suffix_range_returns_the_last_bytes(client):
+    response = _get(client, Range="bytes=-7")
+
+    assert response.status_code == 206
+    assert response.content == DIGITS[-7:]
+    assert response.headers["content-range"] == (
+        f"bytes {len(DIGITS) - 7}-{len(DIGITS) - 1}/{len(DIGITS)}")
+
+
+def test_range_past_the_end_is_not_satisfiable(client):
+    response = _get(client, Range=f"bytes={len(DIGITS)}-")
+
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{len(DIGITS)}"
+
+
+def test_gzip_is_used_when_accepted(client):
+    response = _get(client, **{"Accept-Encoding": "gzip"})
+
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.content == DIGITS
+
+
+def test_range_is_not_gzipped(client):
+    response = _get(client, Range="bytes=0-99", **{"Accept-Encoding": "gzip"})
+
+    assert response.status_code == 206
+    assert "content-encoding" not in response.headers
+    assert response.content == DIGITS[:100]
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, None),
+    ("bytes=5-", (5, 100)),
+    ("bytes=90-200", (90, 100)),
+    ("bytes=-500", (0, 100)),
+    ("bytes=9-3", None),
+    ("bytes=1-2,5-6", None),
+    ("items=0-1", None),
+])
+def test_parse_range(header, expected):
+    assert parse_range(header, 100) == expected
@@ -0,0 +1,99 @@
+"""
+Tests for the in-memory HTML page cache: encoding negotiation and ETags.
+"""
+import os
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from server.core import page_cache as page_cache_module
+from server.core.page_cache import PageCache
+
+PAGE = b"<html><body>" + b"<p>Campus events</p>" * 100 + b"</body></html>"
+
+
+@pytest.fixture
+def pages_dir(tmp_path):
+    """A pages directory holding page.html."""
+    (tmp_path / "page.html").write_bytes(PAGE)
+    return tmp_path
+
+
+@pytest.fixture
+def client(pages_dir):
+    """A client for an app serving pages from pages_dir through a PageCache."""
+    cache = PageCache(pages_dir)
+    app = FastAPI()
+
+    @app.get("/{name}")
+    async def page(request: Request, name: str):
+        return cache.response(request, name, "<h1>Not found</h1>")
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def _get(client, accept_encoding="identity", **headers):
+    return client.get("/page.html", headers={"Accept-Encoding": accept_encoding, **headers})
+
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    ("identity", None),
+    ("gzip", "gzip"),
+    ("gzip, deflate, br", "br"),
+    ("br;q=0, gzip", "gzip"),
+    ("gzip;q=0, br;q=0", None),
+    ("deflate", None),
+])
+def test_encoding_follows_accept_encoding(client, accept_encoding, expected):
+    response = _get(client, accept_encoding)
+
+    assert response.status_code == 200
+    assert response.headers.get("content-encoding") == expected
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.content == PAGE
+
+
+def test_matching_etag_gets_304(client):
+    etag = _get(client, "gzip").headers["etag"]
+
+    response = _get(client, "gzip", **{"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+def test_etag_is_per_encoding(client):
+    gzip_etag = _get(client, "gzip").headers["etag"]
+
+    # A gzip ETag does not validate the identity representation
+    response = _get(client, "identity", **{"If-None-Match": gzip_etag})
+
+    assert response.status_code == 200
+    assert response.headers["etag"] != gzip_etag
+    assert _get(client, "identity", **{"If-None-Match": f'"stale", {response.headers["etag"]}'}
+                ).status_code == 304
+
+
+def test_changed_file_gets_a_new_etag(client, pages_dir, monkeypatch):
+    monkeypatch.setattr(page_cache_module, "PAGE_CACHE_REVALIDATE_INTERVAL", 0)
+    etag = _get(client).headers["etag"]
+    path = pages_dir / "page.html"
+    modified_ns = path.stat().st_mtime_ns + 10**9
+    path.write_bytes(b"<html>Updated</html>")
+    os.utime(path, ns=(modified_ns, modified_ns))  # A distinct mtime even on coarse clocks
+
+    response = _get(client, **{"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.content == b"<html>Updated</html>"
+    assert response.headers["etag"] != etag
+
+
+def test_missing_page_is_404(client):
+    response = client.get("/missing.html")
+
+    assert response.status_code == 404
+    assert response.text == "<h1>Not found</h1>"
@@ -0,0 +1,71 @@
+"""
+Tests for the write-behind vote buffer.
+"""
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from conftest import create_events, create_user
+from server.apps.events.models import Event, EventVote
+from server.apps.events.vote_buffer import VoteBuffer
+from server.core.database import SessionLocal
+
+
+class FailingSessionFactory:
+    """Session factory whose first calls raise the given errors."""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+
+    def __call__(self):
+        if self.errors:
+            raise self.errors.pop(0)
+        return SessionLocal()
+
+
+def _votes(event_id):
+    with SessionLocal() as db:
+        rows = db.query(EventVote).filter(EventVote.event_id == event_id).count()
+        return db.get(Event, event_id).votes, rows
+
+
+def test_votes_for_deleted_events_do_not_block_the_others(database):
+    author_id, _ = create_user()
+    kept, deleted = create_events([author_id], 2)
+    voter_id, _ = create_user()
+    buffer = VoteBuffer(SessionLocal)
+    buffer.submit(kept, voter_id, True, False)
+    buffer.submit(deleted, voter_id, True, False)
+    with SessionLocal() as db:
+        db.delete(db.get(Event, deleted))
+        db.commit()
+
+    assert buffer.flush() == 2
+    assert _votes(kept) == (1, 1)
+    assert buffer.pending_state(deleted, voter_id) is None
+
+
+def test_transient_errors_keep_the_batch_for_the_next_flush(database):
+    event_id = create_events([create_user()[0]], 1)[0]
+    voter_id, _ = create_user()
+    locked = OperationalError("INSERT", {}, Exception("database is locked"))
+    buffer = VoteBuffer(FailingSessionFactory(locked))
+    buffer.submit(event_id, voter_id, True, False)
+
+    assert buffer.flush() == 0
+    assert buffer.pending_state(event_id, voter_id) is True
+    assert buffer.flush() == 1
+    assert _votes(event_id) == (1, 1)
+
+
+def test_failed_batches_are_written_vote_by_vote(database):
+    first, second = create_events([create_user()[0]], 2)
+    voter_id, _ = create_user()
+    conflict = IntegrityError("INSERT", {}, Exception("FOREIGN KEY constraint failed"))
+    # The batch fails, then the first vote on its own fails too and is dropped
+    buffer = VoteBuffer(FailingSessionFactory(conflict, conflict))
+    buffer.submit(first, voter_id, True, False)
+    buffer.submit(second, voter_id, True, False)
+
+    assert buffer.flush() == 1
+    assert _votes(first) == (0, 0)
+    assert _votes(second) == (1, 1)
+    assert buffer.flush() == 0